@@ -310,7 +310,7 @@ def get_execution_logs(workflow_id: Optional[str] = None, limit: int = 10) -> st
             logs = db.get_execution_logs(workflow_id, limit=limit)
         else:
             # Get all recent executions
-            workflows = db.get_all_workflows()
+            workflows = db.get_workflow_summaries()
             logs = []
             for wf in workflows[:5]:  # Limit to 5 workflows
                 wf_logs = db.get_execution_logs(wf["id"], limit=2)
@@ -7,6 +7,7 @@ import reflex as rx
 from dotenv import load_dotenv
 from app.pages.monitor import monitor_page
 from app.pages.workflow_builder import workflow_builder_page
+from app.services.notification_service import notification_service
 
 # Cargar variables de entorno
 load_dotenv()
@@ -25,6 +26,9 @@ app = rx.App(
     ],
 )
 
+# Cliente HTTP de notificaciones listo antes de la primera alerta
+app.register_lifespan_task(notification_service.lifespan)
+
 # Rutas
 app.add_page(monitor_page, route="/")
 app.add_page(workflow_builder_page, route="/workflow-builder")
\ No newline at end of file
@@ -4,6 +4,10 @@ import reflex as rx
 from app.states.simulation_state import SimulationState
 from app.components.shared import section_label
 
+# Filas fuera del scroll visible no se pintan hasta que entran en pantalla
+_ALERT_ROW_STYLE = {"content_visibility": "auto", "contain_intrinsic_size": "auto 56px"}
+
+@rx.memo
 def alert_feed_panel() -> rx.Component:
     """Panel lateral derecho con stream de alertas"""
     return rx.vstack(
@@ -177,6 +181,13 @@ def alert_item(alert: rx.Var[dict]) -> rx.Component:
                 rx.badge(alert['severity'], size="1", color_scheme=rx.cond(
                     alert['severity'] == 'critical', "red", "yellow"
                 )),
+                # Estado de entrega: los webhooks encolados aún no están confirmados
+                rx.match(
+                    alert['status'],
+                    ("queued", rx.badge("pending", size="1", color_scheme="gray", variant="outline")),
+                    ("failed", rx.badge("failed", size="1", color_scheme="red", variant="outline")),
+                    rx.fragment()
+                ),
                 spacing="2"
             ),
             rx.text(
@@ -188,5 +199,6 @@ def alert_item(alert: rx.Var[dict]) -> rx.Component:
             class_name="flex-1"
         ),
         
-        class_name="w-full bg-gray-800/30 p-2 rounded border border-gray-700/30 items-center hover:bg-gray-800/50 transition-colors"
+        class_name="w-full bg-gray-800/30 p-2 rounded border border-gray-700/30 items-center hover:bg-gray-800/50 transition-colors",
+        style=_ALERT_ROW_STYLE
     )
\ No newline at end of file
@@ -7,6 +7,7 @@ from app.components.shared.design_tokens import (
 )
 
 
+@rx.memo
 def chat_panel() -> rx.Component:
     """AI Chat Panel with enhanced UI and agent integration."""
     return rx.vstack(
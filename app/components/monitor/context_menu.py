@@ -7,6 +7,7 @@ from app.components.shared.design_tokens import (
 )
 from app.components.shared import gradient_separator, icon_button, section_label
 
+@rx.memo
 def floating_context_menu() -> rx.Component:
     """Menú flotante inferior derecha con props y acciones - always rendered, hidden with CSS"""
     return rx.vstack(
@@ -7,6 +7,7 @@ from app.components.shared.design_tokens import (
 )
 from app.components.shared import gradient_separator, section_label, dependency_node
 
+@rx.memo
 def knowledge_graph_panel() -> rx.Component:
     """Left expandable panel with RUL + interactive dependency graph - always rendered, hidden with CSS"""
     return rx.vstack(
@@ -4,6 +4,7 @@ import reflex as rx
 from app.states.monitor_state import MonitorState
 from app.components.shared.design_tokens import GLASS_STRONG, SHADOW_LG, COLORS
 
+@rx.memo
 def model_viewer_3d() -> rx.Component:
     """
     Componente 3D con:
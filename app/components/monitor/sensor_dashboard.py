@@ -1,6 +1,6 @@
 """Dashboard de sensores en vivo durante simulación"""
 import reflex as rx
-from app.states.workflow_state import WorkflowState
+from app.states.simulation_state import SimulationState
 from app.components.shared.design_tokens import GLASS_PANEL, TRANSITION_DEFAULT
 from app.components.shared import status_dot
 
@@ -16,7 +16,7 @@ def live_sensor_dashboard() -> rx.Component:
                     class_name="text-sm font-bold text-emerald-400 uppercase tracking-wider"
                 ),
                 rx.badge(
-                    f"Tick #{WorkflowState.simulation_tick_count}",
+                    f"Tick #{SimulationState.simulation_tick_count}",
                     color_scheme="blue",
                     size="1"
                 ),
@@ -26,10 +26,10 @@ def live_sensor_dashboard() -> rx.Component:
 
             # Sensor Gauges (always render both, toggle with CSS)
             rx.hstack(
-                rx.foreach(WorkflowState.current_sensor_values, sensor_gauge),
+                rx.foreach(SimulationState.current_sensor_values, sensor_gauge),
                 spacing="4",
                 class_name=rx.cond(
-                    WorkflowState.current_sensor_values.length() > 0,
+                    SimulationState.current_sensor_values.length() > 0,
                     "overflow-x-auto py-2 w-full",
                     "overflow-x-auto py-2 w-full hidden"
                 )
@@ -39,7 +39,7 @@ def live_sensor_dashboard() -> rx.Component:
                 rx.text("Initializing sensors...", class_name="text-sm text-gray-400"),
                 spacing="2",
                 class_name=rx.cond(
-                    WorkflowState.current_sensor_values.length() > 0,
+                    SimulationState.current_sensor_values.length() > 0,
                     "py-4 hidden",
                     "py-4"
                 )
@@ -49,7 +49,7 @@ def live_sensor_dashboard() -> rx.Component:
             class_name="w-full"
         ),
         class_name=rx.cond(
-            WorkflowState.simulation_running,
+            SimulationState.simulation_running,
             f"bg-[#0a0a0f]/80 border-b border-white/10 px-4 py-3 {TRANSITION_DEFAULT}",
             f"bg-[#0a0a0f]/80 border-b border-white/10 px-4 py-3 {TRANSITION_DEFAULT} hidden"
         )
@@ -72,6 +72,11 @@ def icon_button(
         return rx.tooltip(btn, content=tooltip)
     return btn
 
+# === BUTTON LABEL ===
+def button_label(icon: str, text: str, size: int = 16) -> rx.Component:
+    """Icon + text content for a button (new instance per call)"""
+    return rx.hstack(rx.icon(icon, size=size), rx.text(text), spacing="2")
+
 # === PREMIUM INPUT ===
 def premium_input(
     placeholder: str,
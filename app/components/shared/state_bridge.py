@@ -4,7 +4,7 @@ This module provides helpers to communicate with the JavaScript visibility contr
 without triggering React re-renders that cause Hooks order violations.
 """
 import reflex as rx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 def state_bridge() -> rx.Component:
@@ -36,23 +36,28 @@ def state_bridge() -> rx.Component:
     )
 
 
-def emit_state_change(change_type: str, value: Any) -> str:
+def emit_state_change(change_type: str, value: Any,
+                      last_emitted: Optional[Dict[str, str]] = None) -> str:
     """
     Generate JavaScript to emit a state change event.
 
     Args:
         change_type: Type of state change (simulation, alert, knowledge-graph, context-menu, chat)
         value: The new value (can be dict, bool, str, etc.)
+        last_emitted: Optional per-session cache (change_type -> serialized value),
+            normally a backend-only dict on the calling rx.State. When given,
+            values already emitted to this session are skipped.
 
     Returns:
-        JavaScript code string to emit the custom event
+        JavaScript code string to emit the custom event, or "" if the value
+        is unchanged since the last emit recorded in last_emitted
 
     Usage:
         yield rx.call_script(emit_state_change('simulation', {
             'running': True,
             'sensorCount': 5,
             'alertCount': 2
-        }))
+        }, last_emitted=self._bridge_emitted))
     """
     import json
 
@@ -66,6 +71,12 @@ def emit_state_change(change_type: str, value: Any) -> str:
     else:
         value_json = f'"{value}"'
 
+    # Only emit real changes (cache por sesión, nunca global al proceso)
+    if last_emitted is not None:
+        if last_emitted.get(change_type) == value_json:
+            return ""
+        last_emitted[change_type] = value_json
+
     return f"""
         (function() {{
             var event = new CustomEvent('nexusStateChange', {{
@@ -80,36 +91,41 @@ def emit_state_change(change_type: str, value: Any) -> str:
     """
 
 
-def update_simulation_visibility(running: bool, sensor_count: int = 0, alert_count: int = 0) -> str:
+def update_simulation_visibility(running: bool, sensor_count: int = 0, alert_count: int = 0,
+                                 last_emitted: Optional[Dict[str, str]] = None) -> str:
     """Generate JS to update simulation visibility state."""
     return emit_state_change('simulation', {
         'running': running,
         'sensorCount': sensor_count,
         'alertCount': alert_count
-    })
+    }, last_emitted)
 
 
-def update_alert_visibility(is_active: bool) -> str:
+def update_alert_visibility(is_active: bool,
+                            last_emitted: Optional[Dict[str, str]] = None) -> str:
     """Generate JS to update alert indicator visibility."""
-    return emit_state_change('alert', is_active)
+    return emit_state_change('alert', is_active, last_emitted)
 
 
-def update_knowledge_graph_visibility(is_expanded: bool) -> str:
+def update_knowledge_graph_visibility(is_expanded: bool,
+                                      last_emitted: Optional[Dict[str, str]] = None) -> str:
     """Generate JS to update knowledge graph panel visibility."""
-    return emit_state_change('knowledge-graph', is_expanded)
+    return emit_state_change('knowledge-graph', is_expanded, last_emitted)
 
 
-def update_context_menu_visibility(equipment: str, mode: str = 'main') -> str:
+def update_context_menu_visibility(equipment: str, mode: str = 'main',
+                                   last_emitted: Optional[Dict[str, str]] = None) -> str:
     """Generate JS to update context menu visibility."""
     return emit_state_change('context-menu', {
         'equipment': equipment,
         'mode': mode
-    })
+    }, last_emitted)
 
 
-def update_chat_panel_visibility(is_thinking: bool = False, awaiting_approval: bool = False) -> str:
+def update_chat_panel_visibility(is_thinking: bool = False, awaiting_approval: bool = False,
+                                 last_emitted: Optional[Dict[str, str]] = None) -> str:
     """Generate JS to update chat panel states visibility."""
     return emit_state_change('chat', {
         'thinking': is_thinking,
         'approval': awaiting_approval
-    })
+    }, last_emitted)
@@ -17,22 +17,28 @@ class DropZone(Box):
 
 drop_zone = DropZone.create
 
+# Clases precalculadas (los tokens son constantes de import)
+_DROP_OVERLAY_CLS = f"absolute inset-0 bg-emerald-500/5 border-2 border-dashed border-emerald-500/30 z-40 cursor-copy {TRANSITION_DEFAULT}"
+_BACKGROUND_PROPS = {"color": "#374151", "gap": 16, "size": 1, "variant": "dots"}
+_FLOW_STYLE = {"width": "100%", "height": "100%"}
+_DRAG_INDICATOR_CLS = "fixed bottom-24 left-1/2 transform -translate-x-1/2 bg-gray-900/90 backdrop-blur border border-emerald-500 px-4 py-2 rounded-full shadow-lg z-[100]"
+
 def workflow_canvas() -> rx.Component:
     """Canvas principal con ReactFlow"""
     return rx.box(
         react_flow(
-            background(color="#374151", gap=16, size=1, variant="dots"),
+            background(**_BACKGROUND_PROPS),
             controls(),
             nodes_draggable=True,
             nodes_connectable=True,
-            on_connect=lambda e0: WorkflowState.on_connect(e0),
-            on_nodes_change=lambda e0: WorkflowState.on_nodes_change(e0),
-            on_edges_change=lambda e0: WorkflowState.on_edges_change(e0),
+            on_connect=WorkflowState.on_connect,
+            on_nodes_change=WorkflowState.on_nodes_change,
+            on_edges_change=WorkflowState.on_edges_change,
             nodes=WorkflowState.nodes,
             edges=WorkflowState.edges,
             fit_view=True,
             class_name="bg-[#0a0a0f] w-full h-full",
-            style={"width": "100%", "height": "100%"}
+            style=_FLOW_STYLE
         ),
         drop_overlay(),
         drag_indicator(),
@@ -56,7 +62,7 @@ def drop_overlay() -> rx.Component:
                 ),
                 class_name="absolute inset-0 flex items-center justify-center pointer-events-none"
             ),
-            class_name=f"absolute inset-0 bg-emerald-500/5 border-2 border-dashed border-emerald-500/30 z-40 cursor-copy {TRANSITION_DEFAULT}",
+            class_name=_DROP_OVERLAY_CLS,
             on_mouse_up=WorkflowState.handle_drop,
             on_mouse_leave=WorkflowState.cancel_drag,
         ),
@@ -76,7 +82,7 @@ def drag_indicator() -> rx.Component:
                 ),
                 spacing="2"
             ),
-            class_name="fixed bottom-24 left-1/2 transform -translate-x-1/2 bg-gray-900/90 backdrop-blur border border-emerald-500 px-4 py-2 rounded-full shadow-lg z-[100]"
+            class_name=_DRAG_INDICATOR_CLS
         ),
         rx.fragment()
     )
\ No newline at end of file
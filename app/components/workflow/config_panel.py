@@ -8,6 +8,10 @@ from app.components.shared.design_tokens import (
 )
 from app.components.shared import form_field, gradient_separator
 
+# Clases precalculadas (los tokens son constantes de import)
+_PANEL_CLS = f"absolute top-20 right-4 {GLASS_PANEL_PREMIUM} p-4 rounded-xl z-50 w-80 max-w-[90vw] {SHADOW_XL}"
+_SAVE_BUTTON_CLS = f"{GRADIENT_PRIMARY} text-white w-full"
+
 def config_panel() -> rx.Component:
     """Panel flotante de configuración"""
     return rx.cond(
@@ -71,14 +75,14 @@ def config_panel() -> rx.Component:
                         spacing="2"
                     ),
                     variant="solid",
-                    class_name=f"{GRADIENT_PRIMARY} text-white w-full",
+                    class_name=_SAVE_BUTTON_CLS,
                     on_click=WorkflowState.save_node_config
                 ),
                 
                 spacing="3",
                 width="100%"
             ),
-            class_name=f"absolute top-20 right-4 {GLASS_PANEL_PREMIUM} p-4 rounded-xl z-50 w-80 max-w-[90vw] {SHADOW_XL}"
+            class_name=_PANEL_CLS
         ),
         rx.fragment()
     )
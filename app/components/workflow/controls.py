@@ -4,65 +4,12 @@ import reflex as rx
 from app.states.simulation_state import SimulationState
 from app.states.workflow_state import WorkflowState
 from app.components.shared.design_tokens import GRADIENT_PRIMARY, GRADIENT_DANGER, TRANSITION_DEFAULT
-from app.components.shared import status_dot
-
-# JavaScript for simulation ticker
-SIMULATION_SCRIPT = """
-(function() {
-    var ticker = null;
-    var lastRunning = 'false';
-    
-    function checkSim() {
-        var stateEl = document.getElementById('sim-state');
-        var tickBtn = document.getElementById('sim-tick-btn');
-        if (!stateEl || !tickBtn) return;
-        
-        var running = stateEl.getAttribute('data-running');
-        var speed = parseInt(stateEl.getAttribute('data-speed') || '2') * 1000;
-        
-        if (running === 'true' && lastRunning === 'false') {
-            console.log('[Simulation] Starting ticker, interval:', speed);
-            ticker = setInterval(function() {
-                var btn = document.getElementById('sim-tick-btn');
-                if (btn) btn.click();
-            }, speed);
-        }
-        
-        if (running === 'false' && lastRunning === 'true') {
-            console.log('[Simulation] Stopping ticker');
-            if (ticker) {
-                clearInterval(ticker);
-                ticker = null;
-            }
-        }
-        
-        lastRunning = running;
-    }
-    
-    setInterval(checkSim, 500);
-    console.log('[Simulation] Controller loaded');
-})();
-"""
+from app.components.shared import status_dot, button_label
 
 
 def simulation_controls() -> rx.Component:
     """Barra inferior con controles"""
     return rx.vstack(
-        # Hidden elements for JS
-        rx.script(SIMULATION_SCRIPT),
-        rx.button(
-            "tick",
-            id="sim-tick-btn",
-            on_click=SimulationState.simulation_tick,
-            style={"display": "none"}
-        ),
-        rx.box(
-            id="sim-state",
-            data_running=SimulationState.simulation_running.to_string(),
-            data_speed=SimulationState.simulation_speed.to_string(),
-            style={"display": "none"}
-        ),
-        
         # Controls bar
         rx.hstack(
             # Status
@@ -76,7 +23,7 @@ def simulation_controls() -> rx.Component:
                             class_name="text-xs font-bold text-emerald-400 uppercase tracking-wide"
                         ),
                         rx.text(
-                            f"Tick #{SimulationState.simulation_tick_count}",
+                            SimulationState.tick_label,
                             class_name="text-xs text-gray-500 font-mono"
                         ),
                         spacing="2"
@@ -107,7 +54,7 @@ def simulation_controls() -> rx.Component:
                             rx.select.item("Normal (2s)", value="2"),
                             rx.select.item("Slow (5s)", value="5"),
                         ),
-                        value=SimulationState.simulation_speed.to_string(),
+                        value=SimulationState.simulation_speed_str,
                         on_change=SimulationState.set_simulation_speed,
                         size="1"
                     ),
@@ -117,11 +64,7 @@ def simulation_controls() -> rx.Component:
                 
                 # Test Alert
                 rx.button(
-                    rx.hstack(
-                        rx.icon("zap", size=14),
-                        rx.text("Test Alert"),
-                        spacing="2"
-                    ),
+                    button_label("zap", "Test Alert", size=14),
                     variant="outline",
                     color_scheme="yellow",
                     size="1",
@@ -133,22 +76,14 @@ def simulation_controls() -> rx.Component:
                 rx.cond(
                     SimulationState.simulation_running,
                     rx.button(
-                        rx.hstack(
-                            rx.icon("square", size=14),
-                            rx.text("Stop"),
-                            spacing="2"
-                        ),
+                        button_label("square", "Stop", size=14),
                         variant="solid",
                         class_name=f"{GRADIENT_DANGER} text-white",
                         size="2",
                         on_click=SimulationState.stop_simulation
                     ),
                     rx.button(
-                        rx.hstack(
-                            rx.icon("play", size=14),
-                            rx.text("Start Simulation"),
-                            spacing="2"
-                        ),
+                        button_label("play", "Start Simulation", size=14),
                         variant="solid",
                         class_name=f"{GRADIENT_PRIMARY} text-white",
                         size="2",
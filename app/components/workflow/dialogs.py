@@ -5,6 +5,10 @@ from app.states.workflow_state import WorkflowState
 from app.components.shared.design_tokens import GLASS_STRONG, SHADOW_XL 
 from app.components.shared import gradient_separator, icon_button
 
+# Filas fuera de pantalla: el navegador omite layout/paint (virtualización CSS)
+_WORKFLOW_ROW_STYLE = {"content_visibility": "auto", "contain_intrinsic_size": "auto 64px"}
+_RESULT_ROW_STYLE = {"content_visibility": "auto", "contain_intrinsic_size": "auto 52px"}
+
 def workflow_list_dialog() -> rx.Component:
     """Diálogo de workflows guardados"""
     return rx.cond(
@@ -36,7 +40,7 @@ def workflow_list_dialog() -> rx.Component:
                     gradient_separator(),
                     
                     rx.cond(
-                        WorkflowState.saved_workflows.length() > 0,
+                        WorkflowState.has_saved_workflows,
                         rx.vstack(
                             rx.foreach(
                                 WorkflowState.saved_workflows,
@@ -81,13 +85,13 @@ def workflow_list_item(workflow: rx.Var[dict]) -> rx.Component:
         rx.hstack(
             icon_button(
                 "folder-open",
-                lambda: WorkflowState.load_workflow(workflow['id']),
+                WorkflowState.load_workflow(workflow['id']),
                 size=14,
                 tooltip="Open"
             ),
             icon_button(
                 "trash-2",
-                lambda: WorkflowState.delete_workflow(workflow['id']),
+                WorkflowState.delete_workflow(workflow['id']),
                 variant="danger",
                 size=14,
                 tooltip="Delete"
@@ -95,7 +99,8 @@ def workflow_list_item(workflow: rx.Var[dict]) -> rx.Component:
             spacing="1"
         ),
         class_name="w-full p-3 bg-gray-800/50 rounded-lg hover:bg-gray-800 transition-colors border border-white/5",
-        width="100%"
+        width="100%",
+        style=_WORKFLOW_ROW_STYLE
     )
 
 def test_results_dialog() -> rx.Component:
@@ -127,7 +132,7 @@ def test_results_dialog() -> rx.Component:
                     gradient_separator(),
                     
                     rx.cond(
-                        WorkflowState.test_results.length() > 0,
+                        WorkflowState.has_test_results,
                         rx.vstack(
                             rx.foreach(
                                 WorkflowState.test_results,
@@ -180,5 +185,6 @@ def test_result_item(result: rx.Var[dict]) -> rx.Component:
             size="1"
         ),
         class_name="w-full p-2 bg-gray-800/50 rounded border border-white/5",
-        width="100%"
+        width="100%",
+        style=_RESULT_ROW_STYLE
     )
\ No newline at end of file
@@ -3,7 +3,8 @@
 import reflex as rx
 from app.states.workflow_state import WorkflowState
 from app.components.shared.design_tokens import GRADIENT_PRIMARY, TRANSITION_DEFAULT, INPUT_BASE
-from app.components.shared import stat_pill
+from app.components.shared import stat_pill, button_label
+
 
 def workflow_header() -> rx.Component:
     """Header con nombre, stats y acciones"""
@@ -12,11 +13,15 @@ def workflow_header() -> rx.Component:
         rx.hstack(
             rx.icon("workflow", size=24, class_name="text-blue-400"),
             rx.vstack(
-                rx.input(
-                    value=WorkflowState.current_workflow_name,
-                    on_change=WorkflowState.set_workflow_name,
-                    class_name="text-lg font-bold text-slate-100 bg-transparent border-none focus:outline-none w-48 placeholder-slate-500",
-                    placeholder="Workflow name..."
+                # Debounced: one state update per typing burst
+                rx.debounce_input(
+                    rx.input(
+                        value=WorkflowState.current_workflow_name,
+                        on_change=WorkflowState.set_workflow_name,
+                        class_name="text-lg font-bold text-slate-100 bg-transparent border-none focus:outline-none w-48 placeholder-slate-500",
+                        placeholder="Workflow name..."
+                    ),
+                    debounce_timeout=300,
                 ),
                 rx.hstack(
                     rx.badge(
@@ -48,26 +53,26 @@ def workflow_header() -> rx.Component:
         # Right: Actions
         rx.hstack(
             rx.button(
-                rx.hstack(rx.icon("folder-open", size=16), rx.text("Open"), spacing="2"),
+                button_label("folder-open", "Open"),
                 variant="ghost",
                 on_click=WorkflowState.toggle_workflow_list,
                 class_name=TRANSITION_DEFAULT
             ),
             rx.button(
-                rx.hstack(rx.icon("file-plus", size=16), rx.text("New"), spacing="2"),
+                button_label("file-plus", "New"),
                 variant="ghost",
                 on_click=WorkflowState.new_workflow,
                 class_name=TRANSITION_DEFAULT
             ),
             rx.button(
-                rx.hstack(rx.icon("play", size=16), rx.text("Test"), spacing="2"),
+                button_label("play", "Test"),
                 variant="outline",
                 color_scheme="yellow",
                 on_click=WorkflowState.test_workflow_execution,
                 class_name=TRANSITION_DEFAULT
             ),
             rx.button(
-                rx.hstack(rx.icon("save", size=16), rx.text("Save"), spacing="2"),
+                button_label("save", "Save"),
                 variant="solid",
                 color_scheme="blue",
                 on_click=WorkflowState.save_workflow,
@@ -76,20 +81,20 @@ def workflow_header() -> rx.Component:
             rx.cond(
                 WorkflowState.current_workflow_status == "active",
                 rx.button(
-                    rx.hstack(rx.icon("pause", size=16), rx.text("Pause"), spacing="2"),
+                    button_label("pause", "Pause"),
                     variant="outline",
                     color_scheme="yellow",
                     on_click=WorkflowState.pause_workflow
                 ),
                 rx.button(
-                    rx.hstack(rx.icon("zap", size=16), rx.text("Activate"), spacing="2"),
+                    button_label("zap", "Activate"),
                     variant="solid",
                     class_name=f"{GRADIENT_PRIMARY} text-white",
                     on_click=WorkflowState.activate_workflow
                 )
             ),
             rx.button(
-                rx.hstack(rx.icon("home", size=16), rx.text("Monitor"), spacing="2"),
+                button_label("home", "Monitor"),
                 variant="ghost",
                 on_click=rx.redirect("/")
             ),
@@ -5,22 +5,14 @@ from app.states.workflow_state import WorkflowState
 from app.components.shared.design_tokens import GLASS_PANEL_PREMIUM, TRANSITION_DEFAULT
 from app.components.shared import section_label, icon_button
 
-def get_icon(icon_name: rx.Var[str], size: int = 16) -> rx.Component:
-    """Get icon by name"""
-    return rx.match(
-        icon_name,
-        ("scan", rx.icon("scan", size=size)),
-        ("box", rx.icon("box", size=size)),
-        ("circle-dot", rx.icon("circle-dot", size=size)),
-        ("package", rx.icon("package", size=size)),
-        ("arrow-right", rx.icon("arrow-right", size=size)),
-        ("globe", rx.icon("globe", size=size)),
-        ("message-circle", rx.icon("message-circle", size=size)),
-        ("mail", rx.icon("mail", size=size)),
-        ("bell", rx.icon("bell", size=size)),
-        rx.icon("circle-help", size=size)
-    )
+# Clases de gradiente por color de categoría: strings literales completos
+# para que Tailwind los detecte (no se concatenan en el render)
+_GRADIENT_BG = {
+    c: f"p-2 rounded bg-gradient-to-br from-{c}-500/20 to-{c}-600/10"
+    for c in ('purple', 'blue', 'cyan', 'green', 'yellow', 'red', 'gray')
+}
 
+@rx.memo
 def category_button(category: rx.Var[dict]) -> rx.Component:
     """Botón draggable de categoría"""
     return rx.box(
@@ -28,8 +20,12 @@ def category_button(category: rx.Var[dict]) -> rx.Component:
             rx.hstack(
                 # Icon with gradient background
                 rx.box(
-                    get_icon(category['icon'], size=18),
-                    class_name=f"p-2 rounded bg-gradient-to-br from-{category['color']}-500/20 to-{category['color']}-600/10"
+                    rx.icon(category['icon'].to(str), size=18),
+                    class_name=rx.match(
+                        category['color'],
+                        *_GRADIENT_BG.items(),
+                        _GRADIENT_BG['gray'],
+                    )
                 ),
                 rx.text(category['name'], size="2", class_name="font-medium"),
                 spacing="2"
@@ -43,12 +39,14 @@ def category_button(category: rx.Var[dict]) -> rx.Component:
             type="button",
         ),
         class_name="w-full select-none",
+        # Throttled: only the first mousedown of a burst reaches the backend
         on_mouse_down=WorkflowState.start_drag(
             category['key'],
             category['type'] == 'action'
-        ),
+        ).throttle(50),
     )
 
+@rx.memo
 def equipment_panel() -> rx.Component:
     """Panel lateral izquierdo"""
     return rx.cond(
@@ -82,13 +80,13 @@ def equipment_panel() -> rx.Component:
                             "text-[9px] text-slate-500 mb-2 italic"
                         )
                     ),
-                    rx.foreach(WorkflowState.equipment_categories, category_button),
+                    rx.foreach(WorkflowState.equipment_categories, lambda c: category_button(category=c)),
                     
                     rx.box(class_name="h-px w-full bg-gradient-to-r from-transparent via-slate-500/30 to-transparent my-4"),
                     
                     # Actions
                     section_label("ACTIONS"),
-                    rx.foreach(WorkflowState.action_categories, category_button),
+                    rx.foreach(WorkflowState.action_categories, lambda c: category_button(category=c)),
                     
                     spacing="2",
                     width="100%"
@@ -1,76 +1,119 @@
 # app/extractors/glb_parser.py
+import io
+import mmap
+import re
 import struct
 import json
+from functools import lru_cache
 from typing import List, Dict, Tuple
 from pathlib import Path
 
+try:
+    import ijson  # Opcional: streaming del chunk JSON
+except ImportError:
+    ijson = None
+
+# Header GLB (12 bytes) + cabecera del primer chunk (8 bytes), en un solo unpack
+_GLB_HEADER = struct.Struct('<4sIII4s')
+
+# Patrón -> tipo, en orden de prioridad (el primero presente en el nombre gana)
+_EQUIPMENT_PATTERNS = (
+    ('analyzer', 'analyzer'),
+    ('cartesian', 'robot'),
+    ('centrifuge', 'centrifuge'),
+    ('storage', 'storage'),
+    ('conveyor', 'conveyor'),
+    ('mixer', 'mixer'),
+    ('pump', 'pump'),
+)
+
+# Una sola alternancia recorre el nombre una vez; el rango de cada patrón
+# decide entre varios aciertos (gana el de mayor prioridad, no el primero)
+_CLASSIFY_RE = re.compile(
+    '|'.join(pattern for pattern, _ in _EQUIPMENT_PATTERNS), re.IGNORECASE
+)
+_PATTERN_RANK = {
+    pattern: (rank, eq_type) for rank, (pattern, eq_type) in enumerate(_EQUIPMENT_PATTERNS)
+}
+
+# Nodos auxiliares del modelo (no son equipos), más los '_Link' que no
+# corresponden a ningún tipo conocido: un solo search cubre ambos casos
+_SKIP_RE = re.compile(
+    r'geo_|Object_|root|Scene'
+    r'|^(?!.*?(?i:' + '|'.join(pattern for pattern, _ in _EQUIPMENT_PATTERNS) + r')).*?_Link',
+    re.DOTALL
+)
+
 
 def parse_glb(filepath: str) -> Dict:
     """Extract equipment nodes from GLB file"""
     with open(filepath, 'rb') as f:
-        # GLB header
-        magic = f.read(4)
-        if magic != b'glTF':
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Archivo vacío
+            raise ValueError("Invalid GLB file")
+    
+    with mm:
+        if mm[:4] != b'glTF' or len(mm) < _GLB_HEADER.size:
             raise ValueError("Invalid GLB file")
         
-        version = struct.unpack('<I', f.read(4))[0]
-        length = struct.unpack('<I', f.read(4))[0]
+        magic, version, length, json_length, json_type = _GLB_HEADER.unpack_from(mm, 0)
         
         # JSON chunk
-        json_length = struct.unpack('<I', f.read(4))[0]
-        json_type = f.read(4)
-        json_data = f.read(json_length)
-        gltf = json.loads(json_data)
+        json_data = mm[_GLB_HEADER.size:_GLB_HEADER.size + json_length]
     
     equipment = []
-    for idx, node in enumerate(gltf['nodes']):
+    for idx, node in enumerate(_iter_nodes(json_data)):
         name = node.get('name', '')
         
         # Skip visual helpers
-        if not name or any(x in name for x in ['geo_', 'Object_', 'root', 'Scene']):
+        if not name or _SKIP_RE.search(name):
             continue
             
         # Extract equipment type from name
         eq_type = _classify_equipment(name)
-        if eq_type == 'unknown' and '_Link' in name:
-            continue
-            
+        position = node.get('translation', [0, 0, 0])
+        
         equipment.append({
             'id': str(idx),
             'name': name,
             'type': eq_type,
-            'position': node.get('translation', [0, 0, 0])
+            'position': position
         })
     
     return {'equipment': equipment, 'total': len(equipment)}
 
 
+def _iter_nodes(json_data: bytes):
+    """Iterate the glTF 'nodes' array without materializing the rest of the scene"""
+    if ijson is not None:
+        return ijson.items(io.BytesIO(json_data), 'nodes.item', use_float=True)
+    return iter(json.loads(json_data).get('nodes', []))
+
+
 def _classify_equipment(name: str) -> str:
     """Classify equipment by name pattern"""
-    name_lower = name.lower()
-    
-    patterns = {
-        'analyzer': 'analyzer',
-        'cartesian': 'robot',
-        'centrifuge': 'centrifuge',
-        'storage': 'storage',
-        'conveyor': 'conveyor',
-        'mixer': 'mixer',
-        'pump': 'pump'
-    }
-    
-    for pattern, eq_type in patterns.items():
-        if pattern in name_lower:
-            return eq_type
-    
-    return 'unknown'
+    best = min(
+        (_PATTERN_RANK[match.group().lower()] for match in _CLASSIFY_RE.finditer(name)),
+        default=None
+    )
+    return best[1] if best else 'unknown'
 
 
 def load_equipment_from_glb(glb_path: str = "assets/pharmaceutical_manufacturing_machinery.glb") -> List[Dict]:
     """Load and enrich equipment from GLB file"""
-    if not Path(glb_path).exists():
+    try:
+        mtime = Path(glb_path).stat().st_mtime
+    except OSError:
         return []
     
+    # Cache keyed on path+mtime: the asset is only re-parsed if it changes
+    return list(_load_equipment_cached(glb_path, mtime))
+
+
+@lru_cache(maxsize=4)
+def _load_equipment_cached(glb_path: str, mtime: float) -> Tuple[Dict, ...]:
+    """Parse and enrich equipment once per (path, mtime)"""
     data = parse_glb(glb_path)
     equipment_list = []
     
@@ -82,40 +125,44 @@ def load_equipment_from_glb(glb_path: str = "assets/pharmaceutical_manufacturing
         }
         equipment_list.append(enriched)
     
-    return equipment_list
+    return tuple(equipment_list)
+
+
+# Definiciones de sensores por tipo (constantes de módulo, compartidas)
+_SENSOR_DB = {
+    'analyzer': [
+        {'id': 'temp', 'name': 'Temperature', 'unit': '°C', 'range': [15, 30]},
+        {'id': 'ph', 'name': 'pH Level', 'unit': 'pH', 'range': [6.5, 7.5]},
+        {'id': 'turbidity', 'name': 'Turbidity', 'unit': 'NTU', 'range': [0, 5]}
+    ],
+    'robot': [
+        {'id': 'x_pos', 'name': 'X Position', 'unit': 'mm', 'range': [0, 2000]},
+        {'id': 'y_pos', 'name': 'Y Position', 'unit': 'mm', 'range': [0, 1500]},
+        {'id': 'vibration', 'name': 'Vibration', 'unit': 'mm/s', 'range': [0, 5]},
+        {'id': 'current', 'name': 'Motor Current', 'unit': 'A', 'range': [0.5, 2.0]}
+    ],
+    'centrifuge': [
+        {'id': 'rpm', 'name': 'RPM', 'unit': 'RPM', 'range': [3000, 5000]},
+        {'id': 'vibration', 'name': 'Vibration', 'unit': 'mm/s', 'range': [0, 3]},
+        {'id': 'temp', 'name': 'Temperature', 'unit': '°C', 'range': [20, 35]}
+    ],
+    'storage': [
+        {'id': 'level', 'name': 'Fill Level', 'unit': '%', 'range': [20, 90]},
+        {'id': 'temp', 'name': 'Temperature', 'unit': '°C', 'range': [15, 25]},
+        {'id': 'humidity', 'name': 'Humidity', 'unit': '%RH', 'range': [30, 60]}
+    ],
+    'conveyor': [
+        {'id': 'speed', 'name': 'Belt Speed', 'unit': 'm/min', 'range': [5, 30]},
+        {'id': 'current', 'name': 'Motor Current', 'unit': 'A', 'range': [1, 3]},
+        {'id': 'vibration', 'name': 'Vibration', 'unit': 'mm/s', 'range': [0, 2]}
+    ]
+}
+
+_DEFAULT_SENSORS = [
+    {'id': 'temp', 'name': 'Temperature', 'unit': '°C', 'range': [0, 100]}
+]
 
 
 def get_sensors_for_type(eq_type: str) -> List[Dict]:
-    """Get sensor definitions for equipment type"""
-    sensor_db = {
-        'analyzer': [
-            {'id': 'temp', 'name': 'Temperature', 'unit': '°C', 'range': [15, 30]},
-            {'id': 'ph', 'name': 'pH Level', 'unit': 'pH', 'range': [6.5, 7.5]},
-            {'id': 'turbidity', 'name': 'Turbidity', 'unit': 'NTU', 'range': [0, 5]}
-        ],
-        'robot': [
-            {'id': 'x_pos', 'name': 'X Position', 'unit': 'mm', 'range': [0, 2000]},
-            {'id': 'y_pos', 'name': 'Y Position', 'unit': 'mm', 'range': [0, 1500]},
-            {'id': 'vibration', 'name': 'Vibration', 'unit': 'mm/s', 'range': [0, 5]},
-            {'id': 'current', 'name': 'Motor Current', 'unit': 'A', 'range': [0.5, 2.0]}
-        ],
-        'centrifuge': [
-            {'id': 'rpm', 'name': 'RPM', 'unit': 'RPM', 'range': [3000, 5000]},
-            {'id': 'vibration', 'name': 'Vibration', 'unit': 'mm/s', 'range': [0, 3]},
-            {'id': 'temp', 'name': 'Temperature', 'unit': '°C', 'range': [20, 35]}
-        ],
-        'storage': [
-            {'id': 'level', 'name': 'Fill Level', 'unit': '%', 'range': [20, 90]},
-            {'id': 'temp', 'name': 'Temperature', 'unit': '°C', 'range': [15, 25]},
-            {'id': 'humidity', 'name': 'Humidity', 'unit': '%RH', 'range': [30, 60]}
-        ],
-        'conveyor': [
-            {'id': 'speed', 'name': 'Belt Speed', 'unit': 'm/min', 'range': [5, 30]},
-            {'id': 'current', 'name': 'Motor Current', 'unit': 'A', 'range': [1, 3]},
-            {'id': 'vibration', 'name': 'Vibration', 'unit': 'mm/s', 'range': [0, 2]}
-        ]
-    }
-    
-    return sensor_db.get(eq_type, [
-        {'id': 'temp', 'name': 'Temperature', 'unit': '°C', 'range': [0, 100]}
-    ])
\ No newline at end of file
+    """Get sensor definitions for equipment type (shared, do not mutate)"""
+    return _SENSOR_DB.get(eq_type, _DEFAULT_SENSORS)
@@ -4,10 +4,10 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class WorkflowStatus(Enum):
+class WorkflowStatus(StrEnum):
     """Workflow status options."""
     DRAFT = "draft"
     ACTIVE = "active"
@@ -15,14 +15,14 @@ class WorkflowStatus(Enum):
     ERROR = "error"
 
 
-class AlertSeverity(Enum):
+class AlertSeverity(StrEnum):
     """Alert severity levels."""
     INFO = "info"
     WARNING = "warning"
     CRITICAL = "critical"
 
 
-class ActionType(Enum):
+class ActionType(StrEnum):
     """Supported action types."""
     WHATSAPP = "whatsapp"
     EMAIL = "email"
@@ -30,7 +30,7 @@ class ActionType(Enum):
     SYSTEM_ALERT = "alert"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SensorReading:
     """A single sensor reading."""
     equipment_id: str
@@ -40,7 +40,7 @@ class SensorReading:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ThresholdConfig:
     """Configuration for threshold-based triggers."""
     sensor_type: str
@@ -50,7 +50,7 @@ class ThresholdConfig:
     unit: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionConfig:
     """Configuration for action nodes."""
     action_type: ActionType
@@ -59,7 +59,7 @@ class ActionConfig:
     message_template: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowNode:
     """A node in the workflow."""
     id: str
@@ -72,7 +72,7 @@ class WorkflowNode:
     config: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowEdge:
     """An edge connecting two nodes."""
     id: str
@@ -81,7 +81,7 @@ class WorkflowEdge:
     animated: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class Workflow:
     """Complete workflow definition."""
     id: str
@@ -94,7 +94,7 @@ class Workflow:
     updated_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AlertLog:
     """Log entry for an alert."""
     id: int
@@ -107,7 +107,7 @@ class AlertLog:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of a workflow execution."""
     workflow_id: str
@@ -11,9 +11,9 @@ from app.components.monitor.sensor_dashboard import live_sensor_dashboard
 from app.components.monitor.alert_feed import alert_feed_panel
 from app.components.monitor.chat_panel import chat_panel
 from app.components.shared.design_tokens import COLORS
-from app.components.shared.simulation_controller import simulation_controller
 from app.components.shared.state_bridge import state_bridge
 
+@rx.memo
 def monitor_header() -> rx.Component:
     """Header with navigation and simulation status"""
     return rx.hstack(
@@ -28,7 +28,7 @@ def monitor_header() -> rx.Component:
         rx.badge(
             rx.hstack(
                 rx.box(class_name="w-2 h-2 bg-emerald-500 rounded-full animate-pulse"),
-                rx.text(f"SIMULATION ACTIVE • Tick #{SimulationState.simulation_tick_count}"),
+                rx.text(f"SIMULATION ACTIVE • {SimulationState.tick_label}"),
                 spacing="2"
             ),
             id="sim-status-active",
@@ -55,9 +55,6 @@ def monitor_header() -> rx.Component:
 def monitor_page() -> rx.Component:
     """Monitor Page - Vista principal (responsive layout)"""
     return rx.box(
-        # Simulation controller (ticker + state elements)
-        simulation_controller(),
-        
         rx.vstack(
             monitor_header(),
             
@@ -8,6 +8,9 @@ Uses rx.Component (not NoSSRComponent) as per the working example.
 import reflex as rx
 from typing import Any, Dict, List
 
+# CSS de ReactFlow: mismo import para todos los subcomponentes
+_CUSTOM_CODE = "import 'reactflow/dist/style.css';"
+
 
 class ReactFlowLib(rx.Component):
     """
@@ -18,9 +21,10 @@ class ReactFlowLib(rx.Component):
     """
     library = "reactflow@11.10.1"
     
-    def _get_custom_code(self) -> str:
+    @classmethod
+    def _get_custom_code(cls) -> str:
         """Import ReactFlow's CSS styles"""
-        return """import 'reactflow/dist/style.css';"""
+        return _CUSTOM_CODE
 
 
 class ReactFlow(ReactFlowLib):
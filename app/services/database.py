@@ -6,13 +6,213 @@ Handles all database operations for workflows, executions, and alert logs.
 Uses SQLite for lightweight demo deployment.
 """
 import sqlite3
+import hashlib
 import json
 import os
-from datetime import datetime
+import queue
+import threading
 from typing import List, Dict, Any, Optional
 from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import orjson  # Opcional: codec JSON en C, más rápido que el stdlib
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+else:
+    # Misma salida compacta y UTF-8 que orjson, para que el diff de filas no
+    # vea cambios espurios al pasar de un codec a otro
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+    _loads = json.loads
+
+# Ajustes por conexión (journal_mode=WAL es persistente y se fija en _init_schema)
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+# INSERTs compartidos por los métodos de una fila y los lotes (mismo SQL ->
+# misma sentencia preparada en la caché de sqlite3)
+_INSERT_ALERT = """
+    INSERT INTO alert_logs 
+    (execution_id, workflow_id, action_type, recipient, message, status, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_SENSOR_READING = """
+    INSERT INTO sensor_readings (equipment_id, sensor_type, value, unit)
+    VALUES (?, ?, ?, ?)
+"""
+
+# INSERT ... RETURNING id (SQLite 3.35+) devuelve el id en la misma sentencia;
+# solo para inserts de una fila, executemany no admite sentencias con resultado
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_RETURNING_ID = " RETURNING id" if _HAS_RETURNING else ""
+_INSERT_EXECUTION = """
+    INSERT INTO workflow_executions (workflow_id, triggered_by, trigger_data, status)
+    VALUES (?, ?, ?, 'running')
+""" + _RETURNING_ID
+_INSERT_ALERT_RETURNING = _INSERT_ALERT + _RETURNING_ID
+
+# Timestamp generado por SQLite: mismo formato UTC que DEFAULT CURRENT_TIMESTAMP,
+# con milisegundos para que ORDER BY updated_at no empate dentro del mismo segundo
+_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+# Columnas de workflows (compartidas con la reconstrucción de la migración)
+_WORKFLOWS_COLUMNS_SQL = """(
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    status TEXT DEFAULT 'draft',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)"""
+
+# ALTER TABLE ... DROP COLUMN solo existe desde SQLite 3.35
+_HAS_DROP_COLUMN = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Esquema completo en un solo script (WAL es persistente y va fuera de la transacción)
+_SCHEMA_SQL = """
+PRAGMA journal_mode=WAL;
+BEGIN;
+
+-- Workflows
+CREATE TABLE IF NOT EXISTS workflows """ + _WORKFLOWS_COLUMNS_SQL + """;
+
+-- Nodes/edges normalizados: una fila por elemento del grafo, así un
+-- save solo reescribe lo que cambió
+CREATE TABLE IF NOT EXISTS workflow_nodes (
+    workflow_id TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data_json TEXT NOT NULL,
+    PRIMARY KEY (workflow_id, node_id),
+    FOREIGN KEY (workflow_id) REFERENCES workflows(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS workflow_edges (
+    workflow_id TEXT NOT NULL,
+    edge_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    source TEXT,
+    target TEXT,
+    data_json TEXT NOT NULL,
+    PRIMARY KEY (workflow_id, edge_id),
+    FOREIGN KEY (workflow_id) REFERENCES workflows(id) ON DELETE CASCADE
+);
+
+-- Tablas de log append-only: INTEGER PRIMARY KEY ya asigna el rowid; sin
+-- AUTOINCREMENT no se escribe sqlite_sequence en cada INSERT (nunca se borran filas)
+
+-- Workflow executions
+CREATE TABLE IF NOT EXISTS workflow_executions (
+    id INTEGER PRIMARY KEY,
+    workflow_id TEXT NOT NULL,
+    triggered_by TEXT,
+    trigger_data TEXT,
+    status TEXT DEFAULT 'running',
+    result TEXT,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    FOREIGN KEY (workflow_id) REFERENCES workflows(id)
+);
+
+-- Alert logs
+CREATE TABLE IF NOT EXISTS alert_logs (
+    id INTEGER PRIMARY KEY,
+    execution_id INTEGER,
+    workflow_id TEXT NOT NULL,
+    action_type TEXT NOT NULL,
+    recipient TEXT,
+    message TEXT,
+    status TEXT DEFAULT 'pending',
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (execution_id) REFERENCES workflow_executions(id),
+    FOREIGN KEY (workflow_id) REFERENCES workflows(id)
+);
+
+-- Sensor data (for simulation/demo)
+CREATE TABLE IF NOT EXISTS sensor_readings (
+    id INTEGER PRIMARY KEY,
+    equipment_id TEXT NOT NULL,
+    sensor_type TEXT NOT NULL,
+    value REAL NOT NULL,
+    unit TEXT,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Índices para los ORDER BY ... DESC LIMIT de las consultas "recent/latest"
+CREATE INDEX IF NOT EXISTS idx_exec_wf_started ON workflow_executions(workflow_id, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_exec_started ON workflow_executions(started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_alerts_type_created ON alert_logs(action_type, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_alerts_created ON alert_logs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_sensor_eq_type_ts ON sensor_readings(equipment_id, sensor_type, timestamp DESC);
+
+COMMIT;
+"""
+
+# Conexiones de lectura que se mantienen abiertas (WAL permite lectores concurrentes)
+_READ_POOL_SIZE = os.cpu_count() or 4
+
+
+def _alert_row(workflow_id: str, action_type: str, recipient: str,
+               message: str, status: str = 'pending',
+               execution_id: Optional[int] = None,
+               error_message: Optional[str] = None) -> tuple:
+    return (execution_id, workflow_id, action_type, recipient, message, status, error_message)
+
+
+def _sensor_reading_row(equipment_id: str, sensor_type: str,
+                        value: float, unit: str) -> tuple:
+    return (equipment_id, sensor_type, value, unit)
+
+
+def _insert_returning_id(conn: sqlite3.Connection, sql: str, params: tuple) -> int:
+    """Run a single-row INSERT and return the generated id."""
+    cursor = conn.execute(sql, params)
+    return cursor.fetchone()[0] if _HAS_RETURNING else cursor.lastrowid
+
+
+def _rows_as_dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+    """Materialize a result set as dicts, reading the column names once."""
+    fields = [col[0] for col in cursor.description]
+    return [dict(zip(fields, row)) for row in cursor]
+
+
+def _graph_rows(nodes: List[Dict], edges: List[Dict]) -> tuple:
+    """Serialize a graph into (key, seq, ..., data_json) rows for the child tables."""
+    # Elementos sin id (no deberían existir en ReactFlow) se indexan por posición
+    node_rows = tuple(
+        (node.get('id') or f'#{seq}', seq, _dumps(node))
+        for seq, node in enumerate(nodes)
+    )
+    edge_rows = tuple(
+        (edge.get('id') or f'#{seq}', seq, edge.get('source'), edge.get('target'), _dumps(edge))
+        for seq, edge in enumerate(edges)
+    )
+    return node_rows, edge_rows
+
+
+class _Batch:
+    """Rows buffered by a batched_* context, flushed with one executemany."""
+    
+    def __init__(self, to_row):
+        self._to_row = to_row
+        self.rows: List[tuple] = []
+    
+    def log(self, *args, **kwargs):
+        """Buffer one row (same arguments as the matching log_* method)."""
+        self.rows.append(self._to_row(*args, **kwargs))
+
 
 class DatabaseService:
     """Singleton database service for workflow persistence."""
@@ -31,169 +231,254 @@ class DatabaseService:
             return
         self._initialized = True
         self._ensure_db_directory()
+        # Una sola conexión de escritura (serializada con lock) + pool de lectura
+        self._write_conn = self._connect()
+        self._write_lock = threading.Lock()
+        self._read_pool: queue.Queue = queue.Queue(maxsize=_READ_POOL_SIZE)
+        # Digest del último payload escrito por workflow: un save idéntico no vuelve a escribir
+        self._saved_payloads: Dict[str, bytes] = {}
+        # Se incrementa en cada escritura de workflows; invalida cachés de lectura
+        self.workflows_version = 0
         self._init_schema()
     
     def _ensure_db_directory(self):
         """Ensure the data directory exists."""
         Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a tuned connection (shared across threads, guarded by the caller)."""
+        # IMMEDIATE: las escrituras toman el lock al empezar la transacción
+        conn = sqlite3.connect(self._db_path, isolation_level="IMMEDIATE",
+                               check_same_thread=False)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     @contextmanager
-    def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
+    def _get_write_connection(self):
+        """Context manager for the single writer connection (one transaction)."""
+        with self._write_lock:
+            conn = self._write_conn
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+    
+    @contextmanager
+    def _get_read_connection(self):
+        """Context manager that checks a reader out of the pool."""
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            # Solo los lectores construyen sqlite3.Row; el escritor usa tuplas
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
         try:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
         finally:
-            conn.close()
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
+    @contextmanager
+    def _batched(self, sql: str, to_row):
+        """Yield a _Batch and flush its rows with executemany (one transaction)."""
+        batch = _Batch(to_row)
+        yield batch
+        if batch.rows:
+            with self._get_write_connection() as conn:
+                conn.executemany(sql, batch.rows)
+    
+    def close(self):
+        """Close the writer and all pooled reader connections."""
+        with self._write_lock:
+            self._write_conn.close()
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
     
     def _init_schema(self):
         """Initialize database schema."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Workflows table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS workflows (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    nodes_json TEXT NOT NULL,
-                    edges_json TEXT NOT NULL,
-                    status TEXT DEFAULT 'draft',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Workflow executions table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS workflow_executions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    workflow_id TEXT NOT NULL,
-                    triggered_by TEXT,
-                    trigger_data TEXT,
-                    status TEXT DEFAULT 'running',
-                    result TEXT,
-                    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TIMESTAMP,
-                    FOREIGN KEY (workflow_id) REFERENCES workflows(id)
-                )
-            """)
-            
-            # Alert logs table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS alert_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    execution_id INTEGER,
-                    workflow_id TEXT NOT NULL,
-                    action_type TEXT NOT NULL,
-                    recipient TEXT,
-                    message TEXT,
-                    status TEXT DEFAULT 'pending',
-                    error_message TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (execution_id) REFERENCES workflow_executions(id),
-                    FOREIGN KEY (workflow_id) REFERENCES workflows(id)
-                )
-            """)
-            
-            # Sensor data table (for simulation/demo)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS sensor_readings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    equipment_id TEXT NOT NULL,
-                    sensor_type TEXT NOT NULL,
-                    value REAL NOT NULL,
-                    unit TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+        with self._get_write_connection() as conn:
+            conn.executescript(_SCHEMA_SQL)
+            self._migrate_json_graphs(conn)
+    
+    def _migrate_json_graphs(self, conn: sqlite3.Connection):
+        """Move nodes_json/edges_json blobs from older databases into the child tables."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(workflows)")}
+        if 'nodes_json' not in columns:
+            return
+        for wf_id, nodes_json, edges_json in conn.execute(
+            "SELECT id, nodes_json, edges_json FROM workflows"
+        ).fetchall():
+            self._sync_graph(conn, wf_id, *_graph_rows(_loads(nodes_json), _loads(edges_json)))
+        if _HAS_DROP_COLUMN:
+            conn.execute("ALTER TABLE workflows DROP COLUMN nodes_json")
+            conn.execute("ALTER TABLE workflows DROP COLUMN edges_json")
+        else:
+            # SQLite antiguo: reconstruir la tabla (las columnas viejas son NOT NULL
+            # y romperían los INSERT si se quedaran)
+            self._rebuild_workflows_table(conn)
+    
+    def _rebuild_workflows_table(self, conn: sqlite3.Connection):
+        """Recreate workflows with the current columns, keeping its rows."""
+        columns = "id, name, description, status, created_at, updated_at"
+        conn.execute("CREATE TABLE workflows_new " + _WORKFLOWS_COLUMNS_SQL)
+        conn.execute(f"INSERT INTO workflows_new ({columns}) SELECT {columns} FROM workflows")
+        conn.execute("DROP TABLE workflows")
+        conn.execute("ALTER TABLE workflows_new RENAME TO workflows")
     
     # --- WORKFLOW CRUD ---
     
     def save_workflow(self, workflow_id: str, name: str, description: str,
                       nodes: List[Dict], edges: List[Dict], status: str = 'draft') -> bool:
         """Save or update a workflow."""
-        print(f"[Database.save_workflow] >>> ENTRY: id={workflow_id}")
-        print("[Database.save_workflow] >>> Getting connection...")
-        with self._get_connection() as conn:
-            print("[Database.save_workflow] >>> Connection acquired")
+        node_rows, edge_rows = _graph_rows(nodes, edges)
+        # Solo se guarda el digest, no las filas serializadas de cada workflow
+        payload = hashlib.blake2b(
+            repr((name, description, status, node_rows, edge_rows)).encode(), digest_size=16
+        ).digest()
+        if self._saved_payloads.get(workflow_id) == payload:
+            return True  # Sin cambios: no se reescribe
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
-            print("[Database.save_workflow] >>> Executing INSERT/UPDATE query...")
-            cursor.execute("""
-                INSERT INTO workflows (id, name, description, nodes_json, edges_json, status, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+            cursor.execute(f"""
+                INSERT INTO workflows (id, name, description, status, updated_at)
+                VALUES (?, ?, ?, ?, {_NOW_SQL})
                 ON CONFLICT(id) DO UPDATE SET
                     name = excluded.name,
                     description = excluded.description,
-                    nodes_json = excluded.nodes_json,
-                    edges_json = excluded.edges_json,
                     status = excluded.status,
                     updated_at = excluded.updated_at
-            """, (
-                workflow_id,
-                name,
-                description,
-                json.dumps(nodes),
-                json.dumps(edges),
-                status,
-                datetime.now().isoformat()
-            ))
-            print("[Database.save_workflow] >>> Query executed, committing...")
-        print("[Database.save_workflow] >>> Connection closed (auto-commit)")
-        print("[Database.save_workflow] >>> EXIT: success=True")
+            """, (workflow_id, name, description, status))
+            self._sync_graph(conn, workflow_id, node_rows, edge_rows)
+        self._saved_payloads[workflow_id] = payload
+        self.workflows_version += 1
         return True
     
+    def _sync_graph(self, conn: sqlite3.Connection, workflow_id: str,
+                    node_rows: tuple, edge_rows: tuple):
+        """Write a graph into the child tables (only changed rows)."""
+        self._sync_rows(conn, 'workflow_nodes', 'node_id', ('seq', 'data_json'),
+                        workflow_id, node_rows)
+        self._sync_rows(conn, 'workflow_edges', 'edge_id', ('seq', 'source', 'target', 'data_json'),
+                        workflow_id, edge_rows)
+    
+    def _sync_rows(self, conn: sqlite3.Connection, table: str, key: str,
+                   columns: tuple, workflow_id: str, rows: tuple):
+        """Upsert new/changed rows of a graph table and delete the removed ones."""
+        cols = ', '.join(columns)
+        existing = {
+            r[0]: tuple(r[1:]) for r in conn.execute(
+                f"SELECT {key}, {cols} FROM {table} WHERE workflow_id = ?", (workflow_id,)
+            )
+        }
+        changed = [(workflow_id, *row) for row in rows if existing.get(row[0]) != row[1:]]
+        if changed:
+            placeholders = ', '.join('?' * (len(columns) + 2))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (workflow_id, {key}, {cols}) VALUES ({placeholders})",
+                changed
+            )
+        removed = existing.keys() - {row[0] for row in rows}
+        if removed:
+            conn.executemany(
+                f"DELETE FROM {table} WHERE workflow_id = ? AND {key} = ?",
+                [(workflow_id, k) for k in removed]
+            )
+    
     def get_workflow(self, workflow_id: str) -> Optional[Dict]:
         """Get a workflow by ID."""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM workflows WHERE id = ?", (workflow_id,))
             row = cursor.fetchone()
             if row:
-                return self._row_to_workflow(row)
+                graphs = self._load_graphs(conn, "WHERE workflow_id = ?", (workflow_id,))
+                return self._row_to_workflow(row, graphs)
         return None
     
     def get_all_workflows(self, status: Optional[str] = None) -> List[Dict]:
         """Get all workflows, optionally filtered by status."""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             cursor = conn.cursor()
             if status:
                 cursor.execute("SELECT * FROM workflows WHERE status = ? ORDER BY updated_at DESC", (status,))
+                rows = cursor.fetchall()
+                graphs = self._load_graphs(
+                    conn, "WHERE workflow_id IN (SELECT id FROM workflows WHERE status = ?)", (status,)
+                )
             else:
                 cursor.execute("SELECT * FROM workflows ORDER BY updated_at DESC")
-            return [self._row_to_workflow(row) for row in cursor.fetchall()]
+                rows = cursor.fetchall()
+                graphs = self._load_graphs(conn, "", ())
+            return [self._row_to_workflow(row, graphs) for row in rows]
+    
+    def get_workflow_summaries(self, status: Optional[str] = None) -> List[Dict]:
+        """Get workflow metadata (no nodes/edges) for list views."""
+        with self._get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            columns = "id, name, description, status, created_at, updated_at"
+            if status:
+                cursor.execute(
+                    f"SELECT {columns} FROM workflows WHERE status = ? ORDER BY updated_at DESC", (status,)
+                )
+            else:
+                cursor.execute(f"SELECT {columns} FROM workflows ORDER BY updated_at DESC")
+            return _rows_as_dicts(cursor)
+    
+    def _load_graphs(self, conn: sqlite3.Connection, where: str, params: tuple) -> Dict[str, Dict[str, List]]:
+        """Load nodes/edges for the selected workflows, grouped by workflow id."""
+        graphs: Dict[str, Dict[str, List]] = {}
+        for table, field in (('workflow_nodes', 'nodes'), ('workflow_edges', 'edges')):
+            chunks: Dict[str, List[str]] = {}
+            for row in conn.execute(
+                f"SELECT workflow_id, data_json FROM {table} {where} ORDER BY workflow_id, seq", params
+            ):
+                chunks.setdefault(row[0], []).append(row[1])
+            for wf_id, items in chunks.items():
+                # Un solo _loads por grafo en vez de uno por fila
+                graphs.setdefault(wf_id, {})[field] = _loads('[' + ','.join(items) + ']')
+        return graphs
     
     def delete_workflow(self, workflow_id: str) -> bool:
         """Delete a workflow."""
-        with self._get_connection() as conn:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("DELETE FROM workflow_nodes WHERE workflow_id = ?", (workflow_id,))
+            cursor.execute("DELETE FROM workflow_edges WHERE workflow_id = ?", (workflow_id,))
             cursor.execute("DELETE FROM workflows WHERE id = ?", (workflow_id,))
+        self._saved_payloads.pop(workflow_id, None)
+        self.workflows_version += 1
         return True
     
     def update_workflow_status(self, workflow_id: str, status: str) -> bool:
         """Update workflow status (draft, active, paused)."""
-        with self._get_connection() as conn:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "UPDATE workflows SET status = ?, updated_at = ? WHERE id = ?",
-                (status, datetime.now().isoformat(), workflow_id)
+                f"UPDATE workflows SET status = ?, updated_at = {_NOW_SQL} WHERE id = ?",
+                (status, workflow_id)
             )
+        self._saved_payloads.pop(workflow_id, None)
+        self.workflows_version += 1
         return True
     
-    def _row_to_workflow(self, row: sqlite3.Row) -> Dict:
-        """Convert a database row to a workflow dict."""
+    def _row_to_workflow(self, row: sqlite3.Row, graphs: Dict[str, Dict[str, List]]) -> Dict:
+        """Convert a database row (plus its loaded graph) to a workflow dict."""
+        graph = graphs.get(row['id'], {})
         return {
             'id': row['id'],
             'name': row['name'],
             'description': row['description'],
-            'nodes': json.loads(row['nodes_json']),
-            'edges': json.loads(row['edges_json']),
+            'nodes': graph.get('nodes', []),
+            'edges': graph.get('edges', []),
             'status': row['status'],
             'created_at': row['created_at'],
             'updated_at': row['updated_at']
@@ -204,28 +489,25 @@ class DatabaseService:
     def log_execution_start(self, workflow_id: str, triggered_by: str, 
                             trigger_data: Dict) -> int:
         """Log the start of a workflow execution."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO workflow_executions (workflow_id, triggered_by, trigger_data, status)
-                VALUES (?, ?, ?, 'running')
-            """, (workflow_id, triggered_by, json.dumps(trigger_data)))
-            return cursor.lastrowid
+        with self._get_write_connection() as conn:
+            return _insert_returning_id(conn, _INSERT_EXECUTION,
+                                        (workflow_id, triggered_by, _dumps(trigger_data)))
     
     def log_execution_complete(self, execution_id: int, status: str, result: Dict):
         """Log the completion of a workflow execution."""
-        with self._get_connection() as conn:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE workflow_executions 
-                SET status = ?, result = ?, completed_at = ?
+                SET status = ?, result = ?, completed_at = {_NOW_SQL}
                 WHERE id = ?
-            """, (status, json.dumps(result), datetime.now().isoformat(), execution_id))
+            """, (status, _dumps(result), execution_id))
     
     def get_recent_executions(self, limit: int = 50, workflow_id: Optional[str] = None) -> List[Dict]:
         """Get recent workflow executions."""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             if workflow_id:
                 cursor.execute("""
                     SELECT * FROM workflow_executions 
@@ -237,7 +519,7 @@ class DatabaseService:
                     SELECT * FROM workflow_executions 
                     ORDER BY started_at DESC LIMIT ?
                 """, (limit,))
-            return [dict(row) for row in cursor.fetchall()]
+            return _rows_as_dicts(cursor)
     
     # --- ALERT LOGS ---
     
@@ -246,18 +528,25 @@ class DatabaseService:
                   execution_id: Optional[int] = None,
                   error_message: Optional[str] = None) -> int:
         """Log an alert action."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO alert_logs 
-                (execution_id, workflow_id, action_type, recipient, message, status, error_message)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (execution_id, workflow_id, action_type, recipient, message, status, error_message))
-            return cursor.lastrowid
+        with self._get_write_connection() as conn:
+            return _insert_returning_id(conn, _INSERT_ALERT_RETURNING, _alert_row(
+                workflow_id, action_type, recipient, message,
+                status, execution_id, error_message
+            ))
+    
+    def log_alerts_bulk(self, alerts: List[Dict]):
+        """Insert many alerts (dicts of log_alert arguments) in one transaction."""
+        if alerts:
+            with self._get_write_connection() as conn:
+                conn.executemany(_INSERT_ALERT, [_alert_row(**a) for a in alerts])
+    
+    def batched_alerts(self):
+        """Buffer alerts and insert them in a single transaction on exit."""
+        return self._batched(_INSERT_ALERT, _alert_row)
     
     def update_alert_status(self, alert_id: int, status: str, error_message: Optional[str] = None):
         """Update alert status."""
-        with self._get_connection() as conn:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE alert_logs SET status = ?, error_message = ? WHERE id = ?
@@ -265,8 +554,9 @@ class DatabaseService:
     
     def get_recent_alerts(self, limit: int = 100, action_type: Optional[str] = None) -> List[Dict]:
         """Get recent alerts."""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             if action_type:
                 cursor.execute("""
                     SELECT al.*, w.name as workflow_name 
@@ -282,23 +572,36 @@ class DatabaseService:
                     LEFT JOIN workflows w ON al.workflow_id = w.id
                     ORDER BY al.created_at DESC LIMIT ?
                 """, (limit,))
-            return [dict(row) for row in cursor.fetchall()]
+            return _rows_as_dicts(cursor)
     
     # --- SENSOR DATA (for demo simulation) ---
     
     def log_sensor_reading(self, equipment_id: str, sensor_type: str, 
                           value: float, unit: str):
         """Log a sensor reading."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO sensor_readings (equipment_id, sensor_type, value, unit)
-                VALUES (?, ?, ?, ?)
-            """, (equipment_id, sensor_type, value, unit))
+        with self._get_write_connection() as conn:
+            conn.execute(_INSERT_SENSOR_READING,
+                         _sensor_reading_row(equipment_id, sensor_type, value, unit))
+    
+    def log_sensor_readings_bulk(self, rows: List[tuple]):
+        """Insert many (equipment_id, sensor_type, value, unit) rows in one transaction."""
+        if rows:
+            with self._get_write_connection() as conn:
+                conn.executemany(_INSERT_SENSOR_READING, rows)
+    
+    def batched_sensor_readings(self):
+        """Buffer sensor readings and insert them in a single transaction on exit.
+        
+        Usage::
+        
+            with db.batched_sensor_readings() as batch:
+                batch.log(equipment_id, sensor_type, value, unit)
+        """
+        return self._batched(_INSERT_SENSOR_READING, _sensor_reading_row)
     
     def get_latest_sensor_reading(self, equipment_id: str, sensor_type: str) -> Optional[Dict]:
         """Get the latest sensor reading for an equipment."""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM sensor_readings 
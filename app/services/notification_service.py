@@ -9,15 +9,67 @@ Handles sending notifications through various channels:
 """
 import os
 import json
+import contextlib
+import hashlib
+import importlib.util
+import time
+import uuid
 import httpx
 import smtplib
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Optional, Any
+from collections import defaultdict
+from typing import Dict, List, Optional, Any
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
 import asyncio
+import random
+
+try:
+    import orjson  # Opcional: serialización JSON en C de los payloads
+except ImportError:
+    orjson = None
+
+try:
+    import aiohttp  # Opcional: cliente más ligero para el fan-out de webhooks
+except ImportError:
+    aiohttp = None
+
+# Respuestas transitorias que merecen reintento (throttling / caída del proveedor)
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_RATE_LIMIT_HINTS = ("rate limit", "quota")
+
+# Un lote SMTP se aborta tras este número de fallos (el servidor está rechazando)
+_SMTP_MAX_FAILURES = 3
+
+def _json_body(payload: Any) -> bytes:
+    """Serialize a request payload to JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+# Caracteres que se quitan del teléfono antes de enviarlo a WhatsApp (un solo translate)
+_PHONE_STRIP = str.maketrans('', '', '+ -')
+
+# Timestamps formateados una vez por segundo: (segundo, isoformat, 'YYYY-MM-DD HH:MM:SS')
+_ts_cache: tuple = (-1, '', '')
+
+
+def _now_strings() -> tuple:
+    """Return (iso, display) strings for the current second, cached per second."""
+    global _ts_cache
+    sec = int(time.time())
+    if sec != _ts_cache[0]:
+        now = datetime.fromtimestamp(sec)
+        _ts_cache = (sec, now.isoformat(), now.strftime('%Y-%m-%d %H:%M:%S'))
+    return _ts_cache[1], _ts_cache[2]
+
+
+# HTTP/2 (multiplexado sobre una sola conexión TLS) solo si el extra h2 está instalado
+_HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
 
 
 class NotificationChannel(Enum):
@@ -28,7 +80,7 @@ class NotificationChannel(Enum):
     SMS = "sms"
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationResult:
     """Result of a notification attempt."""
     success: bool
@@ -37,10 +89,14 @@ class NotificationResult:
     message_id: Optional[str] = None
     error: Optional[str] = None
     timestamp: str = ""
+    # Absorbido por el dedupe: no se envió nada (no es una entrega real)
+    deduped: bool = False
+    # Encolado con enqueue_alert: aún no enviado, el resultado real llega después
+    queued: bool = False
     
     def __post_init__(self):
         if not self.timestamp:
-            self.timestamp = datetime.now().isoformat()
+            self.timestamp = _now_strings()[0]
     
     def to_dict(self) -> Dict:
         return {
@@ -49,7 +105,9 @@ class NotificationResult:
             'recipient': self.recipient,
             'message_id': self.message_id,
             'error': self.error,
-            'timestamp': self.timestamp
+            'timestamp': self.timestamp,
+            'deduped': self.deduped,
+            'queued': self.queued
         }
 
 
@@ -78,6 +136,33 @@ class NotificationConfig:
         self.webhook_url = os.getenv('WEBHOOK_URL', '')
         self.webhook_secret = os.getenv('WEBHOOK_SECRET', '')
         
+        # HTTP client pool (fan-out de alertas a WhatsApp/webhooks)
+        self.http_max_connections = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+        self.http_max_keepalive = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', '20'))
+        self.http_keepalive_expiry = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+        self.http_connect_timeout = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+        self.http_read_timeout = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+        
+        # Backend HTTP de los webhooks: 'httpx' (por defecto) o 'aiohttp' si está instalado
+        self.webhook_backend = os.getenv('NOTIFY_WEBHOOK_BACKEND', 'httpx').lower()
+        
+        # Token bucket por destino (canal + host): ritmo sostenido y ráfaga máxima
+        self.rate_per_host = float(os.getenv('NOTIFY_RATE_PER_HOST', '5'))
+        self.burst_per_host = float(os.getenv('NOTIFY_BURST_PER_HOST', '10'))
+        
+        # Máximo de envíos en vuelo por canal (backpressure ante ráfagas de alertas)
+        self.max_inflight = {
+            NotificationChannel.WHATSAPP: int(os.getenv('NOTIFY_MAX_INFLIGHT_WHATSAPP', '8')),
+            NotificationChannel.WEBHOOK: int(os.getenv('NOTIFY_MAX_INFLIGHT', '32')),
+        }
+        
+        # Emails encolados y enviados por lotes sobre la sesión SMTP persistente
+        self.email_batch_size = int(os.getenv('EMAIL_BATCH_SIZE', '50'))
+        self.email_batch_window = float(os.getenv('EMAIL_BATCH_WINDOW', '0.2'))
+        
+        # Ventana (s) en la que una alerta idéntica al mismo destinatario se absorbe
+        self.alert_dedupe_ttl = float(os.getenv('ALERT_DEDUPE_TTL', '60'))
+        
         # Demo/Mock mode
         self.mock_mode = os.getenv('NOTIFICATION_MOCK_MODE', 'true').lower() == 'true'
     
@@ -94,6 +179,43 @@ class NotificationConfig:
         return bool(self.webhook_url)
 
 
+class TokenBucket:
+    """
+    Async token bucket for one destination.
+    
+    A 429 halves the refill rate; each success doubles it back towards the
+    configured rate.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def throttled(self):
+        """Back off after the destination answered 429."""
+        self.rate = max(self.base_rate / 16, self.rate / 2)
+    
+    def succeeded(self):
+        """Recover the rate after a successful send."""
+        self.rate = min(self.base_rate, self.rate * 2)
+
+
 class NotificationService:
     """
     Service for sending notifications across multiple channels.
@@ -109,22 +231,157 @@ class NotificationService:
     def __init__(self, config: Optional[NotificationConfig] = None):
         self.config = config or NotificationConfig()
         self._http_client: Optional[httpx.AsyncClient] = None
+        self._webhook_session = None  # aiohttp.ClientSession, solo con NOTIFY_WEBHOOK_BACKEND=aiohttp
+        # Cabeceras fijas por canal, construidas una vez desde la config
+        self._whatsapp_headers = {
+            "Authorization": f"Bearer {self.config.whatsapp_token}",
+            "Content-Type": "application/json"
+        }
+        self._webhook_headers = {"Content-Type": "application/json"}
+        if self.config.webhook_secret:
+            self._webhook_headers["X-Webhook-Secret"] = self.config.webhook_secret
+        self._buckets: Dict[str, TokenBucket] = defaultdict(
+            lambda: TokenBucket(self.config.rate_per_host, self.config.burst_per_host)
+        )
+        self._inflight = {
+            channel: asyncio.Semaphore(limit)
+            for channel, limit in self.config.max_inflight.items()
+        }
+        # Sesión SMTP persistente; un único hilo la usa, así que no necesita lock
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='smtp')
+        self._email_queue: Optional[asyncio.Queue] = None
+        # Última vez (monotonic) que salió cada alerta, por hash de canal|destinatario|clave
+        self._recent: Dict[str, float] = {}
+        self._recent_swept = time.monotonic()
+        # Envíos encolados con enqueue_alert (referencia fuerte para que el GC no los cancele)
+        self._pending: set = set()
+        self._email_worker_task: Optional[asyncio.Task] = None
     
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create async HTTP client."""
         if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(timeout=30.0)
+            config = self.config
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    connect=config.http_connect_timeout,
+                    read=config.http_read_timeout,
+                    write=10.0,
+                    pool=5.0,
+                ),
+                limits=httpx.Limits(
+                    max_connections=config.http_max_connections,
+                    max_keepalive_connections=config.http_max_keepalive,
+                    keepalive_expiry=config.http_keepalive_expiry,
+                ),
+                http2=_HTTP2_AVAILABLE,
+            )
         return self._http_client
     
     async def close(self):
-        """Close the HTTP client."""
+        """Drain queued alerts, then close the HTTP client and the SMTP session."""
+        await self.drain()
         if self._http_client and not self._http_client.is_closed:
             await self._http_client.aclose()
+        if self._email_worker_task is not None:
+            self._email_worker_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._email_worker_task
+            self._email_worker_task = None
+            while not self._email_queue.empty():
+                _, future = self._email_queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Notification service closed"))
+        if self._webhook_session is not None and not self._webhook_session.closed:
+            await self._webhook_session.close()
+        if self._smtp is not None:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(self._smtp_executor, self._drop_smtp)
+    
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """App lifespan task: create the HTTP client at startup, close it on shutdown."""
+        await self._get_client()
+        try:
+            yield
+        finally:
+            await self.close()
+    
+    async def _post_with_retry(self, channel: NotificationChannel, url: str,
+                               max_attempts: int = 3, base: float = 0.5,
+                               cap: float = 8.0, **kwargs) -> httpx.Response:
+        """POST with exponential backoff on 429/5xx and rate-limit errors."""
+        bucket = self._buckets[f"{channel.value}:{httpx.URL(url).host}"]
+        for attempt in range(max_attempts):
+            await bucket.acquire()
+            async with self._inflight[channel]:
+                response = await self._post(channel, url, **kwargs)
+            if response.status_code == 429:
+                bucket.throttled()
+            elif response.is_success:
+                bucket.succeeded()
+            if attempt == max_attempts - 1 or not self._is_transient(response):
+                return response
+            # Retry-After del proveedor si viene, si no backoff exponencial con jitter
+            try:
+                delay = float(response.headers.get('Retry-After', ''))
+            except ValueError:
+                delay = base * 2 ** attempt + random.random() * 0.25
+            await asyncio.sleep(min(cap, delay))
+        return response
+    
+    def _use_aiohttp(self, channel: NotificationChannel) -> bool:
+        """Whether this channel's POSTs go through the optional aiohttp session."""
+        return (channel is NotificationChannel.WEBHOOK and aiohttp is not None
+                and self.config.webhook_backend == 'aiohttp')
+    
+    async def _get_webhook_session(self):
+        """Get or create the aiohttp session used for webhooks."""
+        if self._webhook_session is None or self._webhook_session.closed:
+            config = self.config
+            self._webhook_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=config.http_max_connections,
+                    limit_per_host=config.http_max_keepalive,
+                    keepalive_timeout=config.http_keepalive_expiry,
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    connect=config.http_connect_timeout,
+                    sock_read=config.http_read_timeout,
+                ),
+            )
+        return self._webhook_session
+    
+    async def _post(self, channel: NotificationChannel, url: str, **kwargs) -> httpx.Response:
+        """Single POST on the channel's backend, returned as an httpx.Response."""
+        if self._use_aiohttp(channel):
+            session = await self._get_webhook_session()
+            if 'content' in kwargs:
+                kwargs['data'] = kwargs.pop('content')
+            async with session.post(url, **kwargs) as resp:
+                body = await resp.read()
+                # El cuerpo ya viene descomprimido: sin Content-Encoding para httpx
+                headers = [(k, v) for k, v in resp.headers.items()
+                           if k.lower() != 'content-encoding']
+                return httpx.Response(resp.status, headers=headers, content=body)
+        client = await self._get_client()
+        return await client.post(url, **kwargs)
+    
+    @staticmethod
+    def _is_transient(response: httpx.Response) -> bool:
+        """Whether a failed response is a throttle/outage worth retrying."""
+        if response.status_code in _RETRYABLE_STATUS:
+            return True
+        if response.is_success:
+            return False
+        body = response.text.lower()
+        return any(hint in body for hint in _RATE_LIMIT_HINTS)
     
     # --- WHATSAPP ---
     
     async def send_whatsapp(self, phone_number: str, message: str, 
-                           template_name: Optional[str] = None) -> NotificationResult:
+                           template_name: Optional[str] = None,
+                           dedupe_key: Optional[str] = None) -> NotificationResult:
         """
         Send WhatsApp message via Meta Business API.
         
@@ -132,21 +389,21 @@ class NotificationService:
             phone_number: Recipient phone number with country code (e.g., +1234567890)
             message: Message text (for non-template messages)
             template_name: Optional template name for pre-approved messages
+            dedupe_key: Skip the send if the same key went to this recipient recently
         """
+        if dedupe_key is not None:
+            return await self._send_once(
+                NotificationChannel.WHATSAPP, phone_number, dedupe_key,
+                lambda: self.send_whatsapp(phone_number, message, template_name)
+            )
         if self.config.mock_mode or not self.config.whatsapp_configured:
             return self._mock_notification(NotificationChannel.WHATSAPP, phone_number, message)
         
         try:
-            client = await self._get_client()
             url = f"https://graph.facebook.com/{self.config.whatsapp_api_version}/{self.config.whatsapp_phone_id}/messages"
             
-            headers = {
-                "Authorization": f"Bearer {self.config.whatsapp_token}",
-                "Content-Type": "application/json"
-            }
-            
             # Clean phone number (remove + and spaces)
-            clean_phone = phone_number.replace("+", "").replace(" ", "").replace("-", "")
+            clean_phone = phone_number.translate(_PHONE_STRIP)
             
             if template_name:
                 # Template message (for business-initiated conversations)
@@ -169,7 +426,10 @@ class NotificationService:
                     "text": {"body": message}
                 }
             
-            response = await client.post(url, headers=headers, json=payload)
+            response = await self._post_with_retry(
+                NotificationChannel.WHATSAPP, url,
+                headers=self._whatsapp_headers, content=_json_body(payload)
+            )
             response_data = response.json()
             print("WhatsApp API Response:", response_data)
             
@@ -201,7 +461,8 @@ class NotificationService:
     # --- EMAIL ---
     
     async def send_email(self, to_email: str, subject: str, body: str,
-                        html_body: Optional[str] = None) -> NotificationResult:
+                        html_body: Optional[str] = None,
+                        dedupe_key: Optional[str] = None) -> NotificationResult:
         """
         Send email via SMTP.
         
@@ -210,7 +471,13 @@ class NotificationService:
             subject: Email subject
             body: Plain text body
             html_body: Optional HTML body
+            dedupe_key: Skip the send if the same key went to this recipient recently
         """
+        if dedupe_key is not None:
+            return await self._send_once(
+                NotificationChannel.EMAIL, to_email, dedupe_key,
+                lambda: self.send_email(to_email, subject, body, html_body)
+            )
         if self.config.mock_mode or not self.config.email_configured:
             return self._mock_notification(NotificationChannel.EMAIL, to_email, f"{subject}: {body}")
         
@@ -228,15 +495,14 @@ class NotificationService:
             if html_body:
                 msg.attach(MIMEText(html_body, 'html'))
             
-            # Send via SMTP (run in thread pool to not block)
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._send_smtp, msg)
+            # Encolar para el worker, que lo envía en el próximo lote SMTP
+            await self._queue_email(msg)
             
             return NotificationResult(
                 success=True,
                 channel=NotificationChannel.EMAIL.value,
                 recipient=to_email,
-                message_id=f"email_{datetime.now().timestamp()}"
+                message_id=f"email_{time.monotonic_ns()}"
             )
             
         except Exception as e:
@@ -247,25 +513,112 @@ class NotificationService:
                 error=str(e)
             )
     
-    def _send_smtp(self, msg: MIMEMultipart):
-        """Send email via SMTP (blocking, run in thread pool)."""
-        with smtplib.SMTP(self.config.email_smtp_host, self.config.email_smtp_port) as server:
-            server.starttls()
-            server.login(self.config.email_username, self.config.email_password)
-            server.send_message(msg)
+    def _queue_email(self, msg: MIMEMultipart) -> asyncio.Future:
+        """Queue a message for the batch worker; the future resolves once it is sent."""
+        loop = asyncio.get_running_loop()
+        task = self._email_worker_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._email_queue = asyncio.Queue()
+            self._email_worker_task = loop.create_task(self._email_worker())
+        future = loop.create_future()
+        self._email_queue.put_nowait((msg, future))
+        return future
+    
+    async def _email_worker(self):
+        """Drain the email queue in batches (size or time window, whichever first)."""
+        loop = asyncio.get_running_loop()
+        queue = self._email_queue
+        while True:
+            batch = [await queue.get()]
+            # Ventana corta para que una ráfaga de alertas comparta lote
+            await asyncio.sleep(self.config.email_batch_window)
+            while len(batch) < self.config.email_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            errors = await loop.run_in_executor(
+                self._smtp_executor, self._send_smtp_batch, [msg for msg, _ in batch]
+            )
+            for (_, future), error in zip(batch, errors):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+    
+    def _send_smtp_batch(self, msgs: List[MIMEMultipart]) -> List[Optional[Exception]]:
+        """Send messages over the persistent SMTP session (blocking, SMTP thread).
+        
+        Returns one error (or None) per message; aborts after repeated failures.
+        """
+        errors: List[Optional[Exception]] = []
+        server = None
+        failures = 0
+        for msg in msgs:
+            if failures >= _SMTP_MAX_FAILURES:
+                errors.append(smtplib.SMTPException("Batch aborted after repeated SMTP failures"))
+                continue
+            try:
+                try:
+                    server = server or self._smtp_session()
+                    server.send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    # El servidor cerró la sesión: reconectar una vez
+                    self._drop_smtp()
+                    server = self._smtp_session()
+                    server.send_message(msg)
+                errors.append(None)
+            except Exception as e:
+                server = None
+                failures += 1
+                errors.append(e)
+        return errors
+    
+    def _smtp_session(self) -> smtplib.SMTP:
+        """Return a live SMTP session, reconnecting (STARTTLS + login) if needed."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop_smtp()
+        
+        server = smtplib.SMTP(self.config.email_smtp_host, self.config.email_smtp_port, timeout=30)
+        server.starttls()
+        server.login(self.config.email_username, self.config.email_password)
+        self._smtp = server
+        return server
+    
+    def _drop_smtp(self):
+        """Close the SMTP session, ignoring errors from an already-dead socket."""
+        server, self._smtp = self._smtp, None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
     
     # --- WEBHOOK ---
     
-    async def send_webhook(self, url: Optional[str], payload: Dict) -> NotificationResult:
+    async def send_webhook(self, url: Optional[str], payload: Dict,
+                           dedupe_key: Optional[str] = None) -> NotificationResult:
         """
         Send webhook notification.
         
         Args:
             url: Webhook URL (uses config URL if not provided)
             payload: JSON payload to send
+            dedupe_key: Skip the send if the same key went to this URL recently
         """
         webhook_url = url or self.config.webhook_url
         
+        if dedupe_key is not None:
+            return await self._send_once(
+                NotificationChannel.WEBHOOK, webhook_url or "no_url", dedupe_key,
+                lambda: self.send_webhook(url, payload)
+            )
+        
         if self.config.mock_mode or not webhook_url:
             return self._mock_notification(
                 NotificationChannel.WEBHOOK, 
@@ -274,20 +627,17 @@ class NotificationService:
             )
         
         try:
-            client = await self._get_client()
-            
-            headers = {"Content-Type": "application/json"}
-            if self.config.webhook_secret:
-                headers["X-Webhook-Secret"] = self.config.webhook_secret
-            
-            response = await client.post(webhook_url, headers=headers, json=payload)
+            response = await self._post_with_retry(
+                NotificationChannel.WEBHOOK, webhook_url,
+                headers=self._webhook_headers, content=_json_body(payload)
+            )
             
             if response.status_code in (200, 201, 202, 204):
                 return NotificationResult(
                     success=True,
                     channel=NotificationChannel.WEBHOOK.value,
                     recipient=webhook_url,
-                    message_id=f"webhook_{datetime.now().timestamp()}"
+                    message_id=f"webhook_{time.monotonic_ns()}"
                 )
             else:
                 return NotificationResult(
@@ -317,9 +667,37 @@ class NotificationService:
             success=True,
             channel=channel.value,
             recipient=recipient,
-            message_id=f"mock_{channel.value}_{datetime.now().timestamp()}"
+            message_id=f"mock_{channel.value}_{time.monotonic_ns()}"
         )
     
+    async def _send_once(self, channel: NotificationChannel, recipient: str,
+                         key: str, send) -> NotificationResult:
+        """Run send() unless the same alert went to recipient within the dedupe TTL."""
+        digest = hashlib.blake2b(
+            f"{channel.value}|{recipient}|{key}".encode(), digest_size=16
+        ).hexdigest()
+        now = time.monotonic()
+        ttl = self.config.alert_dedupe_ttl
+        if now - self._recent.get(digest, float('-inf')) < ttl:
+            return NotificationResult(
+                success=True,
+                channel=channel.value,
+                recipient=recipient,
+                message_id=f"deduped_{digest}",
+                deduped=True
+            )
+        if now - self._recent_swept > ttl:
+            self._recent = {k: t for k, t in self._recent.items() if now - t < ttl}
+            self._recent_swept = now
+        
+        # Se registra antes de enviar para absorber también los duplicados en vuelo
+        self._recent[digest] = now
+        result = await send()
+        if not result.success:
+            # Un fallo no debe silenciar el reintento del siguiente tick
+            self._recent.pop(digest, None)
+        return result
+    
     # --- CONVENIENCE METHODS ---
     
     async def send_alert(self, channel: str, recipient: str, 
@@ -331,22 +709,26 @@ class NotificationService:
             channel: 'whatsapp', 'email', or 'webhook'
             recipient: Phone number, email, or webhook URL
             message: Alert message
-            **kwargs: Additional channel-specific parameters
+            **kwargs: Additional channel-specific parameters; ``dedupe_key``
+                defaults to the message, so repeats within the TTL are absorbed
         """
         channel_lower = channel.lower()
+        dedupe_key = kwargs.get('dedupe_key', message)
         
         if channel_lower == NotificationChannel.WHATSAPP.value:
             return await self.send_whatsapp(recipient, message, 
-                                           template_name=kwargs.get('template_name'))
+                                           template_name=kwargs.get('template_name'),
+                                           dedupe_key=dedupe_key)
         
         elif channel_lower == NotificationChannel.EMAIL.value:
             subject = kwargs.get('subject', 'Nexus Alert')
             return await self.send_email(recipient, subject, message,
-                                        html_body=kwargs.get('html_body'))
+                                        html_body=kwargs.get('html_body'),
+                                        dedupe_key=dedupe_key)
         
         elif channel_lower == NotificationChannel.WEBHOOK.value:
             payload = kwargs.get('payload', {'message': message, 'recipient': recipient})
-            return await self.send_webhook(recipient, payload)
+            return await self.send_webhook(recipient, payload, dedupe_key=dedupe_key)
         
         else:
             return NotificationResult(
@@ -357,62 +739,125 @@ class NotificationService:
             )
 
 
-# --- MESSAGE TEMPLATES ---
-
-class AlertTemplates:
-    """Pre-defined alert message templates."""
-    
-    @staticmethod
-    def threshold_alert(equipment_name: str, sensor: str, value: float, 
-                       threshold: float, unit: str, severity: str = "warning") -> Dict[str, str]:
-        """Generate threshold alert message."""
-        emoji = "🔴" if severity == "critical" else "🟡" if severity == "warning" else "🟢"
+    def enqueue_alert(self, channel: str, recipient: str,
+                      message: str, **kwargs) -> NotificationResult:
+        """
+        Fire-and-forget variant of send_alert for non-critical paths.
         
-        text = (
-            f"{emoji} NEXUS ALERT - {severity.upper()}\n\n"
-            f"Equipment: {equipment_name}\n"
-            f"Sensor: {sensor}\n"
-            f"Current Value: {value} {unit}\n"
-            f"Threshold: {threshold} {unit}\n"
-            f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        Schedules the send on the running loop and returns a pending result
+        (``queued=True``, ``success=False``) immediately; failures are only
+        logged. Use drain() to wait for them.
+        """
+        task = asyncio.create_task(self.send_alert(channel, recipient, message, **kwargs))
+        self._pending.add(task)
+        task.add_done_callback(self._on_queued_done)
+        return NotificationResult(
+            success=False,
+            channel=channel.lower(),
+            recipient=recipient,
+            message_id=f"queued_{uuid.uuid4().hex}",
+            queued=True
         )
-        
-        html = f"""
+    
+    def _on_queued_done(self, task: asyncio.Task):
+        """Forget a finished queued send and log it if it failed."""
+        self._pending.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        result = task.result() if error is None else None
+        if error is not None or not result.success:
+            print(f"[NotificationService] Queued alert failed: {error or result.error}")
+    
+    async def drain(self):
+        """Wait for all alerts queued with enqueue_alert to finish."""
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+
+# --- MESSAGE TEMPLATES ---
+
+# (emoji, color del título HTML) por severidad; cualquier otra usa el último
+_SEVERITY_STYLE = {
+    'critical': ("🔴", "#ef4444"),
+    'warning': ("🟡", "#eab308"),
+}
+_DEFAULT_STYLE = ("🟢", "#eab308")
+
+# Plantillas construidas una sola vez; cada alerta es un format_map
+_THRESHOLD_TEXT = (
+    "{emoji} NEXUS ALERT - {severity}\n\n"
+    "Equipment: {equipment}\n"
+    "Sensor: {sensor}\n"
+    "Current Value: {value} {unit}\n"
+    "Threshold: {threshold} {unit}\n"
+    "Time: {now}"
+)
+
+_THRESHOLD_HTML = """
         <div style="font-family: Arial, sans-serif; padding: 20px; background: #1a1a2e; color: white;">
-            <h2 style="color: {'#ef4444' if severity == 'critical' else '#eab308'};">
-                {emoji} NEXUS ALERT - {severity.upper()}
+            <h2 style="color: {color};">
+                {emoji} NEXUS ALERT - {severity}
             </h2>
             <table style="margin: 20px 0;">
-                <tr><td style="padding: 5px; color: #9ca3af;">Equipment:</td><td style="padding: 5px;">{equipment_name}</td></tr>
+                <tr><td style="padding: 5px; color: #9ca3af;">Equipment:</td><td style="padding: 5px;">{equipment}</td></tr>
                 <tr><td style="padding: 5px; color: #9ca3af;">Sensor:</td><td style="padding: 5px;">{sensor}</td></tr>
                 <tr><td style="padding: 5px; color: #9ca3af;">Current Value:</td><td style="padding: 5px; color: #ef4444;">{value} {unit}</td></tr>
                 <tr><td style="padding: 5px; color: #9ca3af;">Threshold:</td><td style="padding: 5px;">{threshold} {unit}</td></tr>
-                <tr><td style="padding: 5px; color: #9ca3af;">Time:</td><td style="padding: 5px;">{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</td></tr>
+                <tr><td style="padding: 5px; color: #9ca3af;">Time:</td><td style="padding: 5px;">{now}</td></tr>
             </table>
             <p style="color: #6b7280; font-size: 12px;">Sent by Nexus Monitoring System</p>
         </div>
         """
+
+_STATUS_CHANGE_TEXT = (
+    "{emoji} EQUIPMENT STATUS CHANGE\n\n"
+    "Equipment: {equipment}\n"
+    "Previous Status: {old_status}\n"
+    "New Status: {new_status}\n"
+    "{reason}\n"
+    "Time: {now}"
+)
+
+
+class AlertTemplates:
+    """Pre-defined alert message templates."""
+    
+    @staticmethod
+    def threshold_alert(equipment_name: str, sensor: str, value: float, 
+                       threshold: float, unit: str, severity: str = "warning") -> Dict[str, str]:
+        """Generate threshold alert message."""
+        emoji, color = _SEVERITY_STYLE.get(severity, _DEFAULT_STYLE)
+        fields = {
+            'emoji': emoji,
+            'color': color,
+            'severity': severity.upper(),
+            'equipment': equipment_name,
+            'sensor': sensor,
+            'value': value,
+            'threshold': threshold,
+            'unit': unit,
+            'now': _now_strings()[1],
+        }
         
         return {
-            'text': text,
-            'html': html,
-            'subject': f"[{severity.upper()}] {equipment_name} - {sensor} Alert"
+            'text': _THRESHOLD_TEXT.format_map(fields),
+            'html': _THRESHOLD_HTML.format_map(fields),
+            'subject': f"[{fields['severity']}] {equipment_name} - {sensor} Alert"
         }
     
     @staticmethod
     def equipment_status_change(equipment_name: str, old_status: str, 
                                new_status: str, reason: str = "") -> Dict[str, str]:
         """Generate equipment status change message."""
-        emoji = "🔴" if new_status == "critical" else "🟡" if new_status == "warning" else "🟢"
-        
-        text = (
-            f"{emoji} EQUIPMENT STATUS CHANGE\n\n"
-            f"Equipment: {equipment_name}\n"
-            f"Previous Status: {old_status}\n"
-            f"New Status: {new_status}\n"
-            f"{'Reason: ' + reason if reason else ''}\n"
-            f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        )
+        text = _STATUS_CHANGE_TEXT.format_map({
+            'emoji': _SEVERITY_STYLE.get(new_status, _DEFAULT_STYLE)[0],
+            'equipment': equipment_name,
+            'old_status': old_status,
+            'new_status': new_status,
+            'reason': f"Reason: {reason}" if reason else "",
+            'now': _now_strings()[1],
+        })
         
         return {
             'text': text,
@@ -6,6 +6,7 @@ This simple module acts as a bridge between AgentState (which creates workflows)
 and SimulationState (which runs simulations). It avoids cross-state event calls
 which can cause React Hooks order issues.
 """
+import threading
 from typing import Dict, List, Any, Optional
 
 
@@ -13,37 +14,48 @@ class PendingSimulation:
     """Shared storage for pending simulation from chatbot approval."""
     
     _instance = None
+    _lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._nodes = None
-            cls._instance._edges = None
-            cls._instance._workflow_id = None
+            with cls._lock:
+                # Double-checked: otro hilo pudo crearla mientras esperábamos el lock
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._nodes = None
+                    instance._edges = None
+                    instance._workflow_id = None
+                    instance._snapshot = None
+                    cls._instance = instance
         return cls._instance
     
     def set_workflow(self, workflow_id: str, nodes: List[Dict], edges: List[Dict]):
         """Store pending workflow data for simulation to pick up."""
-        self._workflow_id = workflow_id
-        self._nodes = nodes
-        self._edges = edges
+        # El dict se construye una vez y se publica con una sola asignación,
+        # así get_workflow nunca ve una mezcla de dos workflows
+        snapshot = {
+            "workflow_id": workflow_id,
+            "nodes": nodes,
+            "edges": edges
+        } if nodes and edges else None
+        with self._lock:
+            self._workflow_id = workflow_id
+            self._nodes = nodes
+            self._edges = edges
+            self._snapshot = snapshot
         print(f"[PendingSimulation] Stored workflow {workflow_id} with {len(nodes)} nodes")
     
     def get_workflow(self) -> Optional[Dict]:
-        """Get pending workflow data if available."""
-        if self._nodes and self._edges:
-            return {
-                "workflow_id": self._workflow_id,
-                "nodes": self._nodes,
-                "edges": self._edges
-            }
-        return None
+        """Get pending workflow data if available (cached, don't mutate)."""
+        return self._snapshot
     
     def clear(self):
         """Clear the pending workflow."""
-        self._workflow_id = None
-        self._nodes = None
-        self._edges = None
+        with self._lock:
+            self._workflow_id = None
+            self._nodes = None
+            self._edges = None
+            self._snapshot = None
     
     @property
     def has_pending(self) -> bool:
@@ -7,6 +7,8 @@ for testing workflow triggers without real equipment.
 """
 import random
 import math
+import queue
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass, field
@@ -14,6 +16,31 @@ from enum import Enum
 
 from .database import db
 
+# Lotes de lecturas pendientes de escribir; si el escritor no da abasto se descartan
+_WRITER_QUEUE_SIZE = 256
+
+
+# --- Valores que disparan cada operador (generate_triggering_data) ---
+
+def _above(threshold: float, rng: random.Random) -> float:
+    return threshold + rng.uniform(5, 20)
+
+
+def _below(threshold: float, rng: random.Random) -> float:
+    return threshold - rng.uniform(5, 20)
+
+
+def _near(threshold: float, rng: random.Random) -> float:
+    return threshold + rng.uniform(-0.01, 0.01)  # Exact value (tiny variation)
+
+
+def _exceed(threshold: float, rng: random.Random) -> float:
+    return threshold * 1.5  # Default: exceed threshold
+
+
+# Valor que dispara cada operador; 'between' se trata aparte
+_TRIGGER_FNS = {'>': _above, '>=': _above, '<': _below, '<=': _below, '==': _near}
+
 
 class AnomalyType(Enum):
     """Types of anomalies that can be injected."""
@@ -24,7 +51,7 @@ class AnomalyType(Enum):
     RANDOM = "random"         # Random anomaly selection
 
 
-@dataclass
+@dataclass(slots=True)
 class SensorConfig:
     """Configuration for a simulated sensor."""
     equipment_id: str
@@ -32,14 +59,27 @@ class SensorConfig:
     unit: str
     min_normal: float
     max_normal: float
-    current_value: float = 0.0
+    # Sin valor explícito arranca en el centro del rango; el simulador lo
+    # inicializa con su propio PRNG (sin tocar el random global)
+    current_value: Optional[float] = None
     noise_level: float = 0.05  # 5% noise by default
+    # Derivados del rango normal, calculados una vez en __post_init__
+    center: float = field(init=False, default=0.0)
+    range_size: float = field(init=False, default=0.0)
+    lower_clamp: float = field(init=False, default=0.0)
+    upper_clamp: float = field(init=False, default=0.0)
     
     def __post_init__(self):
-        self.current_value = random.uniform(self.min_normal, self.max_normal)
+        self.range_size = self.max_normal - self.min_normal
+        self.center = (self.max_normal + self.min_normal) * 0.5
+        if self.current_value is None:
+            self.current_value = self.center
+        # Clamp al rango normal con un 10% de margen
+        self.lower_clamp = self.min_normal - self.range_size * 0.1
+        self.upper_clamp = self.max_normal + self.range_size * 0.1
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationState:
     """State of a running simulation."""
     sensors: Dict[str, SensorConfig] = field(default_factory=dict)
@@ -96,9 +136,17 @@ class SensorSimulator:
         ]
     }
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.state = SimulationState()
+        # PRNG propio: reproducible con seed y sin pasar por el singleton de random
+        self._rng = random.Random(seed)
         self._anomaly_callbacks: List[Callable] = []
+        # Parámetros del valor normal precalculados por sensor (se rehacen al registrar)
+        self._normal_params: Optional[List[tuple]] = None
+        # Escritura a SQLite fuera del tick: un hilo daemon vacía la cola (arranque perezoso)
+        self._writer_queue: queue.Queue = queue.Queue(maxsize=_WRITER_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self.dropped_batches = 0
     
     def register_equipment(self, equipment_id: str, equipment_type: str) -> List[str]:
         """
@@ -112,17 +160,30 @@ class SensorSimulator:
         
         for sensor_type, unit, min_val, max_val in sensor_configs:
             key = f"{equipment_id}.{sensor_type}"
+            # Valor inicial desde el PRNG del simulador para que el seed también lo cubra
             self.state.sensors[key] = SensorConfig(
                 equipment_id=equipment_id,
                 sensor_type=sensor_type,
                 unit=unit,
                 min_normal=min_val,
-                max_normal=max_val
+                max_normal=max_val,
+                current_value=self._rng.uniform(min_val, max_val)
             )
             sensor_keys.append(key)
         
+        self._normal_params = None
         return sensor_keys
     
+    def _build_normal_params(self) -> List[tuple]:
+        """Precompute (key, sensor, center, drift amplitude, sigma, low, high) per sensor."""
+        params = [
+            (key, sensor, sensor.center, sensor.range_size * 0.1,
+             sensor.range_size * sensor.noise_level, sensor.lower_clamp, sensor.upper_clamp)
+            for key, sensor in self.state.sensors.items()
+        ]
+        self._normal_params = params
+        return params
+    
     def tick(self) -> Dict[str, float]:
         """
         Advance simulation by one tick.
@@ -132,50 +193,79 @@ class SensorSimulator:
         self.state.tick_count += 1
         values = {}
         
-        for key, sensor in self.state.sensors.items():
+        # Invariantes del tick, calculados una vez y no por sensor
+        anomaly_key = self.state.anomaly_sensor if self.state.anomaly_active else None
+        drift_wave = math.sin(self.state.tick_count * 0.1)
+        
+        params = self._normal_params
+        if params is None or len(params) != len(self.state.sensors):
+            params = self._build_normal_params()
+        gauss = self._rng.gauss
+        
+        rows = []
+        for key, sensor, center, drift_amp, sigma, low, high in params:
             # Check if this sensor has an active anomaly
-            if self.state.anomaly_active and self.state.anomaly_sensor == key:
+            if key == anomaly_key:
                 new_value = self._generate_anomaly_value(sensor)
             else:
-                new_value = self._generate_normal_value(sensor)
+                # Centro + deriva senoidal + ruido, acotado al rango normal con margen
+                new_value = center + drift_wave * drift_amp + gauss(0, sigma)
+                if new_value < low:
+                    new_value = low
+                elif new_value > high:
+                    new_value = high
             
             sensor.current_value = new_value
             values[key] = new_value
-            
-            # Log to database
-            db.log_sensor_reading(
-                equipment_id=sensor.equipment_id,
-                sensor_type=sensor.sensor_type,
-                value=new_value,
-                unit=sensor.unit
-            )
+            rows.append((sensor.equipment_id, sensor.sensor_type, new_value, sensor.unit))
+        
+        # Log to database off the tick path (one executemany per drained batch)
+        self._enqueue_readings(rows)
         
         return values
     
-    def _generate_normal_value(self, sensor: SensorConfig) -> float:
-        """Generate a normal value with small random noise."""
-        center = (sensor.min_normal + sensor.max_normal) / 2
-        range_size = sensor.max_normal - sensor.min_normal
-        
-        # Add sinusoidal drift for more realistic behavior
-        drift = math.sin(self.state.tick_count * 0.1) * range_size * 0.1
-        
-        # Add random noise
-        noise = random.gauss(0, range_size * sensor.noise_level)
-        
-        value = center + drift + noise
-        
-        # Clamp to normal range with small margin
-        margin = range_size * 0.1
-        return max(sensor.min_normal - margin, min(sensor.max_normal + margin, value))
+    def _enqueue_readings(self, rows: List[tuple]):
+        """Hand a tick's readings to the writer thread, dropping them if it is saturated."""
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write_loop, name='sensor-writer', daemon=True
+            )
+            self._writer.start()
+        try:
+            self._writer_queue.put_nowait(rows)
+        except queue.Full:
+            # Telemetría con pérdida: mejor descartar que bloquear el tick
+            self.dropped_batches += 1
+    
+    def _write_loop(self):
+        """Writer thread: drain queued batches and insert them together."""
+        q = self._writer_queue
+        while True:
+            batches = [q.get()]
+            while True:
+                try:
+                    batches.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                db.log_sensor_readings_bulk([row for rows in batches for row in rows])
+            except Exception as e:
+                print(f"[SIMULATOR] Failed to log sensor readings: {e}")
+            finally:
+                for _ in batches:
+                    q.task_done()
+    
+    def flush(self):
+        """Block until every queued reading has been written to the database."""
+        self._writer_queue.join()
     
     def _generate_anomaly_value(self, sensor: SensorConfig) -> float:
         """Generate an anomalous value based on current anomaly type."""
-        range_size = sensor.max_normal - sensor.min_normal
+        range_size = sensor.range_size
         
         if self.state.anomaly_type == AnomalyType.SPIKE:
             # Spike: 150-200% of max value
-            return sensor.max_normal * random.uniform(1.5, 2.0)
+            return sensor.max_normal * self._rng.uniform(1.5, 2.0)
         
         elif self.state.anomaly_type == AnomalyType.DRIFT:
             # Drift: gradually increase based on tick count since anomaly start
@@ -276,6 +366,8 @@ class SensorSimulator:
             Dict of sensor_key -> value (some will be triggering values)
         """
         data = {}
+        rng = self._rng
+        trigger_fns = _TRIGGER_FNS
         
         for node in workflow_nodes:
             config = node.get('data', {}).get('config', {})
@@ -293,22 +385,12 @@ class SensorSimulator:
             sensor_key = f"{equipment_id}.{sensor_type}"
             
             # Generate a value that triggers the condition
-            if operator in ('>', '>='):
-                # Value above threshold
-                data[sensor_key] = threshold + random.uniform(5, 20)
-            elif operator in ('<', '<='):
-                # Value below threshold
-                data[sensor_key] = threshold - random.uniform(5, 20)
-            elif operator == '==':
-                # Exact value (with tiny variation)
-                data[sensor_key] = threshold + random.uniform(-0.01, 0.01)
-            elif operator == 'between':
+            if operator == 'between':
                 threshold_max = config.get('threshold_max', threshold + 10)
                 # Value outside the range
-                data[sensor_key] = threshold_max + random.uniform(5, 10)
+                data[sensor_key] = threshold_max + rng.uniform(5, 10)
             else:
-                # Default: exceed threshold
-                data[sensor_key] = threshold * 1.5
+                data[sensor_key] = trigger_fns.get(operator, _exceed)(threshold, rng)
         
         return data
 
@@ -6,15 +6,30 @@ Evaluates workflow conditions and executes actions based on sensor data.
 Supports threshold comparisons, pattern detection, and action dispatching.
 """
 import asyncio
-from typing import Dict, List, Any, Optional, Callable
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Callable, Tuple, Awaitable
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass
 
+try:
+    import numpy as np  # Opcional: evaluación vectorizada de lotes grandes de triggers
+except ImportError:
+    np = None
+
 from .database import db, DatabaseService
 from .notification_service import notification_service, NotificationService, AlertTemplates
 
 
+# Campo de config que debe estar relleno para que cada acción haga algo
+_ACTION_TARGET_KEYS = {'whatsapp': 'phone_number', 'email': 'email', 'webhook': 'url'}
+
+# Categorías de nodo que actúan como trigger (equipos con sensores)
+_TRIGGER_CATEGORIES = frozenset({'analyzer', 'robot', 'centrifuge', 'storage', 'conveyor'})
+
+
 class ConditionOperator(Enum):
     """Supported condition operators."""
     GREATER_THAN = ">"
@@ -27,6 +42,44 @@ class ConditionOperator(Enum):
     NOT_BETWEEN = "not_between"
 
 
+# Dispatch directo operador -> comparación (v, threshold, threshold_max)
+_OPS: Dict[str, Callable[[float, float, Optional[float]], bool]] = {
+    '>': lambda v, t, _: v > t,
+    '<': lambda v, t, _: v < t,
+    '>=': lambda v, t, _: v >= t,
+    '<=': lambda v, t, _: v <= t,
+    '==': lambda v, t, _: abs(v - t) < 0.0001,  # Float comparison
+    '!=': lambda v, t, _: abs(v - t) >= 0.0001,
+    'between': lambda v, t, tm: t <= v <= (tm or t),
+    'not_between': lambda v, t, tm: not (t <= v <= (tm or t)),
+}
+
+# Por debajo de este tamaño el overhead de crear arrays supera a las lambdas
+_BATCH_MIN_NUMPY = 64
+
+if np is not None:
+    # Versiones sobre arrays; tm ya viene resuelto como (threshold_max or threshold)
+    _NP_OPS = {
+        '>': lambda v, t, tm: v > t,
+        '<': lambda v, t, tm: v < t,
+        '>=': lambda v, t, tm: v >= t,
+        '<=': lambda v, t, tm: v <= t,
+        '==': lambda v, t, tm: np.abs(v - t) < 0.0001,
+        '!=': lambda v, t, tm: np.abs(v - t) >= 0.0001,
+        'between': lambda v, t, tm: (t <= v) & (v <= tm),
+        'not_between': lambda v, t, tm: ~((t <= v) & (v <= tm)),
+    }
+
+# Operadores desconocidos ya avisados (una config con typo no spamea cada tick)
+_warned_ops: set = set()
+
+
+def _warn_unknown_operator(operator: str):
+    if operator not in _warned_ops:
+        _warned_ops.add(operator)
+        print(f"Unknown operator: {operator}")
+
+
 class ActionType(Enum):
     """Supported action types."""
     WHATSAPP = "whatsapp"
@@ -36,7 +89,7 @@ class ActionType(Enum):
     SYSTEM_ALERT = "system_alert"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowExecutionContext:
     """Context for workflow execution."""
     workflow_id: str
@@ -44,6 +97,7 @@ class WorkflowExecutionContext:
     execution_id: Optional[int] = None
     trigger_data: Dict = None
     results: List[Dict] = None
+    timestamp_iso: str = ''  # Una marca de tiempo por ejecución, compartida por las acciones
     
     def __post_init__(self):
         if self.trigger_data is None:
@@ -63,9 +117,22 @@ class WorkflowEngine:
     """
     
     def __init__(self, db_service: Optional[DatabaseService] = None,
-                 notif_service: Optional[NotificationService] = None):
+                 notif_service: Optional[NotificationService] = None,
+                 cache_ttl: float = 30.0):
         self.db = db_service or db
         self.notifications = notif_service or notification_service
+        # workflow_id -> (loaded_at, db version, workflow) para no releer en cada tick
+        self.cache_ttl = cache_ttl
+        self._wf_cache: Dict[str, Tuple[float, int, Dict]] = {}
+        # action category -> handler (dispatch O(1) en vez de cadena if/elif)
+        self._action_handlers: Dict[str, Callable[..., Awaitable[None]]] = {
+            'whatsapp': self._handle_whatsapp,
+            'email': self._handle_email,
+            'alert': self._handle_alert,
+            'webhook': self._handle_webhook,
+        }
+        # workflow_id -> (updated_at, triggers, triggers por sensor_key) compilados una vez por versión
+        self._compiled: Dict[str, Tuple[str, List[Tuple], Dict[str, List[Tuple]]]] = {}
     
     # --- CONDITION EVALUATION ---
     
@@ -83,31 +150,43 @@ class WorkflowEngine:
         Returns:
             True if condition is met (alert should trigger)
         """
-        try:
-            op = ConditionOperator(operator)
-            
-            if op == ConditionOperator.GREATER_THAN:
-                return value > threshold
-            elif op == ConditionOperator.LESS_THAN:
-                return value < threshold
-            elif op == ConditionOperator.EQUALS:
-                return abs(value - threshold) < 0.0001  # Float comparison
-            elif op == ConditionOperator.NOT_EQUALS:
-                return abs(value - threshold) >= 0.0001
-            elif op == ConditionOperator.GREATER_OR_EQUAL:
-                return value >= threshold
-            elif op == ConditionOperator.LESS_OR_EQUAL:
-                return value <= threshold
-            elif op == ConditionOperator.BETWEEN:
-                return threshold <= value <= (threshold_max or threshold)
-            elif op == ConditionOperator.NOT_BETWEEN:
-                return not (threshold <= value <= (threshold_max or threshold))
-            else:
-                return False
-                
-        except ValueError:
-            print(f"Unknown operator: {operator}")
+        fn = _OPS.get(operator)
+        if fn is None:
+            _warn_unknown_operator(operator)
             return False
+        return fn(value, threshold, threshold_max)
+    
+    def evaluate_conditions_batch(self, values: List[float], operators: List[str],
+                                  thresholds: List[float],
+                                  thresholds_max: Optional[List[Optional[float]]] = None) -> List[bool]:
+        """
+        Evaluate many threshold conditions at once (columnar inputs).
+        
+        Large batches are grouped by operator and evaluated with NumPy when it
+        is installed; otherwise each row goes through the _OPS table.
+        """
+        if thresholds_max is None:
+            thresholds_max = [None] * len(values)
+        
+        if np is None or len(values) < _BATCH_MIN_NUMPY:
+            results = []
+            for v, op, t, tm in zip(values, operators, thresholds, thresholds_max):
+                fn = _OPS.get(op)
+                results.append(fn(v, t, tm) if fn is not None else False)
+            return results
+        
+        v = np.asarray(values, dtype=float)
+        t = np.asarray(thresholds, dtype=float)
+        tm = np.array([m or th for m, th in zip(thresholds_max, thresholds)], dtype=float)
+        ops = np.asarray(operators)
+        out = np.zeros(len(v), dtype=bool)
+        for op in set(operators):
+            fn = _NP_OPS.get(op)
+            if fn is None:
+                continue
+            mask = ops == op
+            out[mask] = fn(v[mask], t[mask], tm[mask])
+        return out.tolist()
     
     # --- WORKFLOW EXECUTION ---
     
@@ -124,7 +203,7 @@ class WorkflowEngine:
             ExecutionContext with results
         """
         # Load workflow
-        workflow = self.db.get_workflow(workflow_id)
+        workflow = self._load_workflow(workflow_id)
         if not workflow:
             raise ValueError(f"Workflow not found: {workflow_id}")
         
@@ -138,6 +217,18 @@ class WorkflowEngine:
             trigger_data=sensor_data
         )
         
+        try:
+            triggered_actions = self._evaluate_triggers(workflow, sensor_data)
+        except Exception as e:
+            self._log_failed_execution(ctx, e)
+            raise
+        
+        # Tick sin disparos: ni registro de ejecución ni round-trips a la DB
+        if not triggered_actions:
+            return ctx
+        
+        ctx.timestamp_iso = datetime.now().isoformat()
+        
         # Log execution start
         ctx.execution_id = self.db.log_execution_start(
             workflow_id, 
@@ -146,62 +237,18 @@ class WorkflowEngine:
         )
         
         try:
-            nodes = workflow['nodes']
-            edges = workflow['edges']
-            
-            # Build adjacency map
-            adjacency = self._build_adjacency_map(edges)
-            
-            # Find trigger nodes (equipment with sensors)
-            trigger_nodes = [n for n in nodes if n['data'].get('category') in 
-                          ['analyzer', 'robot', 'centrifuge', 'storage', 'conveyor']]
-            
-            # Evaluate each trigger
-            triggered_actions = []
-            
-            for trigger_node in trigger_nodes:
-                node_config = trigger_node['data'].get('config', {})
-                if not node_config:
-                    continue
-                
-                # Check if this node's sensor triggered
-                equipment_id = node_config.get('equipment_id', trigger_node['id'])
-                sensor_type = node_config.get('sensor_type')
-                
-                if not sensor_type:
-                    continue
-                
-                sensor_key = f"{equipment_id}.{sensor_type}"
-                current_value = sensor_data.get(sensor_key)
-                
-                if current_value is None:
-                    continue
-                
-                # Evaluate condition
-                operator = node_config.get('operator', '>')
-                threshold = node_config.get('threshold', 0)
-                threshold_max = node_config.get('threshold_max')
-                
-                if self.evaluate_condition(current_value, operator, threshold, threshold_max):
-                    # Condition met - find connected action nodes
-                    connected_actions = self._get_connected_nodes(
-                        trigger_node['id'], adjacency, nodes
-                    )
-                    
-                    for action_node in connected_actions:
-                        triggered_actions.append({
-                            'trigger_node': trigger_node,
-                            'action_node': action_node,
-                            'sensor_value': current_value,
-                            'threshold': threshold,
-                            'equipment_id': equipment_id,
-                            'sensor_type': sensor_type
-                        })
+            # Execute triggered actions concurrently (latency ≈ slowest action)
+            results = await asyncio.gather(
+                *(self._execute_action(action_info, ctx) for action_info in triggered_actions),
+                return_exceptions=True
+            )
+            ctx.results = [
+                {'success': False, 'error': str(r)} if isinstance(r, Exception) else r
+                for r in results
+            ]
             
-            # Execute triggered actions
-            for action_info in triggered_actions:
-                result = await self._execute_action(action_info, ctx)
-                ctx.results.append(result)
+            # Una sola transacción para todas las alertas del tick
+            self.db.log_alerts_bulk([r.pop('alert') for r in ctx.results if 'alert' in r])
             
             # Log completion
             self.db.log_execution_complete(
@@ -211,15 +258,56 @@ class WorkflowEngine:
             )
             
         except Exception as e:
-            self.db.log_execution_complete(
-                ctx.execution_id,
-                status='error',
-                result={'error': str(e)}
-            )
+            self._log_failed_execution(ctx, e)
             raise
         
         return ctx
     
+    def _evaluate_triggers(self, workflow: Dict, sensor_data: Dict[str, float]) -> List[Dict]:
+        """Return the actions fired by this tick's readings (pure, no DB access)."""
+        triggered_actions = []
+        
+        # Recorrer el lado más pequeño: lecturas del tick o triggers del workflow
+        triggers, by_key = self._compile_workflow(workflow)
+        if len(sensor_data) < len(triggers):
+            hits = [(trigger, value) for key, value in sensor_data.items()
+                    for trigger in by_key.get(key, ())]
+        else:
+            hits = [(trigger, value) for trigger in triggers
+                    if (value := sensor_data.get(trigger[0])) is not None]
+        
+        for (sensor_key, op_fn, threshold, threshold_max,
+             trigger_node, equipment_id, sensor_type, actions), current_value in hits:
+            if current_value is None:
+                continue
+            
+            if op_fn(current_value, threshold, threshold_max):
+                for action_node in actions:
+                    triggered_actions.append({
+                        'trigger_node': trigger_node,
+                        'action_node': action_node,
+                        'sensor_value': current_value,
+                        'threshold': threshold,
+                        'equipment_id': equipment_id,
+                        'sensor_type': sensor_type
+                    })
+        
+        return triggered_actions
+    
+    def _log_failed_execution(self, ctx: WorkflowExecutionContext, error: Exception):
+        """Record an execution that raised (opening the log row if needed)."""
+        if ctx.execution_id is None:
+            ctx.execution_id = self.db.log_execution_start(
+                ctx.workflow_id,
+                triggered_by="sensor_check",
+                trigger_data=ctx.trigger_data
+            )
+        self.db.log_execution_complete(
+            ctx.execution_id,
+            status='error',
+            result={'error': str(error)}
+        )
+    
     async def _execute_action(self, action_info: Dict, 
                              ctx: WorkflowExecutionContext) -> Dict:
         """Execute a single action node."""
@@ -228,25 +316,6 @@ class WorkflowEngine:
         action_config = action_node['data'].get('config', {})
         action_type = action_node['data'].get('category', '')
         
-        # Get equipment info for message
-        equipment_name = trigger_node['data'].get('label', trigger_node['id'])
-        sensor_type = action_info['sensor_type']
-        sensor_value = action_info['sensor_value']
-        threshold = action_info['threshold']
-        
-        # Determine severity
-        severity = action_config.get('severity', 'warning')
-        
-        # Generate message from template
-        alert_content = AlertTemplates.threshold_alert(
-            equipment_name=equipment_name,
-            sensor=sensor_type,
-            value=sensor_value,
-            threshold=threshold,
-            unit=action_config.get('unit', ''),
-            severity=severity
-        )
-        
         result = {
             'action_type': action_type,
             'action_node_id': action_node['id'],
@@ -254,102 +323,191 @@ class WorkflowEngine:
             'success': False
         }
         
+        handler = self._action_handlers.get(action_type)
+        if handler is None:
+            result['error'] = f'Unknown action type: {action_type}'
+            return result
+        
+        # Sin destinatario la acción no hace nada: no renderizar la plantilla
+        target_key = _ACTION_TARGET_KEYS.get(action_type)
+        if target_key is not None and not action_config.get(target_key):
+            result['error'] = f'No {target_key} configured'
+            return result
+        
+        # Generate message from template
+        alert_content = AlertTemplates.threshold_alert(
+            equipment_name=trigger_node['data'].get('label', trigger_node['id']),
+            sensor=action_info['sensor_type'],
+            value=action_info['sensor_value'],
+            threshold=action_info['threshold'],
+            unit=action_config.get('unit', ''),
+            severity=action_config.get('severity', 'warning')
+        )
+        
         try:
-            if action_type == 'whatsapp':
-                recipient = action_config.get('phone_number', '')
-                if recipient:
-                    notif_result = await self.notifications.send_whatsapp(
-                        recipient, alert_content['text']
-                    )
-                    result['success'] = notif_result.success
-                    result['message_id'] = notif_result.message_id
-                    result['error'] = notif_result.error
-                    
-                    # Log alert
-                    self.db.log_alert(
-                        workflow_id=ctx.workflow_id,
-                        action_type='whatsapp',
-                        recipient=recipient,
-                        message=alert_content['text'],
-                        status='sent' if notif_result.success else 'failed',
-                        execution_id=ctx.execution_id,
-                        error_message=notif_result.error
-                    )
-            
-            elif action_type == 'email':
-                recipient = action_config.get('email', '')
-                if recipient:
-                    notif_result = await self.notifications.send_email(
-                        recipient,
-                        alert_content['subject'],
-                        alert_content['text'],
-                        html_body=alert_content.get('html')
-                    )
-                    result['success'] = notif_result.success
-                    result['message_id'] = notif_result.message_id
-                    result['error'] = notif_result.error
-                    
-                    # Log alert
-                    self.db.log_alert(
-                        workflow_id=ctx.workflow_id,
-                        action_type='email',
-                        recipient=recipient,
-                        message=alert_content['text'],
-                        status='sent' if notif_result.success else 'failed',
-                        execution_id=ctx.execution_id,
-                        error_message=notif_result.error
-                    )
-            
-            elif action_type == 'alert':
-                # System alert - log to database
-                self.db.log_alert(
-                    workflow_id=ctx.workflow_id,
-                    action_type='system_alert',
-                    recipient='system',
-                    message=alert_content['text'],
-                    status='logged',
-                    execution_id=ctx.execution_id
-                )
-                result['success'] = True
-            
-            elif action_type == 'webhook':
-                webhook_url = action_config.get('url', '')
-                if webhook_url:
-                    payload = {
-                        'workflow_id': ctx.workflow_id,
-                        'equipment': equipment_name,
-                        'sensor': sensor_type,
-                        'value': sensor_value,
-                        'threshold': threshold,
-                        'severity': severity,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    notif_result = await self.notifications.send_webhook(webhook_url, payload)
-                    result['success'] = notif_result.success
-                    result['error'] = notif_result.error
-                    
+            await handler(action_info, ctx, action_config, alert_content, result)
         except Exception as e:
             result['error'] = str(e)
         
         return result
     
+    # --- ACTION HANDLERS (rellenan `result`; alert rows van en bulk) ---
+    
+    async def _handle_whatsapp(self, action_info: Dict, ctx: WorkflowExecutionContext,
+                               action_config: Dict, alert_content: Dict, result: Dict):
+        recipient = action_config['phone_number']
+        notif_result = await self.notifications.send_whatsapp(
+            recipient, alert_content['text'], dedupe_key=alert_content['text']
+        )
+        self._record_notification(result, ctx, 'whatsapp', recipient, alert_content, notif_result)
+    
+    async def _handle_email(self, action_info: Dict, ctx: WorkflowExecutionContext,
+                            action_config: Dict, alert_content: Dict, result: Dict):
+        recipient = action_config['email']
+        notif_result = await self.notifications.send_email(
+            recipient,
+            alert_content['subject'],
+            alert_content['text'],
+            html_body=alert_content.get('html'),
+            dedupe_key=alert_content['text']
+        )
+        self._record_notification(result, ctx, 'email', recipient, alert_content, notif_result)
+    
+    async def _handle_alert(self, action_info: Dict, ctx: WorkflowExecutionContext,
+                            action_config: Dict, alert_content: Dict, result: Dict):
+        # System alert - log to database
+        result['alert'] = dict(
+            workflow_id=ctx.workflow_id,
+            action_type='system_alert',
+            recipient='system',
+            message=alert_content['text'],
+            status='logged',
+            execution_id=ctx.execution_id
+        )
+        result['success'] = True
+    
+    async def _handle_webhook(self, action_info: Dict, ctx: WorkflowExecutionContext,
+                              action_config: Dict, alert_content: Dict, result: Dict):
+        trigger_node = action_info['trigger_node']
+        payload = {
+            'workflow_id': ctx.workflow_id,
+            'equipment': trigger_node['data'].get('label', trigger_node['id']),
+            'sensor': action_info['sensor_type'],
+            'value': action_info['sensor_value'],
+            'threshold': action_info['threshold'],
+            'severity': action_config.get('severity', 'warning'),
+            'timestamp': ctx.timestamp_iso or datetime.now().isoformat()
+        }
+        notif_result = await self.notifications.send_webhook(
+            action_config['url'], payload, dedupe_key=alert_content['text']
+        )
+        result['success'] = notif_result.success
+        result['error'] = notif_result.error
+        result['deduped'] = notif_result.deduped
+    
+    @staticmethod
+    def _record_notification(result: Dict, ctx: WorkflowExecutionContext, action_type: str,
+                             recipient: str, alert_content: Dict, notif_result) -> None:
+        """Copy a NotificationResult into the action result plus its alert row."""
+        result['success'] = notif_result.success
+        result['message_id'] = notif_result.message_id
+        result['error'] = notif_result.error
+        if notif_result.deduped:
+            # Repetición absorbida: no salió ningún mensaje, no hay fila de alerta
+            result['deduped'] = True
+            return
+        result['alert'] = dict(
+            workflow_id=ctx.workflow_id,
+            action_type=action_type,
+            recipient=recipient,
+            message=alert_content['text'],
+            status='sent' if notif_result.success else 'failed',
+            execution_id=ctx.execution_id,
+            error_message=notif_result.error
+        )
+    
+    def _load_workflow(self, workflow_id: str) -> Optional[Dict]:
+        """Get a workflow, reusing the cached copy while fresh and unchanged in the DB."""
+        version = getattr(self.db, 'workflows_version', None)
+        now = time.monotonic()
+        cached = self._wf_cache.get(workflow_id)
+        if (cached is not None and version is not None and cached[1] == version
+                and now - cached[0] < self.cache_ttl):
+            return cached[2]
+        
+        workflow = self.db.get_workflow(workflow_id)
+        if workflow is None:
+            self.forget_workflow(workflow_id)
+        elif version is not None:
+            self._wf_cache[workflow_id] = (now, version, workflow)
+        return workflow
+    
+    def forget_workflow(self, workflow_id: str):
+        """Drop the cached copy and compiled triggers of a workflow (e.g. after deleting it)."""
+        self._wf_cache.pop(workflow_id, None)
+        self._compiled.pop(workflow_id, None)
+    
+    def _compile_workflow(self, workflow: Dict) -> Tuple[List[Tuple], Dict[str, List[Tuple]]]:
+        """
+        Precompute trigger descriptors for a workflow, cached per version.
+        
+        Each descriptor is (sensor_key, op_fn, threshold, threshold_max,
+        trigger_node, equipment_id, sensor_type, connected_action_nodes).
+        Returns the descriptor list plus an index sensor_key -> descriptors.
+        """
+        workflow_id = workflow['id']
+        version = workflow.get('updated_at')
+        cached = self._compiled.get(workflow_id)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        
+        nodes = workflow['nodes']
+        adjacency = self._build_adjacency_map(workflow['edges'])
+        nodes_map = {n['id']: n for n in nodes}
+        
+        triggers = []
+        for node in nodes:
+            data = node['data']
+            if data.get('category') not in _TRIGGER_CATEGORIES:
+                continue
+            node_config = data.get('config', {})
+            sensor_type = node_config.get('sensor_type') if node_config else None
+            if not sensor_type:
+                continue
+            operator = node_config.get('operator', '>')
+            op_fn = _OPS.get(operator)
+            if op_fn is None:
+                _warn_unknown_operator(operator)
+                continue
+            equipment_id = node_config.get('equipment_id', node['id'])
+            actions = self._get_connected_nodes(node['id'], adjacency, nodes_map)
+            triggers.append((
+                f"{equipment_id}.{sensor_type}",
+                op_fn,
+                node_config.get('threshold', 0),
+                node_config.get('threshold_max'),
+                node, equipment_id, sensor_type, actions
+            ))
+        
+        by_key: Dict[str, List[Tuple]] = defaultdict(list)
+        for trigger in triggers:
+            by_key[trigger[0]].append(trigger)
+        by_key = dict(by_key)
+        
+        self._compiled[workflow_id] = (version, triggers, by_key)
+        return triggers, by_key
+    
     def _build_adjacency_map(self, edges: List[Dict]) -> Dict[str, List[str]]:
         """Build adjacency map from edges."""
-        adjacency = {}
+        adjacency = defaultdict(list)
         for edge in edges:
-            source = edge.get('source', '')
-            target = edge.get('target', '')
-            if source not in adjacency:
-                adjacency[source] = []
-            adjacency[source].append(target)
+            adjacency[edge.get('source', '')].append(edge.get('target', ''))
         return adjacency
     
     def _get_connected_nodes(self, node_id: str, adjacency: Dict[str, List[str]], 
-                            nodes: List[Dict]) -> List[Dict]:
-        """Get nodes connected to given node."""
-        connected_ids = adjacency.get(node_id, [])
-        nodes_map = {n['id']: n for n in nodes}
-        return [nodes_map[nid] for nid in connected_ids if nid in nodes_map]
+                            nodes_map: Dict[str, Dict]) -> List[Dict]:
+        """Get nodes connected to given node (nodes_map: id -> node, built once by the caller)."""
+        return [nodes_map[nid] for nid in adjacency.get(node_id, ()) if nid in nodes_map]
     
     # --- SIMULATION / TESTING ---
     
@@ -360,52 +518,34 @@ class WorkflowEngine:
         
         Returns a preview of what would happen.
         """
-        workflow = self.db.get_workflow(workflow_id)
+        workflow = self._load_workflow(workflow_id)
         if not workflow:
             return {'error': f'Workflow not found: {workflow_id}'}
         
-        nodes = workflow['nodes']
-        edges = workflow['edges']
-        
         # Generate mock data if not provided
         if mock_sensor_data is None:
-            mock_sensor_data = self._generate_mock_sensor_data(nodes)
+            mock_sensor_data = self._generate_mock_sensor_data(workflow['nodes'])
         
-        # Preview what would trigger
-        adjacency = self._build_adjacency_map(edges)
-        results = []
+        # Mismos descriptores compilados (y cacheados) que execute_workflow
+        triggers, _ = self._compile_workflow(workflow)
+        values = [mock_sensor_data.get(trigger[0], 0) for trigger in triggers]
+        operators = [trigger[4]['data']['config'].get('operator', '>') for trigger in triggers]
         
-        trigger_nodes = [n for n in nodes if n['data'].get('category') in 
-                        ['analyzer', 'robot', 'centrifuge', 'storage', 'conveyor']]
+        # Evaluar todos los triggers en un solo lote
+        would_trigger = self.evaluate_conditions_batch(
+            values, operators, [t[2] for t in triggers], [t[3] for t in triggers]
+        )
         
-        for trigger_node in trigger_nodes:
-            node_config = trigger_node['data'].get('config', {})
-            if not node_config:
-                continue
-            
-            equipment_id = node_config.get('equipment_id', trigger_node['id'])
-            sensor_type = node_config.get('sensor_type')
-            
-            if not sensor_type:
-                continue
-            
-            sensor_key = f"{equipment_id}.{sensor_type}"
-            current_value = mock_sensor_data.get(sensor_key, 0)
-            
-            operator = node_config.get('operator', '>')
-            threshold = node_config.get('threshold', 0)
-            
-            would_trigger = self.evaluate_condition(current_value, operator, threshold)
-            
-            connected = self._get_connected_nodes(trigger_node['id'], adjacency, nodes)
-            
+        results = []
+        for trigger, current_value, operator, fired in zip(triggers, values, operators, would_trigger):
+            trigger_node, sensor_type, connected = trigger[4], trigger[6], trigger[7]
             results.append({
                 'trigger_node': trigger_node['data'].get('label', trigger_node['id']),
                 'sensor': sensor_type,
                 'current_value': current_value,
-                'threshold': threshold,
+                'threshold': trigger[2],
                 'operator': operator,
-                'would_trigger': would_trigger,
+                'would_trigger': fired,
                 'connected_actions': [a['data'].get('label', a['id']) for a in connected]
             })
         
@@ -417,9 +557,7 @@ class WorkflowEngine:
     
     def _generate_mock_sensor_data(self, nodes: List[Dict]) -> Dict[str, float]:
         """Generate mock sensor data that would trigger some nodes."""
-        import random
-        mock_data = {}
-        
+        rows = []
         for node in nodes:
             config = node['data'].get('config', {})
             if not config:
@@ -427,29 +565,40 @@ class WorkflowEngine:
             
             equipment_id = config.get('equipment_id', node['id'])
             sensor_type = config.get('sensor_type')
-            threshold = config.get('threshold', 50)
-            operator = config.get('operator', '>')
             
             if not sensor_type:
                 continue
             
-            # Generate value that sometimes triggers, sometimes doesn't
-            if random.random() > 0.5:
+            rows.append((f"{equipment_id}.{sensor_type}",
+                         config.get('threshold', 50), config.get('operator', '>')))
+        
+        # Todas las tiradas de golpe: un solo paso por el RNG en vez de 2 llamadas por nodo
+        n = len(rows)
+        if np is not None and n >= _BATCH_MIN_NUMPY:
+            rng = np.random.default_rng()
+            fires = (rng.random(n) > 0.5).tolist()
+            deltas = rng.uniform(5, 20, n).tolist()
+        else:
+            rand, uniform = random.random, random.uniform
+            fires = [rand() > 0.5 for _ in range(n)]
+            deltas = [uniform(5, 20) for _ in range(n)]
+        
+        mock_data = {}
+        for (sensor_key, threshold, operator), fire, delta in zip(rows, fires, deltas):
+            rising = operator in ('>', '>=')
+            if fire:
                 # Generate triggering value
-                if operator in ('>', '>='):
-                    value = threshold + random.uniform(5, 20)
+                if rising:
+                    value = threshold + delta
                 elif operator in ('<', '<='):
-                    value = threshold - random.uniform(5, 20)
+                    value = threshold - delta
                 else:
                     value = threshold
             else:
                 # Generate non-triggering value
-                if operator in ('>', '>='):
-                    value = threshold - random.uniform(5, 20)
-                else:
-                    value = threshold + random.uniform(5, 20)
+                value = threshold - delta if rising else threshold + delta
             
-            mock_data[f"{equipment_id}.{sensor_type}"] = round(value, 2)
+            mock_data[sensor_key] = round(value, 2)
         
         return mock_data
 
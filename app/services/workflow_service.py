@@ -6,9 +6,49 @@ Provides a stateless service for workflow operations that can be called
 from any state without causing re-renders in other states.
 """
 import uuid
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from .database import db
+
+
+# (subcadena, categoría) en orden de prioridad; sin coincidencia -> 'analyzer'
+_CATEGORY_TOKENS = (
+    ('centrifuge', 'centrifuge'),
+    ('robot', 'robot'), ('arm', 'robot'),
+    ('analyzer', 'analyzer'), ('scan', 'analyzer'),
+    ('storage', 'storage'), ('tank', 'storage'),
+    ('conveyor', 'conveyor'), ('belt', 'conveyor'),
+)
+
+
+@lru_cache(maxsize=512)
+def _infer_equipment_category(equipment_name: str) -> str:
+    """Infer equipment category from name (memoized: names repeat across specs)."""
+    name_lower = equipment_name.lower()
+    return next((cat for token, cat in _CATEGORY_TOKENS if token in name_lower), 'analyzer')
+
+
+def _node_styles(colors_by_category: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """Build the full node style dict for each category once."""
+    return {
+        category: {
+            'background': colors['bg'],
+            'color': 'white',
+            'border': f"2px solid {colors['border']}",
+            'borderRadius': '8px',
+            'padding': '10px 15px',
+            'fontSize': '12px',
+            'fontWeight': '500',
+            'minWidth': '120px',
+            'textAlign': 'center',
+            'cursor': 'pointer',
+            'boxShadow': '0 0 10px rgba(34, 197, 94, 0.5)'  # Configured indicator
+        }
+        for category, colors in colors_by_category.items()
+    }
+
 
 class WorkflowService:
     """Shared service for workflow operations."""
@@ -29,6 +69,10 @@ class WorkflowService:
         'webhook': {'bg': '#374151', 'border': '#6b7280'},
     }
     
+    # Estilos completos por categoría, construidos una sola vez
+    _EQUIPMENT_STYLES = _node_styles(EQUIPMENT_COLORS)
+    _ACTION_STYLES = _node_styles(ACTION_COLORS)
+    
     CATEGORY_INFO = {
         'analyzer': {'name': 'Analyzer', 'icon': 'scan'},
         'robot': {'name': 'Robot', 'icon': 'box'},
@@ -131,28 +175,16 @@ class WorkflowService:
     
     def _infer_equipment_category(self, equipment_name: str) -> str:
         """Infer equipment category from name."""
-        name_lower = equipment_name.lower()
-        
-        if 'centrifuge' in name_lower:
-            return 'centrifuge'
-        elif 'robot' in name_lower or 'arm' in name_lower:
-            return 'robot'
-        elif 'analyzer' in name_lower or 'scan' in name_lower:
-            return 'analyzer'
-        elif 'storage' in name_lower or 'tank' in name_lower:
-            return 'storage'
-        elif 'conveyor' in name_lower or 'belt' in name_lower:
-            return 'conveyor'
-        else:
-            return 'analyzer'  # Default
+        return _infer_equipment_category(equipment_name)
     
     def _create_node(self, node_id: str, category: str, label: str,
                      is_action: bool, position: Dict, config: Dict) -> Dict:
         """Create a styled node."""
+        # Copia de la plantilla precalculada (cada nodo puede editar su propio style)
         if is_action:
-            colors = self.ACTION_COLORS.get(category, self.ACTION_COLORS['alert'])
+            style = self._ACTION_STYLES.get(category, self._ACTION_STYLES['alert']).copy()
         else:
-            colors = self.EQUIPMENT_COLORS.get(category, self.EQUIPMENT_COLORS['analyzer'])
+            style = self._EQUIPMENT_STYLES.get(category, self._EQUIPMENT_STYLES['analyzer']).copy()
         
         return {
             'id': node_id,
@@ -165,19 +197,7 @@ class WorkflowService:
                 'configured': True,
                 'config': config
             },
-            'style': {
-                'background': colors['bg'],
-                'color': 'white',
-                'border': f"2px solid {colors['border']}",
-                'borderRadius': '8px',
-                'padding': '10px 15px',
-                'fontSize': '12px',
-                'fontWeight': '500',
-                'minWidth': '120px',
-                'textAlign': 'center',
-                'cursor': 'pointer',
-                'boxShadow': '0 0 10px rgba(34, 197, 94, 0.5)'  # Configured indicator
-            },
+            'style': style,
             'sourcePosition': 'right',
             'targetPosition': 'left',
         }
@@ -196,12 +216,7 @@ class WorkflowService:
         Returns:
             True if successful
         """
-        print(f"[WorkflowService.save_workflow] >>> ENTRY: id={workflow_id}, name={name}")
         try:
-            print("[WorkflowService.save_workflow] >>> Importing db...")
-            from app.services.database import db
-
-            print("[WorkflowService.save_workflow] >>> Calling db.save_workflow()...")
             db.save_workflow(
                 workflow_id=workflow_id,
                 name=name,
@@ -210,18 +225,14 @@ class WorkflowService:
                 edges=edges,
                 status=status
             )
-            print("[WorkflowService.save_workflow] >>> db.save_workflow() returned")
-            print("[WorkflowService.save_workflow] >>> EXIT: success=True")
             return True
         except Exception as e:
-            print(f"[WorkflowService.save_workflow] !!! ERROR: {e}")
-            print(f"[WorkflowService.save_workflow] >>> EXIT: success=False")
+            print(f"Error saving workflow: {e}")
             return False
     
     def load_workflow(self, workflow_id: str) -> Optional[Dict]:
         """Load workflow from database."""
         try:
-            from app.services.database import db
             return db.get_workflow(workflow_id)
         except Exception as e:
             print(f"Error loading workflow: {e}")
@@ -230,7 +241,6 @@ class WorkflowService:
     def activate_workflow(self, workflow_id: str) -> bool:
         """Activate a workflow."""
         try:
-            from app.services.database import db
             workflow = db.get_workflow(workflow_id)
             if workflow:
                 db.save_workflow(
@@ -250,7 +260,6 @@ class WorkflowService:
     def get_active_workflows(self) -> List[Dict]:
         """Get all active workflows."""
         try:
-            from app.services.database import db
             return db.get_all_workflows(status="active")
         except Exception as e:
             print(f"Error getting active workflows: {e}")
@@ -2,9 +2,44 @@
 """Reflex state for the Nexus AI Agent chat interface with streaming support."""
 import reflex as rx
 from typing import List, Optional, Dict, Any
-import datetime
+import time
 import asyncio
 import os
+import re
+
+
+# Mensajes que se conservan en el chat (el LLM solo ve los últimos 10)
+_MAX_CHAT_HISTORY = 50
+
+# Palabras que indican una petición de acción (usa el agente con tools)
+ACTION_KEYWORDS = (
+    'create', 'workflow', 'alert', 'notify', 'send', 'email', 'whatsapp', 'monitor', 'watch',
+    'yes', 'proceed', 'confirm', 'approve', 'okay', 'ok', 'sure', 'do it', 'go ahead', 'correct', 'right'
+)
+# Una sola pasada sobre el mensaje; \b solo al inicio: "alerts"/"creating" siguen
+# contando pero "book" o "bright" ya no disparan 'ok'/'right'
+_ACTION_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, ACTION_KEYWORDS)) + ')', re.IGNORECASE)
+
+# Streaming: volcar al UI cada N caracteres o cada T segundos (lo que llegue antes)
+_STREAM_FLUSH_CHARS = 32
+_STREAM_FLUSH_SECONDS = 0.05
+
+# (model, api_key) -> ChatOpenAI: reutiliza el cliente HTTP (pool + TLS) entre mensajes
+_LLM_CACHE: Dict[tuple, Any] = {}
+
+
+def _get_llm(model: str, api_key: str):
+    """Return the shared streaming ChatOpenAI client for this model/key."""
+    llm = _LLM_CACHE.get((model, api_key))
+    if llm is None:
+        from langchain_openai import ChatOpenAI
+        llm = _LLM_CACHE[(model, api_key)] = ChatOpenAI(
+            model=model,
+            temperature=0.3,
+            api_key=api_key,
+            streaming=True
+        )
+    return llm
 
 
 class AgentState(rx.State):
@@ -33,7 +68,7 @@ class AgentState(rx.State):
             {
                 "role": "assistant",
                 "content": "👋 Hello! I'm **Nexus AI**, your intelligent assistant for industrial monitoring.\n\nI can help you with:\n- 📊 **Equipment status** - Check any machine's health\n- 📈 **Sensor readings** - View live sensor data\n- ⚠️ **Alerts** - Review recent warnings\n- 🔧 **Workflows** - Create automation rules from text\n\nHow can I help you today?",
-                "time": datetime.datetime.now().strftime("%H:%M")
+                "time": time.strftime("%H:%M")
             }
         ]
     
@@ -69,11 +104,7 @@ class AgentState(rx.State):
         self.error_message = ""
         
         # Add empty assistant message for streaming
-        now = datetime.datetime.now().strftime("%H:%M")
-        self.chat_history = [
-            *self.chat_history,
-            {"role": "assistant", "content": "", "time": now}
-        ]
+        self._add_message("", "assistant")
         yield
         
         try:
@@ -86,12 +117,7 @@ class AgentState(rx.State):
                 return
             
             # Detect if this is an action request that needs tools
-            action_keywords = [
-                'create', 'workflow', 'alert', 'notify', 'send', 'email', 'whatsapp', 'monitor', 'watch',
-                'yes', 'proceed', 'confirm', 'approve', 'okay', 'ok', 'sure', 'do it', 'go ahead', 'correct', 'right'
-            ]
-            message_lower = message.lower()
-            needs_tools = any(kw in message_lower for kw in action_keywords)
+            needs_tools = _ACTION_RE.search(message) is not None
             
             if needs_tools:
                 # Use full agent with tools for action requests
@@ -105,10 +131,26 @@ class AgentState(rx.State):
             else:
                 # Use streaming for general questions
                 try:
+                    # Agrupar tokens: un diff de estado por ventana, no uno por token
+                    loop = asyncio.get_running_loop()
+                    parts: List[str] = []
+                    pending = 0
+                    last_flush = loop.time()
                     async for chunk in self._stream_response(message):
-                        self.streaming_response += chunk
+                        parts.append(chunk)
+                        pending += len(chunk)
+                        now = loop.time()
+                        if pending >= _STREAM_FLUSH_CHARS or now - last_flush >= _STREAM_FLUSH_SECONDS:
+                            self.streaming_response = "".join(parts)
+                            self.chat_history[-1]["content"] = self.streaming_response
+                            pending = 0
+                            last_flush = now
+                            yield  # Update UI with the batched chunks
+                            # Ceder el loop para que el envío por websocket no espere al stream
+                            await asyncio.sleep(0)
+                    if pending:
+                        self.streaming_response = "".join(parts)
                         self.chat_history[-1]["content"] = self.streaming_response
-                        yield  # Update UI with each chunk
                 except Exception as stream_error:
                     print(f"Streaming failed, falling back to agent: {stream_error}")
                     response = await self._process_message(message)
@@ -129,19 +171,10 @@ class AgentState(rx.State):
     
     async def _stream_response(self, message: str):
         """Stream response from LLM token by token using langchain streaming."""
-        from langchain_openai import ChatOpenAI
         from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
         from app.agents.prompts import SYSTEM_PROMPT
         
-        api_key = os.getenv("OPENAI_API_KEY")
-        model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        
-        llm = ChatOpenAI(
-            model=model,
-            temperature=0.3,
-            api_key=api_key,
-            streaming=True
-        )
+        llm = _get_llm(os.getenv("OPENAI_MODEL", "gpt-4o-mini"), os.getenv("OPENAI_API_KEY"))
         
         # Build messages from history
         messages = [SystemMessage(content=SYSTEM_PROMPT)]
@@ -305,7 +338,7 @@ class AgentState(rx.State):
             {
                 "role": "assistant",
                 "content": "🔄 Chat cleared. How can I help you?",
-                "time": datetime.datetime.now().strftime("%H:%M")
+                "time": time.strftime("%H:%M")
             }
         ]
         self.pending_workflow = None
@@ -316,8 +349,8 @@ class AgentState(rx.State):
     
     def _add_message(self, content: str, role: str):
         """Add a message to chat history."""
-        now = datetime.datetime.now().strftime("%H:%M")
-        self.chat_history = [
-            *self.chat_history,
-            {"role": role, "content": content, "time": now}
-        ]
+        now = time.strftime("%H:%M")
+        # append in situ (Reflex marca la var como dirty) en vez de copiar toda la lista
+        self.chat_history.append({"role": role, "content": content, "time": now})
+        if len(self.chat_history) > _MAX_CHAT_HISTORY:
+            del self.chat_history[:-_MAX_CHAT_HISTORY]
@@ -3,7 +3,11 @@
 import reflex as rx
 from typing import List
 import random
-import datetime
+import time
+
+# Mensajes que se conservan en el chat
+_MAX_CHAT_HISTORY = 50
+
 
 class MonitorState(rx.State):
     """Estado del Monitor (separado de WorkflowState)"""
@@ -145,8 +149,7 @@ class MonitorState(rx.State):
         self.chat_input = ""
     
     def _add_message(self, text: str, role: str = "system"):
-        now = datetime.datetime.now().strftime("%H:%M:%S")
-        self.chat_history = [
-            *self.chat_history,
-            {"role": role, "text": text, "time": now}
-        ]
\ No newline at end of file
+        now = time.strftime("%H:%M:%S")
+        self.chat_history.append({"role": role, "text": text, "time": now})
+        if len(self.chat_history) > _MAX_CHAT_HISTORY:
+            del self.chat_history[:-_MAX_CHAT_HISTORY]
\ No newline at end of file
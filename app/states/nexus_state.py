@@ -1,10 +1,14 @@
 import reflex as rx
 import asyncio
 from typing import List
-import datetime
+import time
 import random
 from app.states.workflow_state import WorkflowState
 
+# Mensajes que se conservan en el chat
+_MAX_CHAT_HISTORY = 50
+
+
 class NexusState(rx.State):
     """Main application state"""
     
@@ -121,11 +125,13 @@ class NexusState(rx.State):
         self.chat_input = value
         
     def _add_message(self, text: str, role: str = "system"):
-        now = datetime.datetime.now().strftime("%H:%M:%S")
-        self.chat_history = [*self.chat_history, {"role": role, "text": text, "time": now}]
+        now = time.strftime("%H:%M:%S")
+        self.chat_history.append({"role": role, "text": text, "time": now})
+        if len(self.chat_history) > _MAX_CHAT_HISTORY:
+            del self.chat_history[:-_MAX_CHAT_HISTORY]
         
     def _add_workflow(self, title: str, status: str):
-        now = datetime.datetime.now().strftime("%H:%M:%S")
+        now = time.strftime("%H:%M:%S")
         self.workflow_steps = [*self.workflow_steps, {"id": str(len(self.workflow_steps)+1), "title": title, "status": status, "time": now}]
         
     @rx.event
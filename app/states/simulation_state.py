@@ -10,10 +10,23 @@ This state handles all simulation-related functionality:
 """
 import reflex as rx
 from typing import List, Dict, Any
+import asyncio
 import random
 import math
 from datetime import datetime
 
+# Tamaño máximo del feed de alertas en memoria/UI (las más recientes primero)
+ALERT_FEED_LIMIT = 20
+
+
+def _feed_status(result) -> str:
+    """Estado de entrega para el feed: 'queued' (pendiente), 'sent' o 'failed'."""
+    if result is None:
+        return 'failed'
+    if getattr(result, 'queued', False):
+        return 'queued'
+    return 'sent' if result.success else 'failed'
+
 
 class SimulationState(rx.State):
     """Isolated simulation state to prevent UI re-renders."""
@@ -41,6 +54,9 @@ class SimulationState(rx.State):
     # === CACHED WORKFLOW DATA ===
     _cached_nodes: List[Dict] = []
     _cached_edges: List[Dict] = []
+
+    # Bumped on every start so a stale tick loop from a previous run exits
+    _loop_generation: int = 0
     
     # === WORKFLOW REFERENCE ===
     # We need to get workflow data from WorkflowState for evaluation
@@ -63,6 +79,18 @@ class SimulationState(rx.State):
             'edges': getattr(self, '_cached_edges', [])
         }
     
+    # === COMPUTED VARS ===
+    
+    @rx.var
+    def simulation_speed_str(self) -> str:
+        """Speed as string, for the interval select value."""
+        return str(self.simulation_speed)
+    
+    @rx.var
+    def tick_label(self) -> str:
+        """Pre-rendered tick counter label."""
+        return f"Tick #{self.simulation_tick_count}"
+    
     # === EVENTS ===
     
     @rx.event
@@ -132,9 +160,11 @@ class SimulationState(rx.State):
         self.alert_count = 0  # Reset alert counter
         print("[SimulationState] 🟢 Setting simulation_running = True")
         self.simulation_running = True
+        self._loop_generation += 1
         print("[SimulationState] >>> Showing toast...")
         self._show_toast(f"🚀 Simulation started! Updates every {self.simulation_speed}s", "success")
         print("[SimulationState] >>> EXIT: start_simulation completed successfully")
+        return SimulationState.simulation_loop(self._loop_generation)
     
     @rx.event
     def stop_simulation(self):
@@ -154,9 +184,31 @@ class SimulationState(rx.State):
 
         self._show_toast("Simulation stopped", "info")
     
-    @rx.event
-    async def simulation_tick(self):
-        """Process one simulation tick - called by JavaScript interval."""
+    @rx.event(background=True)
+    async def simulation_loop(self, generation: int):
+        """Server-side ticker - runs one tick every simulation_speed seconds.
+
+        Ticks are scheduled against a fixed deadline so the tick duration
+        doesn't drift the cadence. If a tick overruns, the missed ticks are
+        coalesced into one instead of firing a catch-up burst.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            async with self:
+                speed = self.simulation_speed
+            deadline += speed
+            now = loop.time()
+            if deadline < now:
+                deadline = now
+            await asyncio.sleep(deadline - now)
+            async with self:
+                if not self.simulation_running or self._loop_generation != generation:
+                    return
+                await self._simulation_tick()
+    
+    async def _simulation_tick(self):
+        """Process one simulation tick - called by simulation_loop."""
         if not self.simulation_running:
             return
         print(f"[SimulationState] 🔄 Tick {self.simulation_tick_count + 1} processing...")
@@ -239,13 +291,7 @@ class SimulationState(rx.State):
         from app.services.workflow_engine import workflow_engine
         
         # Build adjacency map
-        adjacency = {}
-        for edge in edges:
-            source = edge.get('source', '')
-            target = edge.get('target', '')
-            if source not in adjacency:
-                adjacency[source] = []
-            adjacency[source].append(target)
+        adjacency = workflow_engine._build_adjacency_map(edges)
         
         nodes_map = {n['id']: n for n in nodes}
         
@@ -322,7 +368,8 @@ class SimulationState(rx.State):
             recipient = action_config.get('phone_number', '')
             if recipient:
                 result = await notification_service.send_whatsapp(
-                    recipient, alert_content['text']
+                    recipient, alert_content['text'],
+                    dedupe_key=alert_content['text']
                 )
                 print(f"[WHATSAPP] Sent to {recipient}: {alert_content['subject']}")
         
@@ -333,7 +380,8 @@ class SimulationState(rx.State):
                     recipient,
                     alert_content['subject'],
                     alert_content['text'],
-                    html_body=alert_content.get('html')
+                    html_body=alert_content.get('html'),
+                    dedupe_key=alert_content['text']
                 )
                 print(f"[EMAIL] Sent to {recipient}: {alert_content['subject']}")
         
@@ -345,9 +393,10 @@ class SimulationState(rx.State):
         elif action_type == 'webhook':
             recipient = action_config.get('webhook_url', '')
             if recipient:
-                result = await notification_service.send_webhook(
-                    recipient,
-                    {
+                # Webhook no crítico: se encola y el tick no espera la respuesta HTTP
+                result = notification_service.enqueue_alert(
+                    'webhook', recipient, alert_content['text'],
+                    payload={
                         'equipment': equipment_name,
                         'sensor': sensor_type,
                         'value': value,
@@ -356,7 +405,12 @@ class SimulationState(rx.State):
                         'timestamp': datetime.now().isoformat()
                     }
                 )
-                print(f"[WEBHOOK] Sent to {recipient}")
+                print(f"[WEBHOOK] Queued for {recipient}")
+        
+        # Repetición absorbida por el dedupe: no salió nada, no entra al feed ni cuenta
+        if getattr(result, 'deduped', False):
+            print(f"[{action_type.upper()}] Duplicate of a recent alert, skipped")
+            return
         
         # Add to alert feed
         alert_entry = {
@@ -369,10 +423,11 @@ class SimulationState(rx.State):
             'action_type': action_type,
             'recipient': recipient,
             'severity': severity,
-            'success': result.success if result else False
+            'success': result.success if result else False,
+            'status': _feed_status(result)
         }
         
-        self.alert_feed = [alert_entry, *self.alert_feed[:19]]
+        self.alert_feed = [alert_entry, *self.alert_feed[:ALERT_FEED_LIMIT - 1]]
         
         # Increment alert counter and check if we should stop
         self.alert_count += 1
@@ -7,7 +7,6 @@ preserving the working ReactFlow drag/drop logic.
 """
 import reflex as rx
 from typing import List, Dict, Any
-import random
 import uuid
 from app.extractors.glb_parser import load_equipment_from_glb
 from app.components.shared.design_tokens import COLORS
@@ -96,19 +95,6 @@ class WorkflowState(rx.State):
     test_results: List[Dict] = []
     show_save_dialog: bool = False
     
-    # ===========================================
-    # NEW: SIMULATION MODE
-    # ===========================================
-    
-    simulation_running: bool = False
-    simulation_speed: int = 2  # seconds between ticks
-    simulation_tick_count: int = 0
-    current_sensor_values: List[Dict] = []  # List of {key, value, threshold, equipment} dicts
-    
-    # Alert feed (live alerts during simulation)
-    alert_feed: List[Dict] = []
-    show_alert_feed: bool = True
-    
     # Toast notification
     toast_message: str = ""
     toast_type: str = "info"  # info, success, warning, error
@@ -123,8 +109,6 @@ class WorkflowState(rx.State):
     
     # Variable para guardar el ID específico seleccionado en el nodo
     config_specific_equipment_id: str = ""
-
-    latest_alert_equipment: str = ""
     
     # ===========================================
     # DEFINITIONS (Enhanced)
@@ -212,6 +196,14 @@ class WorkflowState(rx.State):
     def edge_count(self) -> int:
         return len(self.edges)
     
+    @rx.var
+    def has_saved_workflows(self) -> bool:
+        return len(self.saved_workflows) > 0
+    
+    @rx.var
+    def has_test_results(self) -> bool:
+        return len(self.test_results) > 0
+    
     # ===========================================
     # EVENTS
     # ===========================================
@@ -233,7 +225,7 @@ class WorkflowState(rx.State):
         """Carga workflows activos para el monitor"""
         try:
             db = get_db()
-            workflows = db.get_all_workflows(status="active")
+            workflows = db.get_workflow_summaries(status="active")
             self.active_workflows_list = [
                 {
                     'id': w['id'],
@@ -303,12 +295,18 @@ class WorkflowState(rx.State):
     @rx.event
     def start_drag(self, item_key: str, is_action: bool):
         """Start dragging an item."""
+        # Repeated mousedown on the same item: nothing changes, skip the delta
+        if self.dragged_type == item_key and self.dragged_is_action == is_action:
+            return
         self.dragged_type = item_key
         self.dragged_is_action = is_action
     
     @rx.event
     def cancel_drag(self):
         """Cancel drag operation."""
+        # Sin drag activo (mouse-leave tras un drop): no hay nada que limpiar
+        if not self.dragged_type:
+            return
         self.dragged_type = ""
         self.dragged_is_action = False
     
@@ -442,6 +440,9 @@ class WorkflowState(rx.State):
             return
         
         nodes_dict = {n['id']: n for n in self.nodes}
+        # Solo se reasigna self.nodes (y se reenvía el grafo) si algo cambió:
+        # los eventos 'select'/'dimensions' no tocan la lista
+        changed = False
         
         for change in changes:
             change_type = change.get('type', '')
@@ -450,10 +451,10 @@ class WorkflowState(rx.State):
             if change_type == 'position' and node_id in nodes_dict:
                 pos = change.get('position')
                 if pos and 'x' in pos and 'y' in pos:
-                    nodes_dict[node_id] = {
-                        **nodes_dict[node_id],
-                        'position': {'x': pos['x'], 'y': pos['y']}
-                    }
+                    new_pos = {'x': pos['x'], 'y': pos['y']}
+                    if nodes_dict[node_id].get('position') != new_pos:
+                        nodes_dict[node_id] = {**nodes_dict[node_id], 'position': new_pos}
+                        changed = True
             
             elif change_type == 'select' and node_id in nodes_dict:
                 if change.get('selected', False):
@@ -466,12 +467,14 @@ class WorkflowState(rx.State):
             
             elif change_type == 'remove' and node_id in nodes_dict:
                 del nodes_dict[node_id]
+                changed = True
                 self.edges = [e for e in self.edges if e.get('source') != node_id and e.get('target') != node_id]
                 if self.selected_node_id == node_id:
                     self.selected_node_id = ""
                     self.show_config_panel = False
         
-        self.nodes = list(nodes_dict.values())
+        if changed:
+            self.nodes = list(nodes_dict.values())
     
     @rx.event
     def on_edges_change(self, changes: List[Dict]):
@@ -480,6 +483,7 @@ class WorkflowState(rx.State):
             return
         
         edges_dict = {e['id']: e for e in self.edges}
+        changed = False
         
         for change in changes:
             change_type = change.get('type', '')
@@ -487,8 +491,10 @@ class WorkflowState(rx.State):
             
             if change_type == 'remove' and edge_id in edges_dict:
                 del edges_dict[edge_id]
+                changed = True
         
-        self.edges = list(edges_dict.values())
+        if changed:
+            self.edges = list(edges_dict.values())
     
     # ===========================================
     # NODE CONFIGURATION
@@ -643,9 +649,6 @@ class WorkflowState(rx.State):
         self.selected_node_id = ""
         self.show_config_panel = False
         self._node_counter = 0
-        self.simulation_running = False
-        self.alert_feed = []
-        self.current_sensor_values = []
     
     @rx.event
     def save_workflow(self):
@@ -702,8 +705,8 @@ class WorkflowState(rx.State):
         """Load saved workflows from database."""
         try:
             db = get_db()
-            # USAR METODO CORRECTO get_all_workflows (CORREGIDO)
-            workflows = db.get_all_workflows()
+            # Solo metadatos: la lista no necesita nodes/edges
+            workflows = db.get_workflow_summaries()
             
             self.saved_workflows = [
                 {
@@ -741,8 +744,6 @@ class WorkflowState(rx.State):
             self._node_counter = max_counter
             
             self.show_workflow_list = False
-            self.simulation_running = False
-            self.alert_feed = []
             self._show_toast(f"Loaded '{self.current_workflow_name}'", "success")
     
     @rx.event
@@ -750,11 +751,13 @@ class WorkflowState(rx.State):
         """Delete a workflow."""
         db = get_db()
         db.delete_workflow(workflow_id)
+        get_workflow_engine().forget_workflow(workflow_id)
         
         if workflow_id == self.current_workflow_id:
             self.new_workflow()
         
-        self._load_workflows()
+        # Filtrar localmente: una sola asignación, sin releer la BD
+        self.saved_workflows = [w for w in self.saved_workflows if w['id'] != workflow_id]
         self._show_toast("Workflow deleted", "info")
     
     @rx.event
@@ -772,7 +775,6 @@ class WorkflowState(rx.State):
     def pause_workflow(self):
         """Pause the current workflow."""
         self.current_workflow_status = "paused"
-        self.simulation_running = False
         self.save_workflow()
         self._show_toast("Workflow paused", "info")
     
@@ -784,9 +786,6 @@ class WorkflowState(rx.State):
         self.selected_node_id = ""
         self.show_config_panel = False
         self._node_counter = 0
-        self.simulation_running = False
-        self.alert_feed = []
-        self.current_sensor_values = []
     
     # ===========================================
     # TEST MODE
@@ -800,6 +799,7 @@ class WorkflowState(rx.State):
             return
         
         results = []
+        engine = get_workflow_engine()
         
         for node in self.nodes:
             if node.get('data', {}).get('is_action', False):
@@ -815,7 +815,6 @@ class WorkflowState(rx.State):
             
             current_value = threshold * 0.9
             
-            engine = get_workflow_engine()
             would_trigger = engine.evaluate_condition(current_value, operator, threshold)
             
             results.append({
@@ -827,6 +826,7 @@ class WorkflowState(rx.State):
                 'would_trigger': would_trigger
             })
         
+        # Asignación única: un solo delta para el diálogo de resultados
         self.test_results = results
         self.test_mode = True
     
@@ -874,314 +874,9 @@ class WorkflowState(rx.State):
         self._load_recent_alerts()
     
     # ===========================================
-    # SIMULATION MODE HANDLERS
+    # TOAST
     # ===========================================
     
-    @rx.event
-    def toggle_alert_feed(self):
-        """Toggle alert feed visibility."""
-        self.show_alert_feed = not self.show_alert_feed
-    
-    @rx.event
-    def clear_alert_feed(self):
-        """Clear the alert feed."""
-        self.alert_feed = []
-    
-    @rx.event
-    def start_simulation(self):
-        """Start the simulation."""
-        if self.simulation_running:
-            return
-        
-        # Check if workflow is ready
-        has_configured_equipment = False
-        has_connected_action = False
-        
-        for node in self.nodes:
-            if not node.get('data', {}).get('is_action', False):
-                if node.get('data', {}).get('configured', False):
-                    has_configured_equipment = True
-                    for edge in self.edges:
-                        if edge.get('source') == node['id']:
-                            has_connected_action = True
-                            break
-        
-        if not has_configured_equipment:
-            self._show_toast("Configure at least one equipment node first", "warning")
-            return
-        
-        if not has_connected_action:
-            self._show_toast("Connect equipment to an action node first", "warning")
-            return
-        
-        if not self.current_workflow_id:
-            self.save_workflow()
-        
-        self.simulation_tick_count = 0
-        self.simulation_running = True
-        self._show_toast(f"🚀 Simulation started! Updates every {self.simulation_speed}s", "success")
-    
-    @rx.event
-    def stop_simulation(self):
-        """Stop the simulation."""
-        self.simulation_running = False
-        self.current_sensor_values = []
-        self._show_toast("Simulation stopped", "info")
-    
-    @rx.event
-    async def simulation_tick(self):
-        """Process one simulation tick - called by JavaScript interval."""
-        if not self.simulation_running:
-            return
-        
-        self.simulation_tick_count += 1
-        tick = self.simulation_tick_count
-        
-        # Generate sensor data
-        sensor_data_dict, sensor_data_list = self._generate_sensor_data(tick)
-        self.current_sensor_values = sensor_data_list
-        
-        print(f"[Simulation] Tick {tick}: {len(sensor_data_list)} sensors")
-        
-        # Evaluate workflow and trigger actions
-        await self._evaluate_and_trigger(sensor_data_dict, tick)
-    
-    def _generate_sensor_data(self, tick: int):
-        """Generate simulated sensor data based on configured nodes."""
-        import math
-        
-        data_dict = {}
-        data_list = []
-        
-        for node in self.nodes:
-            if node.get('data', {}).get('is_action', False):
-                continue
-            
-            config = node.get('data', {}).get('config', {})
-            if not config:
-                continue
-            
-            equipment_id = config.get('equipment_id', node['id'])
-            sensor_type = config.get('sensor_type', '')
-            threshold = float(config.get('threshold', 50))
-            
-            if not sensor_type:
-                continue
-            
-            sensor_key = f"{equipment_id}.{sensor_type}"
-            
-            # Generate value that oscillates around 80% of threshold
-            base_value = threshold * 0.8
-            noise = random.uniform(-threshold * 0.1, threshold * 0.1)
-            oscillation = math.sin(tick * 0.3) * threshold * 0.15
-            
-            value = base_value + noise + oscillation
-            
-            # Every 8 ticks, create a spike that exceeds threshold
-            if tick % 8 == 0:
-                value = threshold * random.uniform(1.1, 1.3)
-            
-            value = round(value, 2)
-            data_dict[sensor_key] = value
-            
-            data_list.append({
-                'key': sensor_type,
-                'value': value,
-                'threshold': threshold,
-                'equipment': node.get('data', {}).get('label', equipment_id)
-            })
-        
-        return data_dict, data_list
-    
-    async def _evaluate_and_trigger(self, sensor_data: Dict[str, float], tick: int):
-        """Evaluate workflow conditions and trigger actions if needed."""
-        from app.services.workflow_engine import workflow_engine
-        
-        # Build adjacency map
-        adjacency = {}
-        for edge in self.edges:
-            source = edge.get('source', '')
-            target = edge.get('target', '')
-            if source not in adjacency:
-                adjacency[source] = []
-            adjacency[source].append(target)
-        
-        nodes_map = {n['id']: n for n in self.nodes}
-        
-        for node in self.nodes:
-            if node.get('data', {}).get('is_action', False):
-                continue
-            
-            config = node.get('data', {}).get('config', {})
-            if not config or not config.get('sensor_type'):
-                continue
-            
-            equipment_id = config.get('equipment_id', node['id'])
-            sensor_type = config.get('sensor_type')
-            operator = config.get('operator', '>')
-            threshold = float(config.get('threshold', 0))
-            
-            sensor_key = f"{equipment_id}.{sensor_type}"
-            current_value = sensor_data.get(sensor_key)
-            
-            if current_value is None:
-                continue
-            
-            triggered = workflow_engine.evaluate_condition(
-                current_value, operator, threshold
-            )
-            
-            if triggered:
-                specific_id = node['data'].get('config', {}).get('specific_equipment_id')
-                if specific_id:
-                    self.latest_alert_equipment = specific_id
-                    
-                connected_ids = adjacency.get(node['id'], [])
-                
-                for action_id in connected_ids:
-                    action_node = nodes_map.get(action_id)
-                    if action_node:
-                        await self._execute_action(
-                            node, action_node, current_value, threshold, sensor_type
-                        )
-    
-    async def _execute_action(self, trigger_node: Dict, action_node: Dict, 
-                             value: float, threshold: float, sensor_type: str):
-        """Execute an action node (send notification)."""
-        from app.services.notification_service import notification_service, AlertTemplates
-        from datetime import datetime
-        
-        action_config = action_node.get('data', {}).get('config', {})
-        action_type = action_node.get('data', {}).get('category', '')
-        equipment_name = trigger_node.get('data', {}).get('label', 'Equipment')
-        severity = action_config.get('severity', 'warning')
-        
-        alert_content = AlertTemplates.threshold_alert(
-            equipment_name=equipment_name,
-            sensor=sensor_type,
-            value=value,
-            threshold=threshold,
-            unit=action_config.get('unit', ''),
-            severity=severity
-        )
-        
-        result = None
-        recipient = ""
-        
-        if action_type == 'whatsapp':
-            recipient = action_config.get('phone_number', '')
-            if recipient:
-                result = await notification_service.send_whatsapp(
-                    recipient, alert_content['text']
-                )
-                print(f"[WHATSAPP] Sent to {recipient}: {alert_content['subject']}")
-        
-        elif action_type == 'email':
-            recipient = action_config.get('email', '')
-            if recipient:
-                result = await notification_service.send_email(
-                    recipient,
-                    alert_content['subject'],
-                    alert_content['text'],
-                    html_body=alert_content.get('html')
-                )
-                print(f"[EMAIL] Sent to {recipient}: {alert_content['subject']}")
-        
-        elif action_type == 'alert':
-            recipient = 'system'
-            result = type('Result', (), {'success': True, 'message_id': 'system'})()
-            print(f"[SYSTEM ALERT] {alert_content['subject']}")
-        
-        elif action_type == 'webhook':
-            recipient = action_config.get('webhook_url', '')
-            if recipient:
-                result = await notification_service.send_webhook(
-                    recipient,
-                    {
-                        'equipment': equipment_name,
-                        'sensor': sensor_type,
-                        'value': value,
-                        'threshold': threshold,
-                        'severity': severity,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                )
-                print(f"[WEBHOOK] Sent to {recipient}")
-        
-        alert_entry = {
-            'id': f"alert_{datetime.now().timestamp()}",
-            'timestamp': datetime.now().strftime('%H:%M:%S'),
-            'equipment': equipment_name,
-            'sensor': sensor_type,
-            'value': value,
-            'threshold': threshold,
-            'action_type': action_type,
-            'recipient': recipient,
-            'severity': severity,
-            'success': result.success if result else False
-        }
-        
-        self.alert_feed = [alert_entry, *self.alert_feed[:19]]
-        
-        emoji = "🔴" if severity == "critical" else "🟡"
-        self._show_toast(
-            f"{emoji} ALERT: {equipment_name} {sensor_type}={value} (>{threshold})",
-            "error" if severity == "critical" else "warning"
-        )
-        
-        if self.current_workflow_id:
-            try:
-                get_db().log_alert(
-                    workflow_id=self.current_workflow_id,
-                    action_type=action_type,
-                    recipient=recipient,
-                    message=alert_content['text'],
-                    status='sent' if (result and result.success) else 'failed'
-                )
-            except Exception as e:
-                print(f"Error logging alert: {e}")
-    
-    @rx.event
-    async def trigger_manual_alert(self):
-        """Manually trigger an alert for testing."""
-        if not self.nodes:
-            self._show_toast("Add nodes to the workflow first", "warning")
-            return
-        
-        trigger_node = None
-        for node in self.nodes:
-            if not node.get('data', {}).get('is_action', False):
-                if node.get('data', {}).get('configured', False):
-                    trigger_node = node
-                    break
-        
-        if not trigger_node:
-            self._show_toast("Configure at least one equipment node", "warning")
-            return
-        
-        action_node = None
-        for edge in self.edges:
-            if edge.get('source') == trigger_node['id']:
-                target_id = edge.get('target')
-                action_node = next((n for n in self.nodes if n['id'] == target_id), None)
-                break
-        
-        if not action_node:
-            self._show_toast("Connect equipment to an action node", "warning")
-            return
-        
-        config = trigger_node.get('data', {}).get('config', {})
-        threshold = float(config.get('threshold', 50))
-        sensor_type = config.get('sensor_type', 'sensor')
-        
-        test_value = round(threshold * 1.25, 2)
-        
-        self._show_toast("🧪 Triggering test alert...", "info")
-        
-        await self._execute_action(
-            trigger_node, action_node, test_value, threshold, sensor_type
-        )
-    
     def _show_toast(self, message: str, toast_type: str = "info"):
         """Show a toast notification."""
         self.toast_message = message
@@ -1193,13 +888,6 @@ class WorkflowState(rx.State):
         """Hide the toast notification."""
         self.show_toast = False
     
-    @rx.event
-    def set_simulation_speed(self, speed: str):
-        """Set simulation speed (seconds between ticks)."""
-        try:
-            self.simulation_speed = int(speed)
-        except ValueError:
-            pass
 
     # ===========================================
     # UI HELPERS
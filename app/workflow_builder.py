@@ -7,6 +7,8 @@ import reflex as rx
 from reflex.components.radix.themes.layout.box import Box
 from app.reactflow import react_flow, background, controls
 from app.states.workflow_state import WorkflowState
+from app.states.simulation_state import SimulationState
+from app.components.workflow.controls import simulation_controls
 
 
 # ===========================================
@@ -25,24 +27,6 @@ class DropZone(Box):
 drop_zone = DropZone.create
 
 
-def get_icon(icon_name: rx.Var[str], size: int = 16) -> rx.Component:
-    """Get icon component by name using rx.match."""
-    return rx.match(
-        icon_name,
-        ("scan", rx.icon("scan", size=size)),
-        ("box", rx.icon("box", size=size)),
-        ("circle-dot", rx.icon("circle-dot", size=size)),
-        ("package", rx.icon("package", size=size)),
-        ("arrow-right", rx.icon("arrow-right", size=size)),
-        ("globe", rx.icon("globe", size=size)),
-        ("message-circle", rx.icon("message-circle", size=size)),
-        ("mail", rx.icon("mail", size=size)),
-        ("bell", rx.icon("bell", size=size)),
-        ("cpu", rx.icon("cpu", size=size)),
-        rx.icon("circle-help", size=size)
-    )
-
-
 # ===========================================
 # HEADER
 # ===========================================
@@ -143,7 +127,7 @@ def category_button(category: rx.Var[dict]) -> rx.Component:
     return rx.box(
         rx.button(
             rx.hstack(
-                get_icon(category['icon'], size=18),
+                rx.icon(category['icon'].to(str), size=18),
                 rx.text(category['name'], size="2"),
                 spacing="2"
             ),
@@ -637,20 +621,20 @@ def sensor_gauge(item: rx.Var[Dict]) -> rx.Component:
 def live_sensor_dashboard() -> rx.Component:
     """Dashboard showing live sensor values when simulation is running."""
     return rx.cond(
-        WorkflowState.simulation_running,
+        SimulationState.simulation_running,
         rx.box(
             rx.vstack(
                 rx.hstack(
                     rx.box(class_name="w-3 h-3 bg-green-500 rounded-full animate-pulse"),
                     rx.text("LIVE MONITORING", class_name="text-sm font-bold text-green-400 uppercase"),
-                    rx.badge(f"Tick #{WorkflowState.simulation_tick_count}", color_scheme="blue", size="1"),
+                    rx.badge(f"Tick #{SimulationState.simulation_tick_count}", color_scheme="blue", size="1"),
                     spacing="3",
                     align_items="center"
                 ),
                 rx.cond(
-                    WorkflowState.current_sensor_values.length() > 0,
+                    SimulationState.current_sensor_values.length() > 0,
                     rx.hstack(
-                        rx.foreach(WorkflowState.current_sensor_values, sensor_gauge),
+                        rx.foreach(SimulationState.current_sensor_values, sensor_gauge),
                         spacing="4",
                         class_name="overflow-x-auto py-2"
                     ),
@@ -670,97 +654,6 @@ def live_sensor_dashboard() -> rx.Component:
     )
 
 
-# ===========================================
-# SIMULATION CONTROLS
-# ===========================================
-
-def simulation_controls() -> rx.Component:
-    """Bottom bar with simulation controls and JavaScript interval trigger."""
-    return rx.vstack(
-        live_sensor_dashboard(),
-        rx.hstack(
-            rx.hstack(
-                rx.cond(
-                    WorkflowState.simulation_running,
-                    rx.hstack(
-                        rx.box(class_name="w-3 h-3 bg-green-500 rounded-full animate-pulse"),
-                        rx.text("SIMULATION ACTIVE", class_name="text-xs font-bold text-green-400 uppercase"),
-                        spacing="2"
-                    ),
-                    rx.hstack(
-                        rx.box(class_name="w-3 h-3 bg-gray-600 rounded-full"),
-                        rx.text("SIMULATION STOPPED", class_name="text-xs font-bold text-white-500 uppercase"),
-                        spacing="2"
-                    )
-                ),
-                align_items="center"
-            ),
-            rx.spacer(),
-            rx.hstack(
-                rx.hstack(
-                    rx.text("Interval:", class_name="text-xs text-white-400"),
-                    rx.select.root(
-                        rx.select.trigger(class_name="w-28 h-8 text-xs"),
-                        rx.select.content(
-                            rx.select.item("Fast (1s)", value="1"),
-                            rx.select.item("Normal (2s)", value="2"),
-                            rx.select.item("Slow (5s)", value="5"),
-                        ),
-                        value=WorkflowState.simulation_speed.to_string(),
-                        on_change=WorkflowState.set_simulation_speed,
-                        size="1"
-                    ),
-                    spacing="2",
-                    align_items="center"
-                ),
-                rx.button(
-                    rx.hstack(rx.icon("zap", size=14), rx.text("Test Alert"), spacing="2"),
-                    variant="outline",
-                    color_scheme="yellow",
-                    size="1",
-                    on_click=WorkflowState.trigger_manual_alert
-                ),
-                rx.cond(
-                    WorkflowState.simulation_running,
-                    rx.button(
-                        rx.hstack(rx.icon("square", size=14), rx.text("Stop"), spacing="2"),
-                        variant="solid",
-                        color_scheme="red",
-                        size="2",
-                        on_click=WorkflowState.stop_simulation
-                    ),
-                    rx.button(
-                        rx.hstack(rx.icon("play", size=14), rx.text("Start Simulation"), spacing="2"),
-                        variant="solid",
-                        color_scheme="green",
-                        size="2",
-                        on_click=WorkflowState.start_simulation
-                    )
-                ),
-                spacing="3"
-            ),
-            class_name="w-full px-4 py-3",
-            align_items="center"
-        ),
-        # Hidden button that JavaScript will click
-        rx.button(
-            "tick",
-            id="sim-tick-btn",
-            on_click=WorkflowState.simulation_tick,
-            style={"display": "none"}
-        ),
-        # Data attributes for JavaScript to read simulation state
-        rx.box(
-            id="sim-state",
-            data_running=WorkflowState.simulation_running.to_string(),
-            data_speed=WorkflowState.simulation_speed.to_string(),
-            style={"display": "none"}
-        ),
-        spacing="0",
-        class_name="w-full border-t border-gray-800 bg-gray-900"
-    )
-
-
 # ===========================================
 # ALERT FEED
 # ===========================================
@@ -787,7 +680,7 @@ def alert_feed_item(alert: rx.Var[Dict]) -> rx.Component:
 
 def alert_feed_panel() -> rx.Component:
     return rx.cond(
-        WorkflowState.show_alert_feed,
+        SimulationState.show_alert_feed,
         rx.vstack(
             rx.hstack(
                 rx.hstack(
@@ -797,17 +690,17 @@ def alert_feed_panel() -> rx.Component:
                 ),
                 rx.spacer(),
                 rx.hstack(
-                    rx.button(rx.icon("trash-2", size=12), variant="ghost", size="1", on_click=WorkflowState.clear_alert_feed),
-                    rx.button(rx.icon("x", size=12), variant="ghost", size="1", on_click=WorkflowState.toggle_alert_feed),
+                    rx.button(rx.icon("trash-2", size=12), variant="ghost", size="1", on_click=SimulationState.clear_alert_feed),
+                    rx.button(rx.icon("x", size=12), variant="ghost", size="1", on_click=SimulationState.toggle_alert_feed),
                     spacing="1"
                 ),
                 width="100%"
             ),
             rx.separator(class_name="bg-gray-700"),
             rx.cond(
-                WorkflowState.alert_feed.length() > 0,
+                SimulationState.alert_feed.length() > 0,
                 rx.vstack(
-                    rx.foreach(WorkflowState.alert_feed, alert_feed_item),
+                    rx.foreach(SimulationState.alert_feed, alert_feed_item),
                     spacing="2",
                     width="100%",
                     class_name="overflow-y-auto max-h-[calc(100vh-350px)]"
@@ -825,15 +718,15 @@ def alert_feed_panel() -> rx.Component:
             rx.hstack(
                 rx.icon("bell", size=16),
                 rx.cond(
-                    WorkflowState.alert_feed.length() > 0,
-                    rx.badge(WorkflowState.alert_feed.length(), color_scheme="red", size="1"),
+                    SimulationState.alert_feed.length() > 0,
+                    rx.badge(SimulationState.alert_feed.length(), color_scheme="red", size="1"),
                     rx.fragment()
                 ),
                 spacing="2"
             ),
             variant="ghost",
             class_name="absolute top-20 right-4 z-50 bg-gray-900 border border-gray-700",
-            on_click=WorkflowState.toggle_alert_feed
+            on_click=SimulationState.toggle_alert_feed
         )
     )
 
@@ -858,49 +751,6 @@ def toast_notification() -> rx.Component:
     )
 
 
-# ===========================================
-# SIMULATION JAVASCRIPT
-# ===========================================
-
-SIMULATION_SCRIPT = """
-(function() {
-    var ticker = null;
-    var lastRunning = 'false';
-    
-    function checkSim() {
-        var stateEl = document.getElementById('sim-state');
-        var tickBtn = document.getElementById('sim-tick-btn');
-        if (!stateEl || !tickBtn) return;
-        
-        var running = stateEl.getAttribute('data-running');
-        var speed = parseInt(stateEl.getAttribute('data-speed') || '2') * 1000;
-        
-        if (running === 'true' && lastRunning === 'false') {
-            console.log('[Simulation] Starting ticker, speed:', speed);
-            if (ticker) clearInterval(ticker);
-            ticker = setInterval(function() {
-                var btn = document.getElementById('sim-tick-btn');
-                if (btn) btn.click();
-            }, speed);
-        }
-        
-        if (running === 'false' && lastRunning === 'true') {
-            console.log('[Simulation] Stopping ticker');
-            if (ticker) {
-                clearInterval(ticker);
-                ticker = null;
-            }
-        }
-        
-        lastRunning = running;
-    }
-    
-    setInterval(checkSim, 500);
-    console.log('[Simulation] Controller loaded');
-})();
-"""
-
-
 # ===========================================
 # MAIN PAGE
 # ===========================================
@@ -908,9 +758,6 @@ SIMULATION_SCRIPT = """
 def workflow_builder() -> rx.Component:
     """Main workflow builder page"""
     return rx.box(
-        # Load simulation controller
-        rx.script(SIMULATION_SCRIPT),
-        
         rx.vstack(
             workflow_header(),
             rx.hstack(
@@ -920,6 +767,7 @@ def workflow_builder() -> rx.Component:
                 spacing="0",
                 class_name="flex-1 w-full h-full relative"
             ),
+            live_sensor_dashboard(),
             simulation_controls(),
             spacing="0",
             class_name="h-screen w-full"
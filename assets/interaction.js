@@ -252,29 +252,35 @@ function initializeModelViewer() {
 }
 
 // === CONTINUOUS CHECK FOR MODEL VIEWER (SPA NAVIGATION SUPPORT) ===
-// This runs continuously to handle SPA navigation where model-viewer
-// gets unmounted and remounted when navigating between pages
+// Handles SPA navigation where model-viewer gets unmounted and remounted
+// when navigating between pages. A MutationObserver on the body only wakes
+// up when nodes are added/removed, instead of polling every 500ms.
+function checkModelViewer() {
+    const viewer = document.querySelector("model-viewer");
+
+    // If viewer exists but is different from current, reinitialize
+    if (viewer && viewer !== globalModelViewer) {
+        log("New model viewer detected (navigation), reinitializing...");
+        isInitialized = false;
+        initializeModelViewer();
+    }
+    // If viewer disappeared, reset state
+    else if (!viewer && globalModelViewer) {
+        log("Model viewer unmounted");
+        globalModelViewer = null;
+        isInitialized = false;
+    }
+    // If viewer exists and matches, try to initialize if not done
+    else if (viewer && !isInitialized) {
+        initializeModelViewer();
+    }
+}
+
 function startContinuousCheck() {
-    setInterval(() => {
-        const viewer = document.querySelector("model-viewer");
-        
-        // If viewer exists but is different from current, reinitialize
-        if (viewer && viewer !== globalModelViewer) {
-            log("New model viewer detected (navigation), reinitializing...");
-            isInitialized = false;
-            initializeModelViewer();
-        }
-        // If viewer disappeared, reset state
-        else if (!viewer && globalModelViewer) {
-            log("Model viewer unmounted");
-            globalModelViewer = null;
-            isInitialized = false;
-        }
-        // If viewer exists and matches, try to initialize if not done
-        else if (viewer && !isInitialized) {
-            initializeModelViewer();
-        }
-    }, 500); // Check every 500ms
+    new MutationObserver(checkModelViewer).observe(document.body, {
+        childList: true,
+        subtree: true
+    });
 }
 
 // === START ON LOAD ===
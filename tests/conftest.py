@@ -29,6 +29,8 @@ def temp_db(temp_db_path):
     service.__init__()
     
     yield service
+    
+    service.close()
 
 
 @pytest.fixture
@@ -67,6 +69,7 @@ def sensor_simulator():
     
     simulator = SensorSimulator()
     yield simulator
+    simulator.flush()
 
 
 @pytest.fixture
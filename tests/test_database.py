@@ -210,3 +210,222 @@ class TestDatabaseService:
         assert workflow["name"] == "Updated Name"
         assert workflow["description"] == "Updated description"
         assert workflow["status"] == "active"
+    
+    def test_connection_uses_wal_and_tuned_pragmas(self, temp_db):
+        """Test that connections run in WAL mode with the tuned PRAGMAs."""
+        with temp_db._get_read_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    
+    def test_read_connections_are_pooled(self, temp_db):
+        """Test that reader connections are reused and see committed writes."""
+        with temp_db._get_read_connection() as first:
+            pass
+        
+        temp_db.save_workflow("wf-pool", "Pool", "", [], [])
+        
+        with temp_db._get_read_connection() as second:
+            assert second is first
+            row = second.execute("SELECT name FROM workflows WHERE id = ?", ("wf-pool",)).fetchone()
+            assert row["name"] == "Pool"
+    
+    def test_only_readers_use_row_factory(self, temp_db):
+        """Test that the writer returns plain tuples and readers return sqlite3.Row."""
+        import sqlite3
+        assert temp_db._write_conn.row_factory is None
+        with temp_db._get_read_connection() as conn:
+            assert conn.row_factory is sqlite3.Row
+    
+    def test_batched_sensor_readings(self, temp_db):
+        """Test that batched readings are inserted together on exit."""
+        with temp_db.batched_sensor_readings() as batch:
+            batch.log("Pump_01", "temp", 20.0, "°C")
+            batch.log(equipment_id="Pump_01", sensor_type="temp", value=21.5, unit="°C")
+            assert temp_db.get_latest_sensor_reading("Pump_01", "temp") is None
+        
+        with temp_db._get_read_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM sensor_readings").fetchone()[0]
+        assert count == 2
+    
+    def test_log_sensor_readings_bulk(self, temp_db):
+        """Test inserting a tick's worth of readings in one call."""
+        temp_db.log_sensor_readings_bulk([
+            ("Pump_01", "temp", 20.0, "°C"),
+            ("Pump_01", "pressure", 1.2, "bar"),
+        ])
+        temp_db.log_sensor_readings_bulk([])
+        
+        assert temp_db.get_latest_sensor_reading("Pump_01", "pressure")["value"] == 1.2
+        with temp_db._get_read_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM sensor_readings").fetchone()[0] == 2
+    
+    def test_batched_alerts(self, temp_db):
+        """Test that batched alerts use the same columns as log_alert."""
+        with temp_db.batched_alerts() as batch:
+            batch.log("wf-1", "whatsapp", "+1234567890", "High temp", status="sent")
+            batch.log("wf-1", "system_alert", "system", "High temp", execution_id=7)
+        
+        alerts = temp_db.get_recent_alerts(limit=10)
+        assert {a["action_type"] for a in alerts} == {"whatsapp", "system_alert"}
+        assert {a["status"] for a in alerts} == {"sent", "pending"}
+    
+    def test_log_alerts_bulk(self, temp_db):
+        """Test that alert dicts are inserted together with log_alert defaults."""
+        temp_db.log_alerts_bulk([
+            dict(workflow_id="wf-1", action_type="email", recipient="a@b.c",
+                 message="one", status="sent", execution_id=3),
+            dict(workflow_id="wf-1", action_type="system_alert", recipient="system", message="two"),
+        ])
+        temp_db.log_alerts_bulk([])
+        
+        alerts = temp_db.get_recent_alerts(limit=10)
+        assert {(a["action_type"], a["status"]) for a in alerts} == {
+            ("email", "sent"), ("system_alert", "pending")
+        }
+    
+    def test_save_unchanged_workflow_skips_write(self, temp_db, sample_workflow_data):
+        """Test that re-saving an identical workflow does not touch the row."""
+        args = dict(
+            workflow_id=sample_workflow_data["id"],
+            name=sample_workflow_data["name"],
+            description=sample_workflow_data["description"],
+            nodes=sample_workflow_data["nodes"],
+            edges=sample_workflow_data["edges"],
+        )
+        temp_db.save_workflow(**args)
+        first = temp_db.get_workflow(args["workflow_id"])["updated_at"]
+        
+        temp_db.save_workflow(**args)
+        assert temp_db.get_workflow(args["workflow_id"])["updated_at"] == first
+        
+        # A status change invalidates the cached payload
+        temp_db.update_workflow_status(args["workflow_id"], "active")
+        temp_db.save_workflow(**args)
+        assert temp_db.get_workflow(args["workflow_id"])["status"] == "draft"
+    
+    def test_log_tables_skip_autoincrement(self, temp_db):
+        """Test that append-only log inserts don't maintain sqlite_sequence."""
+        temp_db.log_sensor_reading("Pump_01", "temp", 42.0, "C")
+        
+        with temp_db._get_read_connection() as conn:
+            assert conn.execute(
+                "SELECT name FROM sqlite_master WHERE name = 'sqlite_sequence'"
+            ).fetchone() is None
+    
+    def test_log_methods_return_row_ids(self, temp_db):
+        """Test that log_alert/log_execution_start return the ids of the inserted rows."""
+        first = temp_db.log_alert("wf-1", "email", "a@b.c", "one")
+        second = temp_db.log_alert("wf-1", "email", "a@b.c", "two")
+        execution_id = temp_db.log_execution_start("wf-1", "manual", {})
+        
+        alerts = {a["id"]: a["message"] for a in temp_db.get_recent_alerts(limit=10)}
+        assert alerts == {first: "one", second: "two"}
+        assert [e["id"] for e in temp_db.get_recent_executions(limit=10)] == [execution_id]
+    
+    def test_latest_sensor_reading_uses_index(self, temp_db):
+        """Test that the latest-reading lookup is an index scan without a sort."""
+        with temp_db._get_read_connection() as conn:
+            plan = " ".join(row[3] for row in conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT * FROM sensor_readings
+                WHERE equipment_id = ? AND sensor_type = ?
+                ORDER BY timestamp DESC LIMIT 1
+            """, ("Pump_01", "temp")))
+        
+        assert "idx_sensor_eq_type_ts" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_save_workflow_only_rewrites_changed_nodes(self, temp_db, sample_workflow_data):
+        """Test that nodes are stored per row and a save touches only the diff."""
+        nodes = sample_workflow_data["nodes"]
+        edges = sample_workflow_data["edges"]
+        temp_db.save_workflow("wf-rows", "Rows", "", nodes, edges)
+        
+        moved = {**nodes[0], "position": {"x": 999, "y": 100}}
+        before = temp_db._write_conn.total_changes
+        temp_db.save_workflow("wf-rows", "Rows", "", [moved], edges)
+        # workflows row update + one node upsert + one node delete
+        assert temp_db._write_conn.total_changes - before == 3
+        
+        workflow = temp_db.get_workflow("wf-rows")
+        assert workflow["nodes"] == [moved]
+        assert workflow["edges"] == edges
+    
+    def test_graph_json_is_compact_utf8(self, temp_db):
+        """Test that node payloads are stored compact and round-trip non-ASCII text."""
+        node = {"id": "n1", "data": {"label": "Válvula"}}
+        temp_db.save_workflow("wf-json", "JSON", "", [node], [])
+        
+        with temp_db._get_read_connection() as conn:
+            stored = conn.execute(
+                "SELECT data_json FROM workflow_nodes WHERE workflow_id = ?", ("wf-json",)
+            ).fetchone()[0]
+        assert stored == '{"id":"n1","data":{"label":"Válvula"}}'
+        assert temp_db.get_workflow("wf-json")["nodes"] == [node]
+    
+    @pytest.mark.parametrize("has_drop_column", [True, False])
+    def test_migrates_json_blob_schema(self, temp_db_path, sample_workflow_data,
+                                       has_drop_column, monkeypatch):
+        """Test that databases with nodes_json/edges_json columns are migrated
+        (DROP COLUMN on SQLite 3.35+, table rebuild on older versions)."""
+        import json
+        import sqlite3
+        from app.services import database
+        from app.services.database import DatabaseService
+        
+        monkeypatch.setattr(database, "_HAS_DROP_COLUMN", has_drop_column)
+        
+        conn = sqlite3.connect(temp_db_path)
+        conn.execute("""
+            CREATE TABLE workflows (
+                id TEXT PRIMARY KEY, name TEXT NOT NULL, description TEXT,
+                nodes_json TEXT NOT NULL, edges_json TEXT NOT NULL,
+                status TEXT DEFAULT 'draft',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute(
+            "INSERT INTO workflows (id, name, description, nodes_json, edges_json) VALUES (?, ?, ?, ?, ?)",
+            ("wf-old", "Old", "", json.dumps(sample_workflow_data["nodes"]),
+             json.dumps(sample_workflow_data["edges"]))
+        )
+        conn.commit()
+        conn.close()
+        
+        service = DatabaseService.__new__(DatabaseService)
+        service._initialized = False
+        service._db_path = temp_db_path
+        service.__init__()
+        try:
+            workflow = service.get_workflow("wf-old")
+            assert workflow["nodes"] == sample_workflow_data["nodes"]
+            assert workflow["edges"] == sample_workflow_data["edges"]
+            
+            # The legacy NOT NULL columns are gone, so new saves succeed
+            assert service.save_workflow("wf-new", "New", "", [], [])
+            with service._get_read_connection() as conn:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(workflows)")}
+            assert "nodes_json" not in columns
+        finally:
+            service.close()
+    
+    def test_get_workflow_summaries(self, temp_db, sample_workflow_data):
+        """Test that summaries return metadata only, filtered by status."""
+        temp_db.save_workflow("wf-a", "A", "", sample_workflow_data["nodes"], [], status="active")
+        temp_db.save_workflow("wf-b", "B", "", [], [], status="draft")
+        
+        summaries = temp_db.get_workflow_summaries()
+        assert {w["id"] for w in summaries} == {"wf-a", "wf-b"}
+        assert "nodes" not in summaries[0]
+        
+        active = temp_db.get_workflow_summaries(status="active")
+        assert [w["name"] for w in active] == ["A"]
+    
+    def test_timestamps_use_sqlite_format(self, temp_db):
+        """Test that updated_at is generated by SQLite in CURRENT_TIMESTAMP format."""
+        temp_db.save_workflow("wf-ts", "TS", "", [], [])
+        
+        updated_at = temp_db.get_workflow("wf-ts")["updated_at"]
+        assert datetime.strptime(updated_at, "%Y-%m-%d %H:%M:%S.%f")
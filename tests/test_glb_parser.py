@@ -1,9 +1,22 @@
 # tests/test_glb_parser.py
 """Unit tests for GLB parser and equipment extraction."""
+import json
+import struct
 import pytest
 from pathlib import Path
 
 
+def _write_glb(path, nodes):
+    """Write a minimal GLB file (header + JSON chunk) with the given nodes."""
+    json_chunk = json.dumps({"nodes": nodes}).encode()
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    total = 12 + 8 + len(json_chunk)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sII", b"glTF", 2, total))
+        f.write(struct.pack("<I4s", len(json_chunk), b"JSON"))
+        f.write(json_chunk)
+
+
 class TestEquipmentClassification:
     """Tests for equipment type classification."""
     
@@ -63,7 +76,23 @@ class TestEquipmentClassification:
         
         assert _classify_equipment("SomeRandomName") == "unknown"
         assert _classify_equipment("XYZ_123") == "unknown"
+    
+    def test_classify_equipment_pattern_priority(self):
+        """Test that the first pattern in priority order wins, not the leftmost."""
+        from app.extractors.glb_parser import _classify_equipment
+        
+        assert _classify_equipment("Pump_Mixer_01") == "mixer"
+        assert _classify_equipment("Cartesian_Analyzer") == "analyzer"
 
+    
+    def test_skip_link_nodes_only_when_unclassified(self):
+        """Test that '_Link' helpers are skipped unless they name known equipment."""
+        from app.extractors.glb_parser import _SKIP_RE
+        
+        assert _SKIP_RE.search("Arm_Link")
+        assert _SKIP_RE.search("geo_Centrifuge_01")
+        assert not _SKIP_RE.search("Pump_Link")
+        assert not _SKIP_RE.search("Centrifuge_01")
 
 class TestSensorDefinitions:
     """Tests for sensor definitions by equipment type."""
@@ -204,6 +233,57 @@ class TestGLBParsing:
                 parse_glb(temp_path)
         finally:
             os.unlink(temp_path)
+    
+    def test_parse_glb_empty_file(self, tmp_path):
+        """Test parsing an empty file raises the same error as an invalid one."""
+        from app.extractors.glb_parser import parse_glb
+        
+        glb_path = tmp_path / "empty.glb"
+        glb_path.write_bytes(b"")
+        
+        with pytest.raises(ValueError, match="Invalid GLB file"):
+            parse_glb(str(glb_path))
+    
+    def test_parse_glb_extracts_equipment(self, tmp_path):
+        """Test parsing a synthetic GLB keeps equipment and skips helpers."""
+        from app.extractors.glb_parser import parse_glb
+        
+        glb_path = tmp_path / "model.glb"
+        _write_glb(glb_path, [
+            {"name": "Centrifuge_01", "translation": [1, 2, 3]},
+            {"name": "geo_Centrifuge_01"},
+            {"name": "Arm_Link"},
+            {"name": "Pump_02"},
+            {},
+        ])
+        
+        data = parse_glb(str(glb_path))
+        
+        assert data["total"] == 2
+        assert [eq["name"] for eq in data["equipment"]] == ["Centrifuge_01", "Pump_02"]
+        assert data["equipment"][0]["id"] == "0"
+        assert data["equipment"][0]["type"] == "centrifuge"
+        assert data["equipment"][0]["position"] == [1, 2, 3]
+        assert data["equipment"][1]["position"] == [0, 0, 0]
+    
+    def test_load_equipment_from_glb_is_cached(self, tmp_path, monkeypatch):
+        """Test that repeated loads of an unchanged file parse it only once."""
+        from app.extractors import glb_parser
+        
+        glb_path = tmp_path / "model.glb"
+        _write_glb(glb_path, [{"name": "Storage_Tank_01"}])
+        
+        calls = []
+        original = glb_parser.parse_glb
+        monkeypatch.setattr(glb_parser, "parse_glb", lambda p: calls.append(p) or original(p))
+        glb_parser._load_equipment_cached.cache_clear()
+        
+        first = glb_parser.load_equipment_from_glb(str(glb_path))
+        second = glb_parser.load_equipment_from_glb(str(glb_path))
+        
+        assert first == second
+        assert first[0]["type"] == "storage"
+        assert len(calls) == 1
 
 
 class TestEquipmentEnrichment:
@@ -46,6 +46,18 @@ class TestNotificationResult:
         assert result_dict["error"] == "SMTP connection failed"
 
 
+    def test_timestamp_is_cached_per_second(self):
+        """Test that results share the cached per-second ISO timestamp."""
+        from datetime import datetime
+        from app.services.notification_service import NotificationResult
+        
+        first = NotificationResult(success=True, channel="email", recipient="a@b.c")
+        second = NotificationResult(success=True, channel="email", recipient="a@b.c")
+        
+        assert datetime.fromisoformat(first.timestamp).microsecond == 0
+        assert abs((datetime.fromisoformat(second.timestamp) - datetime.now()).total_seconds()) < 2
+
+
 class TestNotificationConfig:
     """Tests for NotificationConfig class."""
     
@@ -114,6 +126,234 @@ class TestNotificationService:
         
         await mock_notification_service.close()
     
+    @pytest.mark.asyncio
+    async def test_lifespan_warms_and_closes_client(self, mock_notification_service):
+        """Test the lifespan task creates the pooled client and closes it on exit."""
+        async with mock_notification_service.lifespan():
+            client = mock_notification_service._http_client
+            assert client is not None and not client.is_closed
+            assert await mock_notification_service._get_client() is client
+        
+        assert client.is_closed
+    
+    @pytest.mark.asyncio
+    async def test_webhook_inflight_is_capped(self, mock_notification_config):
+        """Test that concurrent webhook sends never exceed the channel limit."""
+        from app.services.notification_service import NotificationService, NotificationChannel
+        
+        mock_notification_config.mock_mode = False
+        mock_notification_config.max_inflight[NotificationChannel.WEBHOOK] = 2
+        service = NotificationService(config=mock_notification_config)
+        
+        inflight = peak = 0
+        
+        async def fake_post(*args, **kwargs):
+            nonlocal inflight, peak
+            inflight += 1
+            peak = max(peak, inflight)
+            await asyncio.sleep(0.01)
+            inflight -= 1
+            return MagicMock(status_code=200)
+        
+        client = await service._get_client()
+        with patch.object(client, "post", fake_post):
+            results = await asyncio.gather(*(
+                service.send_webhook("https://example.com/hook", {"n": i}) for i in range(6)
+            ))
+        await service.close()
+        
+        assert all(r.success for r in results)
+        assert peak == 2
+    
+    @pytest.mark.asyncio
+    async def test_webhook_retries_transient_errors(self, mock_notification_config):
+        """Test that 429/5xx responses are retried with backoff until success."""
+        import httpx
+        from unittest.mock import AsyncMock
+        from app.services.notification_service import NotificationService
+        
+        mock_notification_config.mock_mode = False
+        service = NotificationService(config=mock_notification_config)
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(503),
+            httpx.Response(200),
+        ]
+        post = AsyncMock(side_effect=responses)
+        sleep = AsyncMock()
+        
+        client = await service._get_client()
+        with patch.object(client, "post", post), \
+             patch("app.services.notification_service.asyncio.sleep", sleep):
+            result = await service.send_webhook("https://example.com/hook", {})
+        await service.close()
+        
+        assert result.success is True
+        assert post.await_count == 3
+        assert sleep.await_args_list[0].args == (2.0,)
+        assert 1.0 <= sleep.await_args_list[1].args[0] <= 1.25
+    
+    def test_webhook_backend_falls_back_to_httpx(self, mock_notification_config):
+        """Test that the aiohttp webhook backend is only used when aiohttp is installed."""
+        from app.services.notification_service import NotificationService, NotificationChannel
+        
+        mock_notification_config.webhook_backend = "aiohttp"
+        service = NotificationService(config=mock_notification_config)
+        
+        with patch("app.services.notification_service.aiohttp", None):
+            assert service._use_aiohttp(NotificationChannel.WEBHOOK) is False
+        with patch("app.services.notification_service.aiohttp", MagicMock()):
+            assert service._use_aiohttp(NotificationChannel.WEBHOOK) is True
+            assert service._use_aiohttp(NotificationChannel.WHATSAPP) is False
+    
+    @pytest.mark.asyncio
+    async def test_webhook_posts_prebuilt_json_body(self, mock_notification_config):
+        """Test that webhooks send pre-serialized JSON with the cached headers."""
+        import json
+        import httpx
+        from unittest.mock import AsyncMock
+        from app.services.notification_service import NotificationService
+        
+        mock_notification_config.mock_mode = False
+        mock_notification_config.webhook_secret = "s3cret"
+        service = NotificationService(config=mock_notification_config)
+        post = AsyncMock(return_value=httpx.Response(204))
+        
+        client = await service._get_client()
+        with patch.object(client, "post", post):
+            await service.send_webhook("https://example.com/hook", {"value": 1.5, "label": "Válvula"})
+        await service.close()
+        
+        kwargs = post.await_args.kwargs
+        assert json.loads(kwargs["content"]) == {"value": 1.5, "label": "Válvula"}
+        assert kwargs["headers"] == {"Content-Type": "application/json", "X-Webhook-Secret": "s3cret"}
+    
+    @pytest.mark.asyncio
+    async def test_webhook_does_not_retry_client_errors(self, mock_notification_config):
+        """Test that a plain 4xx fails immediately."""
+        import httpx
+        from unittest.mock import AsyncMock
+        from app.services.notification_service import NotificationService
+        
+        mock_notification_config.mock_mode = False
+        service = NotificationService(config=mock_notification_config)
+        post = AsyncMock(return_value=httpx.Response(400, text="bad payload"))
+        
+        client = await service._get_client()
+        with patch.object(client, "post", post):
+            result = await service.send_webhook("https://example.com/hook", {})
+        await service.close()
+        
+        assert result.success is False
+        assert post.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_smtp_session_is_reused(self, mock_notification_config):
+        """Test that emails share one SMTP login and reconnect when the session drops."""
+        import smtplib
+        from app.services.notification_service import NotificationService
+        
+        mock_notification_config.mock_mode = False
+        mock_notification_config.email_username = "alerts@example.com"
+        mock_notification_config.email_password = "secret"
+        mock_notification_config.email_batch_window = 0
+        service = NotificationService(config=mock_notification_config)
+        
+        with patch("app.services.notification_service.smtplib.SMTP") as smtp_cls:
+            smtp_cls.return_value.noop.return_value = (250, b"OK")
+            for i in range(3):
+                result = await service.send_email("ops@example.com", f"Alert {i}", "body")
+                assert result.success is True
+            assert smtp_cls.call_count == 1
+            assert smtp_cls.return_value.login.call_count == 1
+            assert smtp_cls.return_value.send_message.call_count == 3
+            
+            smtp_cls.return_value.noop.side_effect = smtplib.SMTPServerDisconnected()
+            await service.send_email("ops@example.com", "Alert", "body")
+            assert smtp_cls.call_count == 2
+            
+            await service.close()
+            assert service._smtp is None
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_emails_share_one_batch(self, mock_notification_config):
+        """Test that a burst of emails is sent as one batch and aborts after repeated failures."""
+        import smtplib
+        from app.services.notification_service import NotificationService
+        
+        mock_notification_config.mock_mode = False
+        mock_notification_config.email_username = "alerts@example.com"
+        mock_notification_config.email_password = "secret"
+        mock_notification_config.email_batch_window = 0.01
+        service = NotificationService(config=mock_notification_config)
+        
+        with patch("app.services.notification_service.smtplib.SMTP") as smtp_cls:
+            server = smtp_cls.return_value
+            results = await asyncio.gather(*(
+                service.send_email(f"user{i}@example.com", "Alert", "body") for i in range(5)
+            ))
+            assert all(r.success for r in results)
+            assert smtp_cls.call_count == 1
+            assert server.send_message.call_count == 5
+            
+            server.noop.return_value = (250, b"OK")
+            server.send_message.side_effect = smtplib.SMTPRecipientsRefused({})
+            results = await asyncio.gather(*(
+                service.send_email(f"user{i}@example.com", "Alert", "body") for i in range(5)
+            ))
+            assert not any(r.success for r in results)
+            assert server.send_message.call_count == 5 + 3
+            
+            await service.close()
+    
+    @pytest.mark.asyncio
+    async def test_send_alert_dedupes_repeats(self, mock_notification_service):
+        """Test that an identical alert to the same recipient is absorbed within the TTL."""
+        first = await mock_notification_service.send_alert("whatsapp", "+1234567890", "Pump hot")
+        repeat = await mock_notification_service.send_alert("whatsapp", "+1234567890", "Pump hot")
+        other = await mock_notification_service.send_alert("whatsapp", "+1999999999", "Pump hot")
+        
+        assert first.message_id.startswith("mock_")
+        assert first.deduped is False
+        assert repeat.deduped is True
+        assert repeat.message_id.startswith("deduped_")
+        assert other.message_id.startswith("mock_")
+        
+        mock_notification_service.config.alert_dedupe_ttl = 0
+        again = await mock_notification_service.send_alert("whatsapp", "+1234567890", "Pump hot")
+        assert again.message_id.startswith("mock_")
+    
+    @pytest.mark.asyncio
+    async def test_failed_send_is_not_deduped(self, mock_notification_service):
+        """Test that a failed alert does not suppress the next attempt."""
+        mock_notification_service.config.mock_mode = False
+        mock_notification_service.config.webhook_url = ""
+        mock_notification_service.config.email_username = ""
+        
+        with patch.object(mock_notification_service, "_mock_notification") as mock:
+            mock.return_value = MagicMock(success=False)
+            await mock_notification_service.send_email("a@b.c", "S", "body", dedupe_key="k")
+            await mock_notification_service.send_email("a@b.c", "S", "body", dedupe_key="k")
+        
+        assert mock.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_alert_returns_before_send(self, mock_notification_service):
+        """Test that enqueue_alert acknowledges immediately and drain() waits for delivery."""
+        with patch.object(mock_notification_service, "_mock_notification",
+                          wraps=mock_notification_service._mock_notification) as mock:
+            result = mock_notification_service.enqueue_alert(
+                "webhook", "https://example.com/hook", "Pump hot"
+            )
+            assert result.queued is True
+            assert result.success is False
+            assert result.message_id.startswith("queued_")
+            assert mock.call_count == 0
+            
+            await mock_notification_service.drain()
+            assert mock.call_count == 1
+            assert not mock_notification_service._pending
+    
     @pytest.mark.asyncio
     async def test_send_alert_whatsapp_routing(self, mock_notification_service):
         """Test that send_alert routes to WhatsApp correctly."""
@@ -172,6 +412,37 @@ class TestNotificationService:
         await mock_notification_service.close()
 
 
+class TestTokenBucket:
+    """Tests for the per-destination TokenBucket."""
+    
+    @pytest.mark.asyncio
+    async def test_burst_then_refill(self):
+        """Test that the bucket allows a burst and then paces to its rate."""
+        import time
+        from app.services.notification_service import TokenBucket
+        
+        bucket = TokenBucket(rate=50.0, capacity=2)
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        
+        assert time.monotonic() - start >= 0.015
+    
+    def test_throttle_and_recover(self):
+        """Test that a 429 halves the rate and successes restore it."""
+        from app.services.notification_service import TokenBucket
+        
+        bucket = TokenBucket(rate=8.0, capacity=10)
+        bucket.throttled()
+        bucket.throttled()
+        assert bucket.rate == 2.0
+        
+        bucket.succeeded()
+        bucket.succeeded()
+        bucket.succeeded()
+        assert bucket.rate == 8.0
+
+
 class TestAlertTemplates:
     """Tests for AlertTemplates class."""
     
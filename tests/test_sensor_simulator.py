@@ -97,6 +97,53 @@ class TestSensorSimulator:
             # With normal noise, should be close to range
             assert 10 <= temp <= 50  # Extended range for noise
     
+    def test_tick_picks_up_newly_registered_equipment(self, sensor_simulator):
+        """Test that precomputed sensor params are rebuilt after registering more equipment."""
+        sensor_simulator.register_equipment("Centrifuge_01", "centrifuge")
+        sensor_simulator.tick()
+        sensor_simulator.register_equipment("Storage_01", "storage")
+        
+        values = sensor_simulator.tick()
+        
+        assert "Storage_01.level" in values
+        # Clamped to the normal range plus a 10% margin
+        assert 25 <= values["Storage_01.level"] <= 85
+    
+    def test_tick_writes_readings_in_background(self, sensor_simulator, mock_db):
+        """Test that readings are written by the writer thread and flush() waits for them."""
+        sensor_simulator.register_equipment("Centrifuge_01", "centrifuge")
+        values = sensor_simulator.tick()
+        sensor_simulator.flush()
+        
+        rows = [row for call in mock_db.log_sensor_readings_bulk.call_args_list for row in call.args[0]]
+        assert {(eq, st) for eq, st, _, _ in rows} == {tuple(k.split(".")) for k in values}
+    
+    def test_tick_drops_readings_when_writer_is_saturated(self, sensor_simulator):
+        """Test that a full writer queue drops the batch instead of blocking the tick."""
+        import queue
+        sensor_simulator.register_equipment("Centrifuge_01", "centrifuge")
+        sensor_simulator._writer = MagicMock()  # no writer thread draining the queue
+        sensor_simulator._writer_queue = queue.Queue(maxsize=1)
+        
+        sensor_simulator.tick()
+        sensor_simulator.tick()
+        
+        assert sensor_simulator.dropped_batches == 1
+        # Nothing drains the queued batch; reset so the fixture's flush() returns
+        sensor_simulator._writer_queue = queue.Queue()
+    
+    def test_sensor_config_caches_range(self):
+        """Test that SensorConfig precomputes its center and clamp bounds."""
+        from app.services.sensor_simulator import SensorConfig
+        
+        sensor = SensorConfig("Pump_01", "temp", "°C", min_normal=20, max_normal=30)
+        
+        assert sensor.center == 25
+        assert sensor.range_size == 10
+        assert (sensor.lower_clamp, sensor.upper_clamp) == (19, 31)
+        # Sin valor explícito arranca en el centro, sin tirar del random global
+        assert sensor.current_value == 25
+    
     def test_anomaly_injection_spike(self, sensor_simulator):
         """Test spike anomaly injection."""
         sensor_simulator.register_equipment("Centrifuge_01", "centrifuge")
@@ -214,6 +261,19 @@ class TestSensorSimulator:
         # The generated value should exceed the threshold
         assert data["Centrifuge_01.temp"] > 35.0
     
+    def test_seeded_simulators_are_reproducible(self):
+        """Test that simulators with the same seed start and tick identically."""
+        from app.services.sensor_simulator import SensorSimulator
+        
+        runs = []
+        for _ in range(2):
+            simulator = SensorSimulator(seed=42)
+            simulator.register_equipment("Centrifuge_01", "centrifuge")
+            runs.append([simulator.get_current_values()] + [simulator.tick() for _ in range(3)])
+            simulator.flush()
+        
+        assert runs[0] == runs[1]
+    
     def test_generate_triggering_data_less_than(self, sensor_simulator):
         """Test generating triggering data for less-than conditions."""
         workflow_nodes = [
@@ -197,6 +197,39 @@ class TestConditionEvaluation:
         )
         
         assert result is False
+    
+    def test_evaluate_conditions_batch_matches_scalar(self):
+        """Batch evaluation agrees with evaluate_condition for every operator."""
+        from app.services.workflow_engine import WorkflowEngine, _BATCH_MIN_NUMPY
+        
+        engine = WorkflowEngine()
+        ops = [">", "<", ">=", "<=", "==", "!=", "between", "not_between", "??"]
+        values, operators, thresholds, thresholds_max = [], [], [], []
+        for i in range(max(_BATCH_MIN_NUMPY, 90)):
+            values.append(float(i % 15))
+            operators.append(ops[i % len(ops)])
+            thresholds.append(5.0)
+            thresholds_max.append(10.0 if i % 2 else None)
+        
+        expected = [
+            engine.evaluate_condition(v, op, t, tm)
+            for v, op, t, tm in zip(values, operators, thresholds, thresholds_max)
+        ]
+        assert engine.evaluate_conditions_batch(values, operators, thresholds, thresholds_max) == expected
+    
+    def test_unknown_operator_warns_once(self, capsys, monkeypatch):
+        """Unknown operators evaluate to False and are reported only once."""
+        import sys
+        from app.services.workflow_engine import WorkflowEngine
+        
+        # Empty warned-set so earlier tests using "=~" don't hide the warning
+        # (the package re-exports an instance named workflow_engine, so go via sys.modules)
+        monkeypatch.setattr(sys.modules["app.services.workflow_engine"], "_warned_ops", set())
+        engine = WorkflowEngine()
+        assert engine.evaluate_condition(1.0, "=~", 0.0) is False
+        assert engine.evaluate_condition(2.0, "=~", 0.0) is False
+        
+        assert capsys.readouterr().out.count("Unknown operator: =~") == 1
 
 
 class TestWorkflowExecution:
@@ -237,6 +270,42 @@ class TestWorkflowExecution:
         assert context.workflow_id == sample_workflow_data["id"]
         
         await mock_notif.close()
+
+    @pytest.mark.asyncio
+    async def test_actions_are_dispatched_concurrently(self, temp_db):
+        """Triggered actions run concurrently and failures stay isolated."""
+        import asyncio
+        from app.services.workflow_engine import WorkflowEngine
+
+        nodes = [{"id": "t1", "data": {"category": "analyzer", "label": "A",
+                  "config": {"equipment_id": "eq", "sensor_type": "temperature",
+                             "operator": ">", "threshold": 10}}}]
+        edges = []
+        for i in range(3):
+            nodes.append({"id": f"a{i}", "data": {"category": "email", "config": {}}})
+            edges.append({"id": f"e{i}", "source": "t1", "target": f"a{i}"})
+        temp_db.save_workflow("wf-par", "Par", "", nodes, edges, status="active")
+
+        engine = WorkflowEngine(db_service=temp_db)
+        running = 0
+        peak = 0
+
+        async def fake_action(action_info, ctx):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if action_info['action_node']['id'] == 'a1':
+                raise RuntimeError("boom")
+            return {'success': True}
+
+        engine._execute_action = fake_action
+        ctx = await engine.execute_workflow("wf-par", {"eq.temperature": 50})
+
+        assert peak == 3
+        assert len(ctx.results) == 3
+        assert sum(1 for r in ctx.results if not r['success']) == 1
     
     @pytest.mark.asyncio
     async def test_execute_workflow_no_matching_condition(self, temp_db, sample_workflow_data):
@@ -339,6 +408,205 @@ class TestWorkflowExecution:
         assert result is not None
         
         await mock_notif.close()
+    
+    @pytest.mark.asyncio
+    async def test_unconfigured_action_skips_template(self):
+        """Actions without a recipient return early without rendering the alert."""
+        from unittest.mock import patch
+        from app.services.workflow_engine import WorkflowEngine, WorkflowExecutionContext
+        
+        engine = WorkflowEngine()
+        ctx = WorkflowExecutionContext(workflow_id="wf", workflow_name="WF")
+        action_info = {
+            'trigger_node': {'id': 't1', 'data': {'label': 'Robot'}},
+            'action_node': {'id': 'a1', 'data': {'category': 'whatsapp', 'config': {}}},
+            'sensor_value': 9, 'threshold': 5,
+            'equipment_id': 't1', 'sensor_type': 'torque'
+        }
+        
+        with patch("app.services.workflow_engine.AlertTemplates.threshold_alert") as render:
+            result = await engine._execute_action(action_info, ctx)
+        
+        render.assert_not_called()
+        assert result['success'] is False
+        assert 'phone_number' in result['error']
+    
+    def test_generate_mock_sensor_data(self):
+        """Mock data has one value per configured sensor, offset from its threshold."""
+        from app.services.workflow_engine import WorkflowEngine
+        
+        engine = WorkflowEngine()
+        nodes = [
+            {"id": f"n{i}", "data": {"config": {
+                "sensor_type": "temp", "threshold": 50, "operator": op}}}
+            for i, op in enumerate([">", "<", "==", ">="] * 25)
+        ]
+        nodes.append({"id": "bare", "data": {"config": {}}})
+        
+        data = engine._generate_mock_sensor_data(nodes)
+        
+        assert len(data) == 100
+        for value in data.values():
+            assert value == 50 or 5 <= abs(value - 50) <= 20
+    
+    @pytest.mark.asyncio
+    async def test_alert_rows_are_written_in_bulk(self, temp_db):
+        """Alert rows from all actions are flushed with one bulk insert."""
+        from unittest.mock import patch
+        from app.services.workflow_engine import WorkflowEngine
+        
+        nodes = [{"id": "t1", "data": {"category": "storage", "label": "Tank",
+                  "config": {"equipment_id": "tk", "sensor_type": "level",
+                             "operator": "<", "threshold": 10}}}]
+        edges = []
+        for i in range(2):
+            nodes.append({"id": f"a{i}", "data": {"category": "alert", "config": {}}})
+            edges.append({"id": f"e{i}", "source": "t1", "target": f"a{i}"})
+        temp_db.save_workflow("wf-bulk", "Bulk", "", nodes, edges, status="active")
+        
+        engine = WorkflowEngine(db_service=temp_db)
+        with patch.object(temp_db, 'log_alerts_bulk', wraps=temp_db.log_alerts_bulk) as bulk:
+            ctx = await engine.execute_workflow("wf-bulk", {"tk.level": 3})
+        
+        bulk.assert_called_once()
+        assert len(bulk.call_args.args[0]) == 2
+        assert all(r['success'] and 'alert' not in r for r in ctx.results)
+        assert len(temp_db.get_recent_alerts(limit=10)) == 2
+    
+    @pytest.mark.asyncio
+    async def test_action_dispatch_by_category(self, mock_notification_config):
+        """Actions are routed by category; unknown categories report an error."""
+        from app.services.workflow_engine import WorkflowEngine, WorkflowExecutionContext
+        from app.services.notification_service import NotificationService
+        
+        notif = NotificationService(config=mock_notification_config)
+        engine = WorkflowEngine(notif_service=notif)
+        ctx = WorkflowExecutionContext(workflow_id="wf", workflow_name="WF", execution_id=1)
+        
+        def info(category, config):
+            return {
+                'trigger_node': {'id': 't1', 'data': {'label': 'Robot'}},
+                'action_node': {'id': 'a1', 'data': {'category': category, 'config': config}},
+                'sensor_value': 9, 'threshold': 5,
+                'equipment_id': 't1', 'sensor_type': 'torque'
+            }
+        
+        email = await engine._execute_action(info('email', {'email': 'ops@lab.io'}), ctx)
+        assert email['success'] is True
+        assert email['alert']['action_type'] == 'email'
+        assert email['alert']['recipient'] == 'ops@lab.io'
+        
+        unknown = await engine._execute_action(info('sms', {}), ctx)
+        assert unknown['success'] is False
+        assert 'sms' in unknown['error']
+        
+        await notif.close()
+    
+    @pytest.mark.asyncio
+    async def test_repeated_alert_is_deduped_by_message(self, mock_notification_config):
+        """Only an identical rendered alert is absorbed, and it gets no alert row."""
+        from unittest.mock import patch
+        from app.services.workflow_engine import WorkflowEngine, WorkflowExecutionContext
+        from app.services.notification_service import NotificationService
+        
+        notif = NotificationService(config=mock_notification_config)
+        engine = WorkflowEngine(notif_service=notif)
+        ctx = WorkflowExecutionContext(workflow_id="wf", workflow_name="WF", execution_id=1)
+        
+        def info(value):
+            return {
+                'trigger_node': {'id': 't1', 'data': {'label': 'Robot'}},
+                'action_node': {'id': 'a1', 'data': {'category': 'email',
+                                                     'config': {'email': 'ops@lab.io'}}},
+                'sensor_value': value, 'threshold': 5,
+                'equipment_id': 't1', 'sensor_type': 'torque'
+            }
+        
+        # Misma hora en el texto para que solo cambie la lectura
+        with patch("app.services.notification_service._now_strings",
+                   return_value=("2026-01-01T00:00:00", "2026-01-01 00:00:00")):
+            first = await engine._execute_action(info(9), ctx)
+            repeat = await engine._execute_action(info(9), ctx)
+            new_value = await engine._execute_action(info(12), ctx)
+        
+        assert 'alert' in first and not first.get('deduped')
+        assert repeat['deduped'] is True and 'alert' not in repeat
+        assert 'alert' in new_value and not new_value.get('deduped')
+        
+        await notif.close()
+    
+    @pytest.mark.asyncio
+    async def test_webhooks_share_execution_timestamp(self, temp_db):
+        """Webhook payloads reuse the timestamp taken when the execution starts."""
+        from unittest.mock import AsyncMock
+        from app.services.workflow_engine import WorkflowEngine
+        from app.services.notification_service import NotificationResult, NotificationChannel
+        
+        nodes = [{"id": "t1", "data": {"category": "robot", "label": "R",
+                  "config": {"equipment_id": "r", "sensor_type": "load",
+                             "operator": ">", "threshold": 1}}}]
+        edges = []
+        for i in range(2):
+            nodes.append({"id": f"w{i}", "data": {"category": "webhook",
+                          "config": {"url": f"https://hooks.example/{i}"}}})
+            edges.append({"id": f"e{i}", "source": "t1", "target": f"w{i}"})
+        temp_db.save_workflow("wf-ts", "TS", "", nodes, edges, status="active")
+        
+        notif = AsyncMock()
+        notif.send_webhook.return_value = NotificationResult(
+            success=True, channel=NotificationChannel.WEBHOOK, recipient="x"
+        )
+        engine = WorkflowEngine(db_service=temp_db, notif_service=notif)
+        ctx = await engine.execute_workflow("wf-ts", {"r.load": 5})
+        
+        stamps = {call.args[1]['timestamp'] for call in notif.send_webhook.call_args_list}
+        assert stamps == {ctx.timestamp_iso}
+    
+    @pytest.mark.asyncio
+    async def test_sparse_tick_uses_sensor_index(self, temp_db):
+        """Ticks with fewer readings than triggers only visit the matching triggers."""
+        from app.services.workflow_engine import WorkflowEngine
+        
+        nodes, edges = [], []
+        for i in range(5):
+            nodes.append({"id": f"t{i}", "data": {"category": "analyzer", "config": {
+                "equipment_id": f"eq{i}", "sensor_type": "temp", "operator": ">", "threshold": 10}}})
+            nodes.append({"id": f"a{i}", "data": {"category": "alert", "config": {}}})
+            edges.append({"id": f"e{i}", "source": f"t{i}", "target": f"a{i}"})
+        temp_db.save_workflow("wf-idx", "Idx", "", nodes, edges, status="active")
+        engine = WorkflowEngine(db_service=temp_db)
+        
+        sparse = await engine.execute_workflow("wf-idx", {"eq3.temp": 50, "other.temp": 99})
+        dense = await engine.execute_workflow(
+            "wf-idx", {f"eq{i}.temp": 50 if i % 2 else 0 for i in range(5)} | {"x": 1, "y": 2}
+        )
+        
+        assert [r['trigger_node_id'] for r in sparse.results] == ["t3"]
+        assert [r['trigger_node_id'] for r in dense.results] == ["t1", "t3"]
+    
+    @pytest.mark.asyncio
+    async def test_quiet_tick_skips_execution_log(self, temp_db):
+        """Ticks that fire nothing do not write execution rows."""
+        from app.services.workflow_engine import WorkflowEngine
+        
+        nodes = [
+            {"id": "t1", "data": {"category": "centrifuge", "config": {
+                "equipment_id": "c1", "sensor_type": "rpm", "operator": ">", "threshold": 100}}},
+            {"id": "a1", "data": {"category": "alert", "config": {}}}
+        ]
+        edges = [{"id": "e1", "source": "t1", "target": "a1"}]
+        temp_db.save_workflow("wf-quiet", "Quiet", "", nodes, edges, status="active")
+        engine = WorkflowEngine(db_service=temp_db)
+        
+        quiet = await engine.execute_workflow("wf-quiet", {"c1.rpm": 50})
+        assert quiet.execution_id is None
+        assert quiet.results == []
+        assert temp_db.get_recent_executions(limit=10) == []
+        
+        fired = await engine.execute_workflow("wf-quiet", {"c1.rpm": 150})
+        executions = temp_db.get_recent_executions(limit=10)
+        assert [e["id"] for e in executions] == [fired.execution_id]
+        assert executions[0]["status"] == "success"
 
 
 class TestAdjacencyMap:
@@ -382,9 +650,120 @@ class TestAdjacencyMap:
             {"id": "node-3", "data": {"label": "Target B"}}
         ]
         adjacency = {"node-1": ["node-2", "node-3"]}
+        nodes_map = {n["id"]: n for n in nodes}
         
-        connected = engine._get_connected_nodes("node-1", adjacency, nodes)
+        connected = engine._get_connected_nodes("node-1", adjacency, nodes_map)
         
         assert len(connected) == 2
         assert any(n["id"] == "node-2" for n in connected)
         assert any(n["id"] == "node-3" for n in connected)
+
+
+class TestCompiledWorkflow:
+    """Tests for compiled trigger tables and the workflow cache."""
+    def test_compile_workflow_is_cached_per_version(self):
+        """Compiled triggers are reused until the workflow version changes."""
+        from app.services.workflow_engine import WorkflowEngine
+        
+        engine = WorkflowEngine()
+        workflow = {
+            "id": "wf-c", "updated_at": "v1",
+            "nodes": [
+                {"id": "t1", "data": {"category": "robot", "config": {
+                    "equipment_id": "r1", "sensor_type": "torque", "operator": ">", "threshold": 5}}},
+                {"id": "a1", "data": {"category": "alert", "config": {}}},
+                {"id": "x1", "data": {"category": "conveyor", "config": {}}}
+            ],
+            "edges": [{"source": "t1", "target": "a1"}]
+        }
+        
+        triggers, by_key = engine._compile_workflow(workflow)
+        assert len(triggers) == 1
+        assert triggers[0][0] == "r1.torque"
+        assert by_key == {"r1.torque": triggers}
+        assert [a["id"] for a in triggers[0][-1]] == ["a1"]
+        assert engine._compile_workflow(workflow)[0] is triggers
+        
+        workflow["updated_at"] = "v2"
+        assert engine._compile_workflow(workflow)[0] is not triggers
+    
+    def test_compiled_trigger_binds_operator(self):
+        """Compiled triggers carry the comparison callable; unknown operators are dropped."""
+        from app.services.workflow_engine import WorkflowEngine
+        
+        engine = WorkflowEngine()
+        workflow = {
+            "id": "wf-ops", "updated_at": "v1",
+            "nodes": [
+                {"id": "t1", "data": {"category": "analyzer", "config": {
+                    "sensor_type": "temp", "operator": "between", "threshold": 1, "threshold_max": 3}}},
+                {"id": "t2", "data": {"category": "analyzer", "config": {
+                    "sensor_type": "temp", "operator": "~="}}}
+            ],
+            "edges": []
+        }
+        
+        triggers, _ = engine._compile_workflow(workflow)
+        assert len(triggers) == 1
+        _, op_fn, threshold, threshold_max = triggers[0][:4]
+        assert op_fn(2, threshold, threshold_max) is True
+        assert op_fn(4, threshold, threshold_max) is False
+    
+    def test_load_workflow_is_cached_until_db_write(self, temp_db, sample_workflow_data):
+        """Workflow loads are served from cache until the DB reports a write."""
+        from unittest.mock import patch
+        from app.services.workflow_engine import WorkflowEngine
+        
+        wf = sample_workflow_data
+        temp_db.save_workflow(wf["id"], wf["name"], wf["description"],
+                              wf["nodes"], wf["edges"], status="active")
+        engine = WorkflowEngine(db_service=temp_db)
+        
+        with patch.object(temp_db, 'get_workflow', wraps=temp_db.get_workflow) as spy:
+            first = engine._load_workflow(wf["id"])
+            assert engine._load_workflow(wf["id"]) is first
+            assert spy.call_count == 1
+            
+            temp_db.update_workflow_status(wf["id"], "paused")
+            assert engine._load_workflow(wf["id"])["status"] == "paused"
+            assert spy.call_count == 2
+            
+            engine.cache_ttl = 0
+            engine._load_workflow(wf["id"])
+            assert spy.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_preview_reuses_compiled_triggers(self, temp_db, sample_workflow_data, sample_sensor_data):
+        """test_workflow evaluates the cached trigger descriptors instead of rebuilding them."""
+        from unittest.mock import patch
+        from app.services.workflow_engine import WorkflowEngine
+        
+        wf = sample_workflow_data
+        temp_db.save_workflow(wf["id"], wf["name"], wf["description"],
+                              wf["nodes"], wf["edges"], status="active")
+        engine = WorkflowEngine(db_service=temp_db)
+        
+        with patch.object(engine, '_build_adjacency_map', wraps=engine._build_adjacency_map) as spy:
+            first = await engine.test_workflow(wf["id"], mock_sensor_data=sample_sensor_data)
+            second = await engine.test_workflow(wf["id"], mock_sensor_data=sample_sensor_data)
+        
+        assert spy.call_count == 1
+        assert first["trigger_results"] == second["trigger_results"]
+        assert first["trigger_results"]
+        assert len(first["trigger_results"]) == len(engine._compiled[wf["id"]][1])
+    
+    def test_deleted_workflow_is_evicted(self, temp_db, sample_workflow_data):
+        """Caches for a workflow are dropped once it is deleted."""
+        from app.services.workflow_engine import WorkflowEngine
+        
+        wf = sample_workflow_data
+        temp_db.save_workflow(wf["id"], wf["name"], wf["description"],
+                              wf["nodes"], wf["edges"], status="active")
+        engine = WorkflowEngine(db_service=temp_db)
+        engine._compile_workflow(engine._load_workflow(wf["id"]))
+        assert wf["id"] in engine._wf_cache and wf["id"] in engine._compiled
+        
+        temp_db.delete_workflow(wf["id"])
+        assert engine._load_workflow(wf["id"]) is None
+        assert wf["id"] not in engine._wf_cache
+        assert wf["id"] not in engine._compiled